@@ -7,12 +7,28 @@ by playwright/python library to the robotframework.
 from pathlib import Path
 from typing import Any, Callable, Literal, Optional, Pattern, Union
 
-from playwright.sync_api import Browser, ElementHandle, FilePayload, Frame
+from playwright.sync_api import Browser, ElementHandle, FilePayload, Frame, Locator
+from robot.api import logger
 from robot.api.deco import keyword, library
+from robot.libraries.BuiltIn import BuiltIn
 
-from playwbot.src.browser import PlaywbotBrowser
+from playwbot.src.browser import (
+    PlaywbotBrowser,
+    acquire_shared_browser,
+    release_shared_browser,
+)
 from playwbot.src.context import PlaywbotContext
+from playwbot.src.handle import ElementState, Handle
+from playwbot.src.lifecycle import PlaywbotHandleRegistry
+from playwbot.src.metrics import METRICS, PlaywbotMetricsListener
+from playwbot.src.monitor import MonitorAction, PlaywbotResourceMonitor
 from playwbot.src.page import PlaywbotPage
+from playwbot.src.pool import PlaywbotContextPool, PlaywbotPagePool
+from playwbot.src.screenshots import ImageType, PlaywbotScreenshotWriter
+from playwbot.src.storage import PlaywbotStorageStateCache, get_storage_state_cache
+from playwbot.src.timeouts import PlaywbotAdaptiveTimeouts
+from playwbot.src.tracing import PlaywbotTracing
+from playwbot.src.visual import compare_screenshot
 
 
 @library
@@ -28,11 +44,17 @@ class Playwbot:
 
     ROBOT_LIBRARY_SCOPE = "SUITE"
 
-    def __init__(self, browser: str = "chromium"):
+    def __init__(self, browser: str = "chromium", backend: str = "sync"):
         """
         When importing the library, you have to specify, which supported browser you want to use.
         Later, when launching browser, this specified browser will be used.
 
+        Optionally, you can select the `backend` - either _sync_ (default), which uses
+        https://playwright.dev/python/docs/api/class-playwright synchronous API, or _async_,
+        which runs asynchronous API of playwright in the event loop in the dedicated thread.
+        Keywords behave the same way with both backends, but _async_ backend allows the library
+        to run operations on several pages or contexts at once, e.g. in Go To All keyword.
+
         == Example ==
 
         === Importing library file directly ===
@@ -46,12 +68,50 @@ class Playwbot:
         |       =A=      |               =B=                   |              =C=                    |
         | ***Settings*** |                                     |                                     |
         | Library        | playwbot.Playwbot                   | browser=<chromium|firefox|webkit>   |
+
+        === Importing library with async backend ===
+
+        |       =A=      |               =B=                   |              =C=                    |       =D=        |
+        | ***Settings*** |                                     |                                     |                  |
+        | Library        | playwbot.Playwbot                   | browser=<chromium|firefox|webkit>   | backend=async    |
         """
         self._selected_browser: str = browser
+        self._backend: str = backend
         self._playbot_browser: Union[None, Browser] = None
+        self._context_pool: Optional[PlaywbotContextPool] = None
+        self._storage_states: Optional[PlaywbotStorageStateCache] = None
+        self._tracing: PlaywbotTracing = PlaywbotTracing()
+        self._handle_registry: PlaywbotHandleRegistry = PlaywbotHandleRegistry()
+        self._screenshots: PlaywbotScreenshotWriter = PlaywbotScreenshotWriter()
+        self._adaptive_timeouts: PlaywbotAdaptiveTimeouts = PlaywbotAdaptiveTimeouts()
+        self._monitor: PlaywbotResourceMonitor = PlaywbotResourceMonitor()
+        self._shared_browser: bool = False
+        # contexts of this suite, closed by Close Browser of the shared browser
+        self._contexts: list[PlaywbotContext] = []
+        self.ROBOT_LIBRARY_LISTENER = [
+            PlaywbotMetricsListener("Playwbot"),
+            self._tracing,
+            self._handle_registry,
+            self._screenshots,
+            self._adaptive_timeouts,
+            self._monitor,
+            self._monitor.page_sampler,
+        ]
 
     @keyword
-    def start_browser(self, **kwargs):
+    def start_browser(
+        self,
+        monitor: bool = False,
+        monitor_interval: float = 1.0,
+        monitor_max_rss: Optional[float] = None,
+        monitor_max_js_heap: Optional[float] = None,
+        monitor_action: MonitorAction = "warn",
+        recycle_after_contexts: Optional[int] = None,
+        recycle_max_rss: Optional[float] = None,
+        recycle_max_age: Optional[float] = None,
+        reuse: bool = False,
+        **kwargs,
+    ):
         """Starts browser. Since library has default scope set to SUITE,
         user is expected to start the browser only ONCE, ideally using
         *Suite Setup* and close the browser using *Suite Teardown*.
@@ -59,6 +119,12 @@ class Playwbot:
         Starting browser is time and memory expensive. For isolated test runs,
         user wants to use browser contexts.
 
+        The browser, and the playwright driver, is launched only once it is needed for the
+        first time, e.g. by New Context keyword. Suites, which do not use it at all, e.g. when
+        all their tests are excluded, do not pay for the startup. When the launch fails, e.g.
+        the browser executable is missing, the driver is stopped again and the browser is not
+        launched again - every following keyword needing it fails right away with the same error.
+
         See https://playwright.dev/python/docs/api/class-browsertype#browser-type-launch for
         all available keyword arguments.
 
@@ -97,8 +163,161 @@ class Playwbot:
         ...
         | ${context}=    | New Context   |                    |                                      |              |
         | ${page}=       | New Page      | ${context}         |                                      |              |
+
+        == Shared browser server ==
+
+        When running tests in parallel, e.g. by pabot, every worker launches its own browser by default.
+        Provide `server=${True}` and the first worker will start the browser server, all other workers
+        with the same browser and launch options will connect to it. The server is shut down, when the last
+        worker closes the browser. Registry and lock files are stored in the system temp folder, or in the
+        folder provided by `server_registry_dir` kwarg.
+
+        It is also possible to connect to already running browser server by `ws_endpoint` kwarg, see
+        https://playwright.dev/python/docs/api/class-browsertype#browser-type-connect, or to already
+        running chromium browser by `cdp_endpoint` kwarg, see
+        https://playwright.dev/python/docs/api/class-browsertype#browser-type-connect-over-cdp.
+
+        Shared browser cannot be used together with persistent context.
+
+        == Example ==
+
+        | =A=            | =B=           | =C=                                    | =D=               |
+        | Suite Setup    | Start Browser | server=${True}                         | headless=${True}  |
+        | Suite Setup    | Start Browser | ws_endpoint=ws://127.0.0.1:4444/abcdef |                   |
+        | Suite Setup    | Start Browser | cdp_endpoint=http://127.0.0.1:9222     |                   |
+
+        == Resource monitor ==
+
+        Provide `monitor=${True}` to sample CPU and memory of the browser processes every `monitor_interval`
+        seconds in the background. Only the playwright driver, or the browser server, and the browsers
+        they launched are measured, not other processes started by the test run. With chromium, JS heap,
+        DOM nodes and event listeners of each page are sampled by CDP as well, between the keywords.
+        Peak and mean of the samples, of all pages together and of each page, are added to the message
+        of every test, see also Browser Resources keyword.
+
+        Test, during which the memory of the browser processes exceeded `monitor_max_rss` MB, or JS heap of
+        the pages exceeded `monitor_max_js_heap` MB, is reported by the warning, or failed, if `monitor_action`
+        is _fail_. Requires psutil package, install it by `pip install playwbot[monitor]`.
+
+        == Example ==
+
+        | =A=         | =B=           | =C=             | =D=                     | =E=                 |
+        | Suite Setup | Start Browser | monitor=${True} | monitor_max_rss=${2048} | monitor_action=fail |
+
+        == Browser recycling ==
+
+        Memory of the long running browser grows with the contexts it served. The browser is restarted
+        with the same options, including `user_data_dir` of the persistent context, once it served
+        `recycle_after_contexts` contexts, its processes use `recycle_max_rss` MB of memory, or it runs
+        for `recycle_max_age` seconds. Memory limit requires psutil package.
+
+        Restart is done by the next New Context keyword, when no other context is open, so contexts
+        of the running tests are never closed, and its cost is logged there. Idle contexts of the context
+        pool are closed by the restart. With persistent context, contexts returned by New Context before
+        the restart cannot be used afterwards. Browser shared via browser server cannot be recycled.
+
+        == Example ==
+
+        | =A=         | =B=           | =C=                           | =D=                     |
+        | Suite Setup | Start Browser | recycle_after_contexts=${500} | recycle_max_rss=${4096} |
+
+        == Browser shared by suites ==
+
+        Every suite launches its own browser by default. Provide `reuse=${True}` and all suites run by
+        the same robot process with the same browser and launch options share one browser. Each suite keeps
+        its own contexts, Close Browser closes contexts of the suite only and releases the browser. Browser,
+        which is not used by any suite, is kept running for the suites to come and closed, when the process
+        exits. Persistent context cannot be shared.
+
+        == Example ==
+
+        | =A=            | =B=           | =C=           | =D=              |
+        | Suite Setup    | Start Browser | reuse=${True} | headless=${True} |
+        | Suite Teardown | Close Browser |               |                  |
         """
-        self._playbot_browser = PlaywbotBrowser(self._selected_browser, **kwargs)
+        options: dict[str, Any] = {
+            "recycle_after_contexts": recycle_after_contexts,
+            "recycle_max_rss": recycle_max_rss,
+            "recycle_max_age": recycle_max_age,
+            **kwargs,
+        }
+        if self._playbot_browser is not None and self._shared_browser:
+            release_shared_browser(self._playbot_browser)
+        self._shared_browser = reuse
+        if reuse:
+            self._playbot_browser = acquire_shared_browser(
+                self._selected_browser, backend=self._backend, **options
+            )
+        else:
+            self._playbot_browser = PlaywbotBrowser(
+                self._selected_browser, backend=self._backend, **options
+            )
+        if monitor:
+            self._monitor.start(
+                self._launched_browser,
+                self._browser_processes,
+                chromium=self._selected_browser == "chromium",
+                interval=monitor_interval,
+                max_rss=monitor_max_rss,
+                max_js_heap=monitor_max_js_heap,
+                action=monitor_action,
+            )
+
+    def _recycle_browser(self):
+        """Restarts the browser, if the recycling policy says so and no context is open."""
+        reason: Optional[str] = self._playbot_browser.recycle_reason()
+        if reason is None:
+            return
+        browser: Any = self._playbot_browser.browser
+        if isinstance(browser, Browser):
+            idle: int = (
+                self._context_pool.idle_count() if self._context_pool is not None else 0
+            )
+            if len(browser.contexts) > idle:
+                return
+
+        self._tracing.detach_all()
+        self._handle_registry.clear()
+        seconds: float = self._playbot_browser.recycle()
+        if self._context_pool is not None:
+            self._context_pool.rebind(self._playbot_browser.browser)
+        logger.info(
+            f"Browser restarted after {reason} in {seconds:.2f} s, "
+            f"restart #{self._playbot_browser.restarts}."
+        )
+
+    def _launched_browser(self) -> Any:
+        if self._playbot_browser is None or not self._playbot_browser.is_started:
+            return None
+        return self._playbot_browser.browser
+
+    def _browser_processes(self) -> list[int]:
+        if self._playbot_browser is None:
+            return []
+        return self._playbot_browser.process_ids()
+
+    @keyword
+    def browser_resources(self):
+        """Returns and logs peak and mean of the resources used by the browser since the test started -
+        _rss_ and _js_heap_ in MB, _cpu_ in percent, _dom_nodes_ and _listeners_ counts. JS heap, DOM nodes
+        and listeners are totals of all pages, the same values of each page are in the _pages_ list, along
+        with the _url_ of the page. Requires the resource monitor started by Start Browser keyword.
+
+        == Example ==
+
+        | =A=            | =B=                                         |
+        | &{resources}=  | Browser Resources                           |
+        | Should Be True | ${resources}[rss][peak] < 2048              |
+        | Should Be True | ${resources}[pages][0][js_heap][peak] < 256 |
+        """
+        if not self._monitor.running:
+            raise RuntimeError(
+                "Resource monitor is not running, start the browser with monitor=${True}."
+            )
+        self._monitor.sample_pages()
+        summary: dict[str, Any] = self._monitor.summary()
+        logger.info(f"Browser resources: {summary}")
+        return summary
 
     @keyword
     def close_browser(self):
@@ -114,7 +333,24 @@ class Playwbot:
         | ***Settings*** |               |
         | Suite Teardown | Close Browser |
         """
-        self._playbot_browser.close_browser()
+        if self._context_pool is not None:
+            self.disable_context_pool()
+        self._monitor.stop()
+        self._tracing.detach_all()
+        self._handle_registry.clear()
+        if not self._shared_browser:
+            self._playbot_browser.close_browser()
+            return
+
+        # other suites keep using the browser, so only contexts of this suite are closed
+        for context in self._contexts:
+            try:
+                context.close_context(context.context)
+            except Exception:  # pylint: disable=broad-except
+                # context was closed along with the restarted browser
+                pass
+        self._contexts = []
+        release_shared_browser(self._playbot_browser)
 
     @keyword
     def new_context(self, **kwargs):
@@ -151,8 +387,104 @@ class Playwbot:
         | &{viewport}=  | width=${1920} | height=${1080}       |
         | ${context1}=  | New Context   | viewport=&{viewport} |
         | ${context2}=  | New Context   |                      |
+
+        If the context pool is enabled by Enable Context Pool keyword, the context
+        is taken from the pool instead of being created.
+
+        === Create context with saved storage state ===
+
+        Provide `storage_state_name` kwarg to create the context with cookies and local storage
+        saved by Save Storage State keyword. If there is no such state, or the state expired,
+        the context is created without it. Property _storage_state_restored_ of the returned
+        context tells, if the state was restored.
+
+        | =A=            | =B=                                   | =C=                     |
+        | ${context}=    | New Context                           | storage_state_name=user |
+        | Run Keyword If | not ${context.storage_state_restored} | Log In And Save State   |
+
+        === Create context blocking some requests ===
+
+        Requests, which the test does not need, e.g. images, fonts or analytics, can be blocked
+        by following kwargs. All of them are compiled into the single route handler of the context.
+
+        - `block_resource_types` - _list_ of resource types, e.g. _image_, _font_, _media_, _stylesheet_,
+        see https://playwright.dev/python/docs/api/class-request#request-resource-type
+        - `block_urls` - _list_ of url glob patterns, e.g. _**/*.png_ or _https://analytics.com/**_
+        - `block_url_regexes` - _list_ of url regular expressions
+
+        Number of blocked requests is returned by Blocked Requests keyword.
+
+        | =A=         | =B=         | =C=                                 | =D=                |
+        | @{types}=   | Create List | image                               | media              |
+        | @{urls}=    | Create List | https://www.google-analytics.com/** | **/*.woff2         |
+        | ${context}= | New Context | block_resource_types=${types}       | block_urls=${urls} |
+
+        === Record and replay network traffic ===
+
+        With `har_mode=record`, all network traffic of the context is recorded to the HAR file
+        given by `har_path` kwarg. The file is written, when the context is closed.
+
+        With `har_mode=replay`, requests are served from the HAR file given by `har_path` kwarg,
+        so the test does not depend on the backend at all. Recorded requests are matched by
+        method, url and request body. Requests missing in the HAR file are handled according
+        to the `har_fallback` kwarg:
+
+        - _abort_ - request is aborted (default)
+        - _continue_ - request is sent to the network
+        - _fail_ - request is aborted and Close Context keyword fails listing all such requests
+
+        | =A=         | =B=         | =C=             | =D=                  | =E=               |
+        | ${context}= | New Context | har_mode=record | har_path=login.har   |                   |
+        | ${context}= | New Context | har_mode=replay | har_path=login.har   | har_fallback=fail |
+
+        === Create context with asset cache ===
+
+        With `asset_cache=${True}`, static responses - scripts, stylesheets, images and fonts - are
+        served from the cache shared by all contexts created with it, instead of being downloaded
+        by each context again. Responses are stored in memory and on the disk, so the cache is
+        reused by next test runs as well. Responses, which are not fresh anymore, are revalidated
+        with the server by their `ETag` and `Last-Modified` headers, or served as they are, when
+        the server cannot be reached. Requests, which fail and are not cached, are left to the browser.
+
+        Folder of the cache can be set by `asset_cache_dir` kwarg. Default is _playwbot/asset_cache_
+        folder in the system temp folder. Cache statistics are returned by Asset Cache Stats keyword.
+
+        | =A=         | =B=         | =C=                 |
+        | ${context}= | New Context | asset_cache=${True} |
+
+        === Create context with tracing ===
+
+        Playwright tracing, see https://playwright.dev/python/docs/trace-viewer, is governed
+        by `trace_policy` kwarg. Trace is recorded for each test separately, so one context
+        used by several tests produces several traces.
+
+        - _off_ - no tracing (default)
+        - _always_ - traces of all tests are kept
+        - _sample_ - traces of randomly selected `trace_sample` percent of tests are kept, default is 10
+        - _retain-on-failure_ - traces of failed tests only are kept, traces of passed tests are discarded
+
+        Traces are written to the folder given by `trace_dir` kwarg, default is _traces_ folder in the
+        output folder. Files are moved there in the background, so the teardown does not wait for them.
+
+        | =A=         | =B=         | =C=                             | =D=                   |
+        | ${context}= | New Context | trace_policy=retain-on-failure  |                       |
+        | ${context}= | New Context | trace_policy=sample             | trace_sample=${5}     |
         """
-        return PlaywbotContext(self._playbot_browser.browser, **kwargs)
+        self._recycle_browser()
+        if kwargs.get("trace_policy", "off") != "off" and "trace_dir" not in kwargs:
+            kwargs["trace_dir"] = (
+                Path(BuiltIn().get_variable_value("${OUTPUT DIR}")) / "traces"
+            )
+        context = PlaywbotContext(
+            self._playbot_browser.serve_context(),
+            pool=self._context_pool,
+            storage_states=self._get_storage_states(),
+            tracing=self._tracing,
+            **kwargs,
+        )
+        if self._shared_browser:
+            self._contexts.append(context)
+        return context
 
     @keyword
     def close_context(self, context: PlaywbotContext):
@@ -166,8 +498,201 @@ class Playwbot:
 
         | =A=           | =B=         |
         | Close Context | ${context}  |
+
+        If the context was taken from the context pool, it is reset and returned
+        to the pool instead.
+
+        If the context replays HAR file with `har_fallback=fail`, the keyword fails, when
+        some requests were not found in the HAR file.
+
+        If the context is traced, the tracing is stopped. When called in the test teardown,
+        trace of the passed test is discarded right away according to the tracing policy,
+        otherwise the decision is made when the test ends.
+        """
+        if context.tracer is not None:
+            status: Optional[str] = BuiltIn().get_variable_value("${TEST STATUS}")
+            context.tracer.stop(None if status is None else status == "FAIL")
+            context.tracer = None
+        if context.cookie_jar is not None:
+            context.cookie_jar.detach()
+            context.cookie_jar = None
+
+        if context in self._contexts:
+            self._contexts.remove(context)
+
+        if context.pool is not None and context.pool.owns(context.context):
+            context.pool.release(context.context)
+        else:
+            context.close_context(context.context)
+
+        if (
+            context.har_replayer is not None
+            and context.har_replayer.fallback == "fail"
+            and context.har_replayer.misses
+        ):
+            raise RuntimeError(
+                "Requests not found in HAR file:\n"
+                + "\n".join(context.har_replayer.misses)
+            )
+
+    @keyword
+    def blocked_requests(self, context: PlaywbotContext):
+        """Returns and logs _dict_ with the number of requests blocked in the given context,
+        in total and by resource type. See New Context keyword, how to block the requests.
+
+        Requests of the pooled context are counted from the time it was handed out by New Context.
+
+        == Example ==
+
+        | =A=         | =B=               | =C=        |
+        | &{blocked}= | Blocked Requests  | ${context} |
+        | Log         | ${blocked}[total] |            |
+        """
+        if context.resource_blocker is None:
+            raise RuntimeError("No requests are blocked in the given context.")
+        blocked: dict[str, int] = {
+            "total": sum(context.resource_blocker.stats.values()),
+            **context.resource_blocker.stats,
+        }
+        logger.info(f"Blocked requests: {blocked}")
+        return blocked
+
+    @keyword
+    def asset_cache_stats(self, context: PlaywbotContext):
+        """Returns and logs _dict_ with counters of the asset cache used by the given context.
+        The cache is shared by all contexts, so are the counters.
+
+        - `hits` - responses served from the cache
+        - `revalidated` - stale responses served from the cache, after the server confirmed them
+        - `stale` - stale responses served from the cache, because the server could not be reached
+        - `misses` - responses downloaded from the server
+        - `bytes_served` - size of response bodies served from the cache
+        - `bytes_downloaded` - size of response bodies downloaded from the server
+
+        == Example ==
+
+        | =A=       | =B=               | =C=        |
+        | &{stats}= | Asset Cache Stats | ${context} |
+        """
+        if context.asset_cache is None:
+            raise RuntimeError("Asset cache is not enabled for the given context.")
+        stats: dict[str, int] = dict(context.asset_cache.stats)
+        logger.info(f"Asset cache stats: {stats}")
+        return stats
+
+    def _get_storage_states(self) -> PlaywbotStorageStateCache:
+        if self._storage_states is None:
+            self._storage_states = get_storage_state_cache()
+        return self._storage_states
+
+    @keyword
+    def save_storage_state(
+        self, context: PlaywbotContext, name: str, ttl: float = 3600.0
+    ):
+        """Saves the storage state - cookies and local storage - of the given context under the `name`.
+        Contexts created later by New Context keyword with `storage_state_name=name` kwarg start
+        with this state, e.g. already logged in.
+
+        State is stored in memory and on the disk, so it is available to other suites and test runs
+        until it expires after `ttl` seconds, or until it is invalidated by Invalidate Storage State keyword.
+
+        See https://playwright.dev/python/docs/api/class-browsercontext#browser-context-storage-state for
+        documentation.
+
+        == Example ==
+
+        | =A=                | =B=                     | =C=        | =D=      |
+        | ${context}=        | New Context             |            |          |
+        | ${page}=           | New Page                | ${context} |          |
+        | Log In             | ${page}                 |            |          |
+        | Save Storage State | ${context}              | user       | ttl=1800 |
+        | ${context2}=       | New Context             | storage_state_name=user |  |
         """
-        context.close_context(context.context)
+        self._get_storage_states().save(name, context.context.storage_state(), ttl)
+
+    @keyword
+    def invalidate_storage_state(self, name: str):
+        """Removes the storage state saved under the `name` by Save Storage State keyword,
+        e.g. when the session expired on the server.
+
+        == Example ==
+
+        | =A=                      | =B=  |
+        | Invalidate Storage State | user |
+        """
+        self._get_storage_states().invalidate(name)
+
+    @keyword
+    def set_storage_state_directory(self, path: Union[str, Path]):
+        """Sets the folder, where the storage states are saved by Save Storage State keyword.
+        Default is _playwbot/storage_state_ folder in the system temp folder.
+
+        == Example ==
+
+        | =A=                         | =B=                                |
+        | Set Storage State Directory | ${EXECDIR}${/}.storage_states      |
+        """
+        self._storage_states = get_storage_state_cache(path)
+
+    @keyword
+    def enable_context_pool(
+        self,
+        max_size: int = 8,
+        max_uses: int = 50,
+        idle_timeout: float = 60.0,
+        prewarm: int = 1,
+    ):
+        """Enables the pool of browser contexts. Every New Context keyword called afterwards
+        hands out idle context created with the same options, if there is one, instead of
+        creating a new one. Close Context keyword resets such context and returns it to the pool.
+
+        Resetting the context closes all its pages and clears its cookies, permissions and
+        local and session storage. Context, which could not be reset completely, is closed.
+
+        Once the context is returned, the pool prepares up to `prewarm` spare contexts with the same
+        options, so the next test does not have to wait for the context to be created.
+
+        - `max_size` - max number of idle contexts kept in the pool
+        - `max_uses` - context is closed after it was handed out this many times
+        - `idle_timeout` - idle context is closed after this many seconds
+
+        Context pool cannot be used with persistent context.
+
+        == Example ==
+
+        | =A=                 | =B=                 | =C=         | =D=          |
+        | Suite Setup         | Start Browser       |             |              |
+        | Enable Context Pool | max_size=${4}       | max_uses=20 | prewarm=${2} |
+        | ${context}=         | New Context         |             |              |
+        | Close Context       | ${context}          |             |              |
+        """
+        if not isinstance(self._playbot_browser.browser, Browser):
+            raise RuntimeError("Context pool cannot be used with persistent context.")
+        if self._context_pool is not None:
+            self._context_pool.close()
+        self._context_pool = PlaywbotContextPool(
+            self._playbot_browser.browser,
+            max_size=max_size,
+            max_uses=max_uses,
+            idle_timeout=idle_timeout,
+            prewarm=prewarm,
+        )
+
+    @keyword
+    def disable_context_pool(self):
+        """Disables the context pool enabled by Enable Context Pool keyword and
+        closes all idle contexts in it.
+
+        == Example ==
+
+        | =A=                  |
+        | Disable Context Pool |
+        """
+        if self._context_pool is None:
+            return
+        self._context_pool.close()
+        logger.info(f"Context pool stats: {self._context_pool.stats}")
+        self._context_pool = None
 
     @keyword
     def cookies(
@@ -198,6 +723,109 @@ class Playwbot:
         """
         return context.cookies(context.context, urls)
 
+    @keyword
+    def get_cookie(
+        self,
+        context: PlaywbotContext,
+        name: str,
+        domain: Optional[str] = None,
+        path: Optional[str] = None,
+        refresh: bool = False,
+    ):
+        """Returns the cookie of the given _name_, and _domain_ and _path_, if given, or _None_.
+        Fails, if more cookies match.
+
+        Cookies are read from the browser only once and kept, until a response is received,
+        a frame navigates, or cookies are changed by Add Cookies or Clear Cookies keywords.
+        Cookies set by the page scripts without any request are seen only with _refresh=${True}_.
+
+        Leading dot of the _domain_ does not matter.
+
+        == Example ==
+
+        | =A=        | =B=        | =C=        | =D=       | =E=                |
+        | ${cookie}= | Get Cookie | ${context} | session   |                    |
+        | ${cookie}= | Get Cookie | ${context} | consent   | domain=example.com |
+        | Should Be Equal | ${cookie}[value] | accepted |  |                    |
+        """
+        cookies: list[dict[str, Any]] = context.get_cookie_jar().find(
+            name=name, domain=domain, path=path, refresh=refresh
+        )
+        if len(cookies) > 1:
+            raise RuntimeError(
+                f"{len(cookies)} cookies named {name} found, specify their domain or path: "
+                + ", ".join(f"{cookie['domain']}{cookie['path']}" for cookie in cookies)
+            )
+        return cookies[0] if cookies else None
+
+    @keyword
+    def find_cookies(
+        self,
+        context: PlaywbotContext,
+        name: Optional[str] = None,
+        domain: Optional[str] = None,
+        path: Optional[str] = None,
+        refresh: bool = False,
+    ):
+        """Returns list of cookies matching all given filters - _name_, _domain_ and _path_.
+
+        Cookies are kept the same way as by Get Cookie keyword.
+
+        == Example ==
+
+        | =A=         | =B=          | =C=        | =D=                |
+        | @{cookies}= | Find Cookies | ${context} | domain=example.com |
+        | @{cookies}= | Find Cookies | ${context} | name=_ga           |
+        """
+        return context.get_cookie_jar().find(
+            name=name, domain=domain, path=path, refresh=refresh
+        )
+
+    @keyword
+    def add_cookies(self, context: PlaywbotContext, cookies: list[dict[str, Any]]):
+        """Adds all given cookies to the context at once.
+
+        Each cookie needs _name_, _value_ and either _url_, or both _domain_ and _path_.
+
+        See https://playwright.dev/python/docs/api/class-browsercontext#browser-context-add-cookies
+        for documentation.
+
+        == Example ==
+
+        | =A=         | =B=               | =C=          | =D=           | =E=                    |
+        | &{consent}= | Create Dictionary | name=consent | value=accepted | url=https://example.com |
+        | @{cookies}= | Create List       | ${consent}   |               |                        |
+        | Add Cookies | ${context}        | ${cookies}   |               |                        |
+        """
+        context.get_cookie_jar().add(cookies)
+
+    @keyword
+    def clear_cookies(
+        self,
+        context: PlaywbotContext,
+        name: Optional[str] = None,
+        domain: Optional[str] = None,
+        path: Optional[str] = None,
+    ):
+        """Clears all cookies of the context, or only the cookies matching given _name_,
+        _domain_ and _path_.
+
+        See https://playwright.dev/python/docs/api/class-browsercontext#browser-context-clear-cookies
+        for documentation.
+
+        == Example ==
+
+        | =A=           | =B=        | =C=                |
+        | Clear Cookies | ${context} |                    |
+        | Clear Cookies | ${context} | domain=example.com |
+        """
+        filters: dict[str, str] = {
+            key: value
+            for key, value in (("name", name), ("domain", domain), ("path", path))
+            if value is not None
+        }
+        context.get_cookie_jar().clear(**filters)
+
     @keyword
     def expect_page(
         self,
@@ -262,8 +890,11 @@ class Playwbot:
         | ${context}= | New Context |            |
         | ${page1}=   | New Page    | ${context} |
         | ${page2}=   | New Page    | ${context} |
+
+        If the page pool of the context is enabled by Enable Page Pool keyword,
+        the page is taken from the pool instead of being opened.
         """
-        return PlaywbotPage(context.context, **kwargs)
+        return PlaywbotPage(context.context, page_pool=context.page_pool, **kwargs)
 
     @keyword
     def close_page(
@@ -280,8 +911,172 @@ class Playwbot:
         | ${page}=   | New Page | ${context}           |
         | Go To      | ${page}  | https://some/url.com |
         | Close Page | ${page}  |                      |
+
+        If the page was taken from the page pool, it is reset and returned
+        to the pool instead.
+        """
+        return page.release_page(run_before_unload=run_before_unload)
+
+    @keyword
+    def enable_page_pool(self, context: PlaywbotContext, max_size: int = 4):
+        """Enables the pool of pages for the given context. Every New Page keyword called
+        with this context afterwards hands out idle page, if there is one, instead of opening
+        a new one. Close Page keyword resets such page and returns it to the pool.
+
+        Resetting the page removes its routes and event listeners, clears its session and local
+        storage and navigates it to _about:blank_.
+
+        - `max_size` - max number of idle pages kept in the pool
+
+        == Example ==
+
+        | =A=              | =B=             | =C=           |
+        | ${context}=      | New Context     |               |
+        | Enable Page Pool | ${context}      | max_size=${2} |
+        | ${page}=         | New Page        | ${context}    |
+        | Close Page       | ${page}         |               |
+        | ${page}=         | New Page        | ${context}    |
+        """
+        if context.page_pool is not None:
+            context.page_pool.close()
+        context.page_pool = PlaywbotPagePool(context.context, max_size=max_size)
+
+    @keyword
+    def page_pool_stats(self, context: PlaywbotContext):
+        """Returns and logs _dict_ with counters of the page pool of the given context.
+
+        - `hits` - pages handed out from the pool
+        - `misses` - pages, which had to be opened, because the pool was empty
+        - `discarded` - released pages closed instead of being returned to the pool
+
+        == Example ==
+
+        | =A=       | =B=             | =C=        |
+        | &{stats}= | Page Pool Stats | ${context} |
+        """
+        if context.page_pool is None:
+            raise RuntimeError("Page pool is not enabled for the given context.")
+        stats: dict[str, int] = dict(context.page_pool.stats)
+        logger.info(f"Page pool stats: {stats}")
+        return stats
+
+    @keyword
+    def enable_metrics(self, report_path: Union[str, Path, None] = None):
+        """Starts measuring the duration of every keyword of this library, of every playwright call made by it
+        and of every selector used by it. Measuring is off by default and it costs almost nothing then.
+
+        Durations are collected into histograms - count, mean, p50, p95, p99 and max in milliseconds.
+        Histograms are shared by all suites run by the process and written to the json file given by
+        `report_path` at the end of every suite. Default is _playwbot_metrics.json_ in the output folder.
+        Summary of the histograms is logged by Metrics Report keyword.
+
+        == Example ==
+
+        | =A=            | =B=            | =C=                                  |
+        | Suite Setup    | Enable Metrics |                                      |
+        | Suite Setup    | Enable Metrics | report_path=${OUTPUT DIR}/times.json |
+        """
+        if report_path is None:
+            report_path = (
+                Path(BuiltIn().get_variable_value("${OUTPUT DIR}"))
+                / "playwbot_metrics.json"
+            )
+        METRICS.enable(report_path)
+
+    @keyword
+    def disable_metrics(self):
+        """Stops measuring started by Enable Metrics keyword. Collected histograms are kept.
+
+        == Example ==
+
+        | =A=             |
+        | Disable Metrics |
+        """
+        METRICS.disable()
+
+    @keyword
+    def enable_adaptive_timeouts(
+        self,
+        path: Union[str, Path, None] = None,
+        percentile: float = 99,
+        margin: float = 1.5,
+        floor: float = 1000,
+        ceiling: float = 30000,
+        min_samples: int = 20,
+    ):
+        """Makes Click, Fill, Check, Uncheck, Wait For Selector and Wait For Url keywords use timeouts
+        learned from their latency in the previous runs, unless _timeout_ is given to them explicitly.
+
+        Latency is recorded by keyword, selector and url of the page with ids replaced by `*`, into
+        the json file at _path_, default is _.playwbot_timeouts.json_ in the execution folder. The file
+        is updated at the end of every suite, keep it between the runs, e.g. in the CI cache.
+
+        Timeout is the _percentile_ of the latency multiplied by the _margin_, at least _floor_ and
+        at most _ceiling_ miliseconds. Until there are _min_samples_ of the operation, it keeps its
+        usual timeout. So the test fails in about the time the operation takes in the worst case,
+        not after the default 30 seconds.
+
+        == Example ==
+
+        | =A=                      | =B=                      | =C=               | =D=              |
+        | Suite Setup              | Enable Adaptive Timeouts |                   |                  |
+        | Enable Adaptive Timeouts | path=${CURDIR}/t.json    | percentile=${95}  | margin=${2}      |
         """
-        return page.close_page(page.page, run_before_unload=run_before_unload)
+        if path is None:
+            path = (
+                Path(BuiltIn().get_variable_value("${EXECDIR}"))
+                / ".playwbot_timeouts.json"
+            )
+        self._adaptive_timeouts.enable(
+            path,
+            percentile=percentile,
+            margin=margin,
+            floor=floor,
+            ceiling=ceiling,
+            min_samples=min_samples,
+        )
+
+    @keyword
+    def disable_adaptive_timeouts(self):
+        """Stops using the timeouts enabled by Enable Adaptive Timeouts keyword and saves
+        the latency recorded so far.
+
+        == Example ==
+
+        | =A=                       |
+        | Disable Adaptive Timeouts |
+        """
+        self._adaptive_timeouts.disable()
+
+    @keyword
+    def metrics_report(self, top: int = 20):
+        """Writes the histograms collected since Enable Metrics keyword to the json file, logs the `top`
+        slowest keywords, playwright calls and selectors by their p95 duration and returns all histograms
+        as _dict_ with `keywords`, `calls` and `selectors` keys.
+
+        == Example ==
+
+        | =A=        | =B=            | =C=      |
+        | &{report}= | Metrics Report | top=${5} |
+        """
+        summary: dict[str, dict[str, dict[str, Union[int, float]]]] = METRICS.summary()
+        report_path: Optional[Path] = METRICS.write_report()
+
+        lines: list[str] = []
+        for group, histograms in summary.items():
+            lines.append(f"Slowest {group} by p95 [ms]:")
+            slowest = sorted(
+                histograms.items(), key=lambda item: item[1]["p95"], reverse=True
+            )
+            for name, histogram in slowest[: int(top)]:
+                lines.append(
+                    f"  {name}: count={histogram['count']} p50={histogram['p50']} "
+                    f"p95={histogram['p95']} p99={histogram['p99']} max={histogram['max']}"
+                )
+        if report_path is not None:
+            lines.append(f"Full report: {report_path}")
+        logger.info("\n".join(lines))
+        return summary
 
     @keyword
     def bring_to_front(self, page: PlaywbotPage):
@@ -301,7 +1096,7 @@ class Playwbot:
     @keyword
     def check(
         self,
-        handle: Union[PlaywbotPage, ElementHandle, Frame],
+        handle: Union[PlaywbotPage, ElementHandle, Frame, Locator],
         selector: Union[str, None] = None,
         **kwargs,
     ):
@@ -337,14 +1132,20 @@ class Playwbot:
         | ${element}= | Query Element | ${page} | #id=my-id |
         | Check       | ${element}    |         |           |
         """
-        if isinstance(handle, (PlaywbotPage, Frame)) and selector is not None:
-            return handle.check(selector, **kwargs)
-        return handle.check(**kwargs)
+
+        def check(**options):
+            if isinstance(handle, (PlaywbotPage, Frame)) and selector is not None:
+                return handle.check(selector, **options)
+            return handle.check(**options)
+
+        return self._adaptive_timeouts.run(
+            "Check", selector, self._url_of(handle), kwargs, check
+        )
 
     @keyword
     def uncheck(
         self,
-        handle: Union[PlaywbotPage, Frame, ElementHandle],
+        handle: Union[PlaywbotPage, Frame, ElementHandle, Locator],
         selector: Union[str, None] = None,
         **kwargs,
     ):
@@ -378,14 +1179,20 @@ class Playwbot:
         | ${element}= | Query Element | ${page} | #id=my-id |
         | Uncheck     | ${element}    |         |           |
         """
-        if isinstance(handle, (PlaywbotPage, Frame)) and selector is not None:
-            return handle.uncheck(selector, **kwargs)
-        return handle.uncheck(**kwargs)
+
+        def uncheck(**options):
+            if isinstance(handle, (PlaywbotPage, Frame)) and selector is not None:
+                return handle.uncheck(selector, **options)
+            return handle.uncheck(**options)
+
+        return self._adaptive_timeouts.run(
+            "Uncheck", selector, self._url_of(handle), kwargs, uncheck
+        )
 
     @keyword
     def click(
         self,
-        handle: Union[PlaywbotPage, ElementHandle, Frame],
+        handle: Union[PlaywbotPage, ElementHandle, Frame, Locator],
         selector: Union[str, None] = None,
         **kwargs,
     ):
@@ -427,9 +1234,15 @@ class Playwbot:
         | ${in_frame_selector}= | Convert To String | xpath=//some-selector |                |
         | Click                 | ${frame}          | ${in_frame_selector}  |                |
         """
-        if isinstance(handle, (PlaywbotPage, Frame)) and selector is not None:
-            return handle.click(selector=selector, **kwargs)
-        return handle.click(**kwargs)
+
+        def click(**options):
+            if isinstance(handle, (PlaywbotPage, Frame)) and selector is not None:
+                return handle.click(selector=selector, **options)
+            return handle.click(**options)
+
+        return self._adaptive_timeouts.run(
+            "Click", selector, self._url_of(handle), kwargs, click
+        )
 
     @keyword
     def content_frame(self, handle: ElementHandle):
@@ -575,7 +1388,7 @@ class Playwbot:
     @keyword
     def fill(
         self,
-        handle: Union[PlaywbotPage, ElementHandle, Frame],
+        handle: Union[PlaywbotPage, ElementHandle, Frame, Locator],
         selector: Union[str, None] = None,
         value: str = "",
         **kwargs,
@@ -610,10 +1423,65 @@ class Playwbot:
         | =A=  | =B=        | =C=                        |
         | Fill | ${element} | some value to be filled in |
         """
-        if isinstance(handle, (PlaywbotPage, Frame)) and selector is not None:
-            return handle.fill(selector, value, **kwargs)
 
-        return handle.fill(value, **kwargs)
+        def fill(**options):
+            if isinstance(handle, (PlaywbotPage, Frame)) and selector is not None:
+                return handle.fill(selector, value, **options)
+            return handle.fill(value, **options)
+
+        return self._adaptive_timeouts.run(
+            "Fill", selector, self._url_of(handle), kwargs, fill
+        )
+
+    @keyword
+    def fill_form(
+        self,
+        handle: Union[PlaywbotPage, Frame],
+        fields: dict[str, Any],
+        fast: bool = False,
+        **kwargs,
+    ):
+        """Fills the whole form given as _dict_ of selector and value of each field.
+
+        - text inputs, textareas and contenteditable elements are filled with the value
+        - select gets the option selected by its value or label, _list_ value selects several options
+        - checkbox and radio are checked, if the value is _True_ or _true_, otherwise unchecked
+        - file input gets the file, or _list_ of files, set
+
+        Kind of all fields is found out by one call to the browser. By default, the fields are then
+        filled one by one, the same way as by Fill, Check, Uncheck or Set Input Files keywords.
+        Other `kwargs`, e.g. `timeout`, are passed to each of these calls.
+
+        With `fast=${True}`, the values are written directly in the page, along with dispatching
+        `input` and `change` events, so the whole form is filled by one call to the browser. Playwright's
+        actionability checks, see https://playwright.dev/python/docs/actionability, are skipped then,
+        except for the file inputs and the fields, which cannot be found by css or xpath selector.
+
+        All fields are tried, the keyword fails at the end, listing the error of each field,
+        which could not be filled.
+
+        == Example ==
+
+        Selectors often contain _=_, which has to be escaped, when the dictionary is built.
+
+        | =A=               | =B=               | =C=                   | =D=          |
+        | ${fields}=        | Create Dictionary |                       |              |
+        | Set To Dictionary | ${fields}         | css\\=#name           | Joe          |
+        | Set To Dictionary | ${fields}         | css\\=#country        | Czechia      |
+        | Set To Dictionary | ${fields}         | //input[@id\\="terms"] | ${True}      |
+        | Fill Form         | ${page}           | ${fields}            |              |
+        | Fill Form         | ${page}           | ${fields}            | fast=${True} |
+        """
+        if isinstance(handle, Frame):
+            handle = Handle(handle)
+        errors: dict[str, str] = handle.fill_form(fields, fast=fast, **kwargs)
+        if errors:
+            raise RuntimeError(
+                "Form fields could not be filled:\n"
+                + "\n".join(
+                    f"{selector}: {error}" for selector, error in errors.items()
+                )
+            )
 
     @keyword
     def frame(
@@ -657,10 +1525,75 @@ class Playwbot:
         """
         return page.go_to(page.page, url, **kwargs)
 
+    @keyword
+    def go_to_all(
+        self,
+        entries: list[list[Any]],
+        wait_until: Union[
+            Literal["load", "domcontentloaded", "networkidle", "commit"], None
+        ] = "load",
+        timeout: Union[float, None] = None,
+    ):
+        """Navigates several pages. Returns, when each page reached the requested load state.
+
+        Each entry of `entries` is a _list_ of the page, url and optional _dict_ of options
+        (`wait_until`, `timeout`, `referer`) overriding the `wait_until` and `timeout` arguments
+        of this keyword.
+
+        Returns _list_ of _dicts_ with the `page`, `url`, `response`, `status` and `elapsed` seconds
+        of each navigation, in the same order as `entries`. If any navigation fails, the keyword
+        fails after all navigations are finished.
+
+        With _async_ backend, all navigations are started by
+        https://playwright.dev/python/docs/api/class-page#page-goto at once, so the keyword takes
+        about as long as the slowest page, not as the sum of all pages. With _sync_ backend,
+        the pages are navigated one after another, as by Go To keyword.
+
+        == Example ==
+
+        | =A=         | =B=                    | =C=                    | =D=                   | =E=        |
+        | ${page1}=   | New Page               | ${context}             |                       |            |
+        | ${page2}=   | New Page               | ${context}             |                       |            |
+        | &{options}= | Create Dictionary      | wait_until=networkidle |                       |            |
+        | @{entry1}=  | Create List            | ${page1}               | https://some/url.com  |            |
+        | @{entry2}=  | Create List            | ${page2}               | https://other/url.com | ${options} |
+        | @{entries}= | Create List            | ${entry1}              | ${entry2}             |            |
+        | @{results}= | Go To All              | ${entries}             | timeout=${10000}      |            |
+        | Log         | ${results}[1][elapsed] |                        |                       |            |
+        """
+        navigations: list[tuple[Any, str, dict[str, Any]]] = []
+        for entry in entries:
+            page, url, *options = entry
+            navigations.append(
+                (
+                    page.page,
+                    url,
+                    {
+                        "wait_until": wait_until,
+                        "timeout": timeout,
+                        **(options[0] if options else {}),
+                    },
+                )
+            )
+
+        results: list[dict[str, Any]] = PlaywbotPage.go_to_all(navigations)
+        for entry, result in zip(entries, results):
+            result["page"] = entry[0]
+            result["url"] = entry[1]
+
+        errors: list[str] = [
+            f"{result['url']}: {result['error']}"
+            for result in results
+            if result["error"]
+        ]
+        if errors:
+            raise RuntimeError("Navigation failed:\n" + "\n".join(errors))
+        return results
+
     @keyword
     def is_editable(
         self,
-        handle: Union[PlaywbotPage, ElementHandle, Frame],
+        handle: Union[PlaywbotPage, ElementHandle, Frame, Locator],
         selector: Union[str, None] = None,
         timeout: Union[float, None] = None,
     ):
@@ -696,13 +1629,13 @@ class Playwbot:
         """
         if isinstance(handle, (PlaywbotPage, Frame)) and selector is not None:
             return handle.is_editable(selector=selector, timeout=timeout)
-        if isinstance(handle, ElementHandle):
+        if isinstance(handle, (ElementHandle, Locator)):
             return handle.is_editable()
 
     @keyword
     def is_enabled(
         self,
-        handle: Union[PlaywbotPage, ElementHandle, Frame],
+        handle: Union[PlaywbotPage, ElementHandle, Frame, Locator],
         selector: Union[str, None] = None,
         timeout: Union[float, None] = None,
     ):
@@ -738,13 +1671,13 @@ class Playwbot:
         """
         if isinstance(handle, (PlaywbotPage, Frame)) and selector is not None:
             return handle.is_enabled(selector=selector, timeout=timeout)
-        if isinstance(handle, ElementHandle):
+        if isinstance(handle, (ElementHandle, Locator)):
             return handle.is_enabled()
 
     @keyword
     def is_hidden(
         self,
-        handle: Union[PlaywbotPage, ElementHandle, Frame],
+        handle: Union[PlaywbotPage, ElementHandle, Frame, Locator],
         selector: Union[str, None] = None,
         timeout: Union[float, None] = None,
     ):
@@ -780,13 +1713,13 @@ class Playwbot:
         """
         if isinstance(handle, (PlaywbotPage, Frame)) and selector is not None:
             return handle.is_hidden(selector=selector, timeout=timeout)
-        if isinstance(handle, ElementHandle):
+        if isinstance(handle, (ElementHandle, Locator)):
             return handle.is_hidden()
 
     @keyword
     def is_visible(
         self,
-        handle: Union[PlaywbotPage, ElementHandle, Frame],
+        handle: Union[PlaywbotPage, ElementHandle, Frame, Locator],
         selector: Union[str, None] = None,
         timeout: Union[float, None] = None,
     ):
@@ -821,9 +1754,117 @@ class Playwbot:
         """
         if isinstance(handle, (PlaywbotPage, Frame)) and selector is not None:
             return handle.is_visible(selector=selector, timeout=timeout)
-        if isinstance(handle, ElementHandle):
+        if isinstance(handle, (ElementHandle, Locator)):
             return handle.is_visible()
 
+    @keyword
+    def element_states(
+        self,
+        handle: Union[PlaywbotPage, Frame],
+        selectors: list[str],
+        states: list[ElementState],
+        wait: bool = False,
+        timeout: Union[float, None] = None,
+    ):
+        """Checks given states of all elements matching given selectors at once and returns
+        _dict_ of the states by selector, e.g. `{"#name": {"visible": True, "editable": False}}`.
+
+        Supported states are _attached_, _visible_, _hidden_, _enabled_, _disabled_, _editable_
+        and _checked_. Element, which does not exist, is _hidden_ and it is not in any other state.
+
+        Unlike calling Is Visible, Is Enabled, etc. keywords one after another, all css and xpath
+        selectors are checked by single call to the browser. Selectors of other selector engines,
+        e.g. _text=_, are checked one by one, see https://playwright.dev/python/docs/selectors.
+        So are selectors of elements not found by that call, e.g. the ones in the shadow DOM.
+
+        With `wait=${True}`, the keyword waits until all elements are in all given states,
+        or fails after `timeout` milliseconds, 30 seconds by default.
+
+        == Example ==
+
+        | =A=            | =B=                          | =C=       | =D=          | =E=       | =F=          |
+        | @{selectors}=  | Create List                  | id=name   | css=#email   | //button  |              |
+        | @{states}=     | Create List                  | visible   | enabled      |           |              |
+        | &{result}=     | Element States               | ${page}   | ${selectors} | ${states} |              |
+        | Should Be True | ${result}[//button][enabled] |           |              |           |              |
+        | &{result}=     | Element States               | ${page}   | ${selectors} | ${states} | wait=${True} |
+        """
+        if isinstance(handle, Frame):
+            handle = Handle(handle)
+        return handle.element_states(selectors, states, wait=wait, timeout=timeout)
+
+    @staticmethod
+    def _url_of(handle: Any) -> Optional[str]:
+        if isinstance(handle, PlaywbotPage):
+            return handle.page.url
+        if isinstance(handle, Frame):
+            return handle.url
+        if isinstance(handle, Locator):
+            return handle.page.url
+        return None
+
+    def _register_handles(
+        self, handle: Union[PlaywbotPage, ElementHandle, Frame], value: Any
+    ) -> Any:
+        owner = handle.page if isinstance(handle, PlaywbotPage) else handle
+        return self._handle_registry.register(owner, value)
+
+    @keyword
+    def live_element_handles(self):
+        """Returns and logs the number of element handles returned by Query Selector, Query Selector All
+        and Wait For Selector keywords, which were not disposed yet.
+
+        Each element handle keeps its element in the browser's memory. Handles returned during the test
+        are disposed, when the test ends. Handles of the page are disposed also when the page navigates,
+        including the in-page navigations of single page apps, e.g. `history.pushState()`. Handles
+        returned outside of tests, e.g. in Suite Setup, live until then.
+
+        == Example ==
+
+        | =A=            | =B=                  |
+        | ${count}=      | Live Element Handles |
+        | Should Be True | ${count} < 100       |
+        """
+        live: dict[str, int] = self._handle_registry.live()
+        logger.info(f"Live element handles by page: {live}")
+        return sum(live.values())
+
+    @keyword
+    def dispose_element_handles(self):
+        """Disposes all live element handles, see Live Element Handles keyword, and returns their number.
+
+        == Example ==
+
+        | =A=                     |
+        | Dispose Element Handles |
+        """
+        return self._handle_registry.dispose()
+
+    @keyword
+    def get_locator(self, handle: Union[PlaywbotPage, Frame], selector: str):
+        """Returns locator of the given selector in the page or frame.
+
+        Locator is resolved anew on every action, so it does not go stale like *<ElementHandle>*
+        and does not keep the element in the browser's memory.
+
+        Locator can be used instead of the handle and selector with Check, Uncheck, Click, Fill,
+        Is Editable, Is Enabled, Is Hidden, Is Visible and Set Input Files keywords.
+
+        Locator is strict - actions fail, if the selector matches more than one element.
+
+        See https://playwright.dev/python/docs/api/class-locator for documentation.
+
+        == Example ==
+
+        | =A=           | =B=         | =C=        | =D=                   |
+        | ${page}=      | New Page    | ${context} |                       |
+        | ${button}=    | Get Locator | ${page}    | xpath=//button[@id=1] |
+        | Click         | ${button}   |            |                       |
+        | ${visible}=   | Is Visible  | ${button}  |                       |
+        """
+        owner = handle.page if isinstance(handle, PlaywbotPage) else handle
+        return owner.locator(selector)
+
     @keyword
     def query_selector(self, handle: Union[PlaywbotPage, ElementHandle], selector: str):
         """Finds and returns element that matches the given selector. If no element is found, returns _None_.
@@ -854,7 +1895,7 @@ class Playwbot:
         | ${element_one}=  | Query Selector    | ${page}                | ${selector_one} |
         | ${element_two}=  | Query Selector    | ${element_one}         | ${selector_two} |
         """
-        return handle.query_selector(selector)
+        return self._register_handles(handle, handle.query_selector(selector))
 
     @keyword
     def query_selector_all(
@@ -889,7 +1930,57 @@ class Playwbot:
         | ${element}=    | Query Selector     | ${page}                | ${selector_1} |
         | @{elements}=   | Query Selector All | ${element}             | ${selector_2} |
         """
-        return handle.query_selector_all(selector)
+        return self._register_handles(handle, handle.query_selector_all(selector))
+
+    @keyword
+    def query_selector_all_data(
+        self,
+        handle: Union[PlaywbotPage, ElementHandle, Frame],
+        selector: str,
+        attributes: Union[list[str], None] = None,
+        limit: Union[int, None] = None,
+        offset: int = 0,
+        page_size: Union[int, None] = None,
+    ):
+        """Finds all elements matching given selector and returns their data in _list_ of _dicts_,
+        instead of the elements. Each _dict_ has these keys:
+
+        - `text` - visible text of the element
+        - `attributes` - _dict_ with values of the attributes given by `attributes` _list_
+        - `box` - bounding box of the element with `x`, `y`, `width` and `height` keys
+        - `visible` - whether the element is visible
+
+        Data of all elements are read by one call to the browser, unlike reading them from each element
+        returned by Query Selector All keyword, and no element handles are left to occupy browser's memory.
+
+        - `limit` - returns only this many records
+        - `offset` - skips this many elements first, e.g. to read the next page of the records
+
+        With `page_size`, the records are read by `page_size` records per call to the browser, so very
+        large number of elements is not transferred by one call. The keyword still returns _list_ of all
+        records, `limit` and `offset` are ignored then.
+
+        == Example ==
+
+        | =A=          | =B=                     | =C=        | =D=                    | =E=                    | =F=           |
+        | @{names}=    | Create List             | href       | title                  |                        |               |
+        | @{links}=    | Query Selector All Data | ${page}    | css=a                  | attributes=${names}    | limit=${100}  |
+        | Log          | ${links}[0][attributes][href] |      |                        |                        |               |
+        | @{rows}=     | Query Selector All Data | ${page}    | css=table tr           | page_size=${1000}      |               |
+        """
+        if not isinstance(handle, PlaywbotPage):
+            handle = Handle(handle)
+        if page_size is not None:
+            # list, robot would read the lazy iterator once and see it empty afterwards
+            return list(
+                handle.iter_query_selector_all_data(
+                    selector, attributes, page_size=page_size
+                )
+            )
+        records, _ = handle.query_selector_all_data(
+            selector, attributes, limit=limit, offset=offset
+        )
+        return records
 
     @keyword
     def reload(self, page: PlaywbotPage, **kwargs):
@@ -910,7 +2001,7 @@ class Playwbot:
     @keyword
     def set_input_files(
         self,
-        page: Union[PlaywbotPage, ElementHandle, Frame],
+        page: Union[PlaywbotPage, ElementHandle, Frame, Locator],
         files: Union[
             str,
             Path,
@@ -952,7 +2043,7 @@ class Playwbot:
         if isinstance(page, (PlaywbotPage, Frame)) and selector is not None:
             return page.set_input_files(selector, files, **kwargs)
 
-        if isinstance(page, ElementHandle) and selector is None:
+        if isinstance(page, (ElementHandle, Locator)) and selector is None:
             return page.set_input_files(files, **kwargs)
 
     @keyword
@@ -981,9 +2072,166 @@ class Playwbot:
         | =A=        | =B=        | =C=                   |
         | Screenshot | ${element} | path=path/to/file.png |
 
+        === In Background ===
+
+        After Enable Background Screenshots keyword, the keyword returns right after the capture and
+        returns path of the file, which is written in the background. If _path_ is not given, the file
+        is named by the test in the folder of the background screenshots.
+
+        | =A=                           | =B=        | =C=     |
+        | Enable Background Screenshots |            |         |
+        | ${path}=                      | Screenshot | ${page} |
         """
+        if self._screenshots.enabled:
+            return self._screenshots.capture(handle, **kwargs)
         return handle.screenshot(**kwargs)
 
+    @keyword
+    def enable_background_screenshots(
+        self,
+        directory: Union[str, Path, None] = None,
+        image_type: ImageType = "png",
+        quality: Optional[int] = None,
+        workers: int = 2,
+        queue_size: int = 16,
+    ):
+        """Makes Screenshot keyword return right after the screenshot is captured. Encoding, hashing and
+        writing of the screenshots to the disk is done by _workers_ background threads.
+
+        Screenshot identical to the previous screenshot of the same page, or element, is not encoded
+        and written again, its file is hard linked, or copied, from the previous one. At most _queue_size_ screenshots wait for the workers, Screenshot keyword waits for a free
+        slot, when the queue is full. All screenshots of the test are written, when the test ends.
+
+        Screenshots without _path_ are written to the _directory_, default is _screenshots_ folder
+        in the output folder. _image_type_ is _png_ or _jpeg_ with the _quality_ 0-100. Jpeg is encoded
+        by the workers, if Pillow is installed, else by the browser.
+
+        == Example ==
+
+        | =A=                           | =B=                           | =C=                 | =D=            |
+        | Suite Setup                   | Enable Background Screenshots |                     |                |
+        | Enable Background Screenshots | image_type=jpeg               | quality=${80}       | workers=${4}   |
+        """
+        if directory is None:
+            directory = (
+                Path(BuiltIn().get_variable_value("${OUTPUT DIR}")) / "screenshots"
+            )
+        self._screenshots.enable(
+            directory,
+            image_type=image_type,
+            quality=quality,
+            workers=workers,
+            queue_size=queue_size,
+        )
+
+    @keyword
+    def disable_background_screenshots(self):
+        """Writes pending background screenshots and makes Screenshot keyword write them directly again.
+
+        Fails, if some of the screenshots could not be written.
+
+        == Example ==
+
+        | =A=                            |
+        | Disable Background Screenshots |
+        """
+        self._screenshots.disable()
+        self._raise_screenshot_errors()
+
+    @keyword
+    def flush_screenshots(self):
+        """Waits until all background screenshots are written and returns their stats - _captured_,
+        _written_ and _deduplicated_ screenshots. Screenshots are flushed at the end of every test anyway.
+
+        Fails, if some of the screenshots could not be written.
+
+        == Example ==
+
+        | =A=       | =B=               |
+        | &{stats}= | Flush Screenshots |
+        """
+        self._screenshots.flush()
+        self._raise_screenshot_errors()
+        return dict(self._screenshots.stats)
+
+    @keyword
+    def compare_screenshot(
+        self,
+        handle: Union[PlaywbotPage, ElementHandle],
+        baseline: Union[str, Path],
+        threshold: float = 0.1,
+        max_mismatch: Optional[float] = None,
+        ignore_regions: Optional[list[dict[str, float]]] = None,
+        anti_aliasing: bool = True,
+        diff_path: Union[str, Path, None] = None,
+        **kwargs,
+    ):
+        """Takes screenshot of the page or element and compares it with the _baseline_ image. Returns
+        the ratio of mismatched pixels to all compared pixels. If the _baseline_ does not exist yet,
+        the screenshot is saved as the baseline.
+
+        Requires numpy and Pillow packages, install them by `pip install playwbot[visual]`.
+
+        _threshold_ is per-pixel color tolerance from 0 (exact match) to 1. Pixels in _ignore_regions_,
+        dictionaries with _x_, _y_, _width_ and _height_, are not compared. With _anti_aliasing_ pixels,
+        which are only shifted by one pixel, e.g. edges of the text, do not count as mismatched.
+
+        Pixels, which differ, are highlighted in the diff image written to the _diff_path_, default is
+        _visual_ folder in the output folder. Fails, if the ratio is greater than _max_mismatch_.
+
+        Decoded baselines are cached, so comparing with the same baseline again does not decode it again.
+        Other _kwargs_ are passed to the screenshot, see Screenshot keyword.
+
+        == Example ==
+
+        | =A=                | =B=                | =C=                | =D=                   | =E=                       |
+        | ${ratio}=          | Compare Screenshot | ${page}            | ${CURDIR}/home.png    |                           |
+        | &{banner}=         | Create Dictionary  | x=${0}             | y=${0}                | width=${1920}             |
+        | Set To Dictionary  | ${banner}          | height=${80}       |                       |                           |
+        | @{regions}=        | Create List        | ${banner}          |                       |                           |
+        | Compare Screenshot | ${page}            | ${CURDIR}/home.png | max_mismatch=${0.001} | ignore_regions=${regions} |
+        """
+        if diff_path is None:
+            diff_path = (
+                Path(BuiltIn().get_variable_value("${OUTPUT DIR}"))
+                / "visual"
+                / f"{Path(baseline).stem}-diff.png"
+            )
+        kwargs.pop("path", None)
+        kwargs["type"] = "png"
+        result: dict[str, Any] = compare_screenshot(
+            handle.screenshot(**kwargs),
+            baseline,
+            diff_path,
+            threshold=threshold,
+            ignore_regions=ignore_regions,
+            anti_aliasing=anti_aliasing,
+        )
+        ratio: float = result["mismatch_ratio"]
+        if result["baseline_created"]:
+            logger.info(
+                f"Baseline {baseline} did not exist, screenshot was saved as it."
+            )
+        else:
+            logger.info(
+                f"Mismatched {result['mismatched']} of {result['compared']} pixels ({ratio:.4%}), "
+                f"{result['anti_aliased']} anti-aliased. Diff image: {result['diff_path']}"
+            )
+        if max_mismatch is not None and ratio > max_mismatch:
+            raise RuntimeError(
+                f"Screenshot differs from the baseline {baseline} by {ratio:.4%}, "
+                f"max allowed is {max_mismatch:.4%}. See {result['diff_path']}."
+            )
+        return ratio
+
+    def _raise_screenshot_errors(self):
+        errors: list[str] = self._screenshots.errors
+        self._screenshots.errors = []
+        if errors:
+            raise RuntimeError(
+                "Background screenshots could not be written:\n" + "\n".join(errors)
+            )
+
     @keyword
     def title(self, handle: Union[PlaywbotPage, Frame]):
         """Returns the title of the page or frame.
@@ -1063,6 +2311,41 @@ class Playwbot:
         """
         return page.wait_for_load_state(page.page, state=state, timeout=timeout)
 
+    @keyword
+    def wait_for_page_quiet(
+        self,
+        page: PlaywbotPage,
+        quiet: float = 300,
+        timeout: float = 30000,
+        ignore_urls: Optional[list[str]] = None,
+    ):
+        """Returns, as soon as the page had no request in flight and no DOM mutation for
+        the _quiet_ window in miliseconds. Fails, if that does not happen within _timeout_.
+
+        Use it instead of the fixed Wait For Timeout after navigation or after actions, which
+        make single page applications load and render data. Requests of the whole context are
+        tracked, DOM mutations are observed in the main frame of the page.
+
+        Requests to urls matching _ignore_urls_ globs do not count, e.g. long polling, analytics
+        or other requests, which never end.
+
+        Returns miliseconds it took until the page got quiet.
+
+        == Example ==
+
+        | =A=                 | =B=      | =C=                  | =D=           | =E=                      |
+        | ${page}=            | New Page | ${context}           |               |                          |
+        | Go To               | ${page}  | https://some/url.com |               |                          |
+        | Wait For Page Quiet | ${page}  |                      |               |                          |
+        | @{ignored}=         | Create List | **/analytics/**   |               |                          |
+        | ${elapsed}=         | Wait For Page Quiet | ${page}   | quiet=${500}  | ignore_urls=${ignored}   |
+        """
+        elapsed: float = page.wait_for_quiet(
+            page.page, quiet=quiet, timeout=timeout, ignore_urls=ignore_urls
+        )
+        logger.info(f"Page got quiet after {elapsed:.0f} ms.")
+        return elapsed
+
     @keyword
     def wait_for_selector(
         self, handle: Union[PlaywbotPage, ElementHandle], selector: str, **kwargs
@@ -1099,7 +2382,14 @@ class Playwbot:
         | ${element}=   | Wait For Selector | ${page}                | ${selector} |                |
         | ${element2}=  | Wait For Selector | ${element}             | ${selector} | state=visible  |
         """
-        return handle.wait_for_selector(selector, **kwargs)
+        element = self._adaptive_timeouts.run(
+            "Wait For Selector",
+            selector,
+            self._url_of(handle),
+            kwargs,
+            lambda **options: handle.wait_for_selector(selector, **options),
+        )
+        return self._register_handles(handle, element)
 
     @keyword
     def wait_for_timeout(self, page: PlaywbotPage, timeout: float):
@@ -1136,4 +2426,10 @@ class Playwbot:
         | Click        | ${page}           | ${selector}           |                        |               |
         | Wait For Url | ${page}           | **/page.html          | wait_until=networkidle | timeout=30000 |
         """
-        return page.wait_for_url(page.page, url, **kwargs)
+        return self._adaptive_timeouts.run(
+            "Wait For Url",
+            url if isinstance(url, str) else None,
+            page.page.url,
+            kwargs,
+            lambda **options: page.wait_for_url(page.page, url, **options),
+        )
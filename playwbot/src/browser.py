@@ -1,29 +1,168 @@
 """Implements Playwright's Browser.
 """
 
-from typing import Optional, Union
+import atexit
+import json
+import time
+from typing import TYPE_CHECKING, Any, Optional, Union
 from pathlib import Path
 from playwright.sync_api import sync_playwright
 
+from playwbot.src.server import PlaywbotBrowserServer
+
+if TYPE_CHECKING:
+    from playwbot.src.engine import PlaywbotAsyncEngine
+
 
 class PlaywbotBrowser:
     def __init__(
         self,
         browser: str = "chromium",
+        backend: str = "sync",
         persistent: bool = False,
         user_data_dir: Optional[Union[str, Path]] = None,
-        **kwargs
+        server: bool = False,
+        server_registry_dir: Optional[Union[str, Path]] = None,
+        ws_endpoint: Optional[str] = None,
+        cdp_endpoint: Optional[str] = None,
+        recycle_after_contexts: Optional[int] = None,
+        recycle_max_rss: Optional[float] = None,
+        recycle_max_age: Optional[float] = None,
+        **kwargs,
     ):
-        self._playwright = self._start_playwright()
-        if not persistent:
-            self.browser = self._start_browser(browser, **kwargs)
-        else:
-            self.browser = self._start_persistent_browser(
-                browser, user_data_dir=user_data_dir, **kwargs
+        if persistent and (server or ws_endpoint or cdp_endpoint):
+            raise RuntimeError(
+                "Persistent browser cannot be shared via browser server."
+            )
+
+        recycling: bool = any(
+            limit is not None
+            for limit in (recycle_after_contexts, recycle_max_rss, recycle_max_age)
+        )
+        if recycling and (server or ws_endpoint or cdp_endpoint):
+            raise RuntimeError("Only browser launched by this library can be recycled.")
+
+        if backend not in ("sync", "async"):
+            raise RuntimeError(
+                "You have to select either 'sync' or 'async' as backend."
+            )
+
+        if browser not in ("chromium", "firefox", "webkit"):
+            raise RuntimeError(
+                "You have to select either 'chromium', 'firefox', or 'webkit' as browser."
+            )
+
+        self._browser_name: str = browser
+        self._backend: str = backend
+        self._persistent: bool = persistent
+        self._user_data_dir: Optional[Union[str, Path]] = user_data_dir
+        self._server_requested: bool = server
+        self._server_registry_dir: Optional[Union[str, Path]] = server_registry_dir
+        self._ws_endpoint: Optional[str] = ws_endpoint
+        self._cdp_endpoint: Optional[str] = cdp_endpoint
+        self._kwargs: dict[str, Any] = kwargs
+        self._recycle_after_contexts: Optional[int] = recycle_after_contexts
+        self._recycle_max_rss: Optional[float] = recycle_max_rss
+        self._recycle_max_age: Optional[float] = recycle_max_age
+        self._launched_at: float = 0.0
+        self.contexts_served: int = 0
+        self.restarts: int = 0
+
+        self._engine: Optional["PlaywbotAsyncEngine"] = None
+        self._server: Optional[PlaywbotBrowserServer] = None
+        self._playwright = None
+        self._browser = None
+        self._launch_error: Optional[Exception] = None
+
+    @property
+    def browser(self):
+        """Browser, or persistent context, launched by the first access, so the driver
+        is not started by suites, which never use the browser.
+        """
+        if self._launch_error is not None:
+            # failed launch is not repeated by every test
+            raise RuntimeError(
+                f"Browser failed to launch: {self._launch_error}"
+            ) from self._launch_error
+        if self._browser is None:
+            try:
+                self._browser = self._launch()
+            except Exception as error:
+                self._launch_error = error
+                self._stop_driver()
+                raise
+            self._launched_at = time.monotonic()
+            self.contexts_served = 0
+        return self._browser
+
+    @property
+    def is_started(self) -> bool:
+        return self._browser is not None
+
+    def _launch(self):
+        if self._backend == "async":
+            # asyncio backend is imported only when it is used
+            from playwbot.src.engine import (  # pylint: disable=import-outside-toplevel
+                PlaywbotAsyncEngine,
             )
 
-    @staticmethod
-    def _start_playwright():
+            self._engine = PlaywbotAsyncEngine()
+
+        browser: str = self._browser_name
+        ws_endpoint: Optional[str] = self._ws_endpoint
+        if self._server_requested:
+            self._server = PlaywbotBrowserServer(
+                browser, registry_dir=self._server_registry_dir, **self._kwargs
+            )
+            ws_endpoint = self._server.acquire()
+
+        self._playwright = self._start_playwright()
+        if ws_endpoint is not None:
+            return self._connect_browser(browser, ws_endpoint)
+        if self._cdp_endpoint is not None:
+            return self._connect_browser_over_cdp(browser, self._cdp_endpoint)
+        if not self._persistent:
+            return self._start_browser(browser, **self._kwargs)
+        return self._start_persistent_browser(
+            browser, user_data_dir=self._user_data_dir, **self._kwargs
+        )
+
+    def _stop_driver(self):
+        """Stops whatever the launch has started - driver, browser server and event loop."""
+        if self._playwright is not None:
+            try:
+                self._playwright.stop()
+            except Exception:  # pylint: disable=broad-except
+                # driver may have failed to start completely
+                pass
+            self._playwright = None
+        if self._server is not None:
+            self._server.release()
+            self._server = None
+        if self._engine is not None:
+            self._engine.stop()
+            self._engine = None
+
+    def process_ids(self) -> list[int]:
+        """Returns ids of the processes started for the browser - playwright driver and browser
+        server. The launched browsers are their descendants.
+        """
+        pids: list[int] = []
+        if self._playwright is not None:
+            try:
+                # playwright does not expose its driver process
+                # pylint: disable=protected-access
+                transport: Any = self._playwright._impl_obj._connection._transport
+                pids.append(transport._proc.pid)
+            except AttributeError:
+                pass
+        if self._server is not None and self._server.pid is not None:
+            pids.append(self._server.pid)
+        return pids
+
+    def _start_playwright(self):
+        if self._engine is not None:
+            return self._engine.start_playwright()
         return sync_playwright().start()
 
     def _start_browser(self, browser: str, **kwargs):
@@ -40,6 +179,26 @@ class PlaywbotBrowser:
             "You have to select either 'chromium', 'firefox', or 'webkit' as browser."
         )
 
+    def _connect_browser(self, browser: str, ws_endpoint: str):
+        if browser == "chromium":
+            return self._playwright.chromium.connect(ws_endpoint)
+
+        if browser == "firefox":
+            return self._playwright.firefox.connect(ws_endpoint)
+
+        if browser == "webkit":
+            return self._playwright.webkit.connect(ws_endpoint)
+
+        raise RuntimeError(
+            "You have to select either 'chromium', 'firefox', or 'webkit' as browser."
+        )
+
+    def _connect_browser_over_cdp(self, browser: str, cdp_endpoint: str):
+        if browser == "chromium":
+            return self._playwright.chromium.connect_over_cdp(cdp_endpoint)
+
+        raise RuntimeError("Only 'chromium' browser can be connected over CDP.")
+
     def _start_persistent_browser(
         self, browser: str, user_data_dir: Optional[Union[str, Path]], **kwargs
     ):
@@ -60,6 +219,127 @@ class PlaywbotBrowser:
             "You have to select either 'chromium', 'firefox' or 'webkit' as browser."
         )
 
+    def serve_context(self):
+        """Returns the browser for the new context and counts the context towards the recycling
+        policy. Browser is launched before the context is counted, as the launch resets the count.
+        """
+        browser: Any = self.browser
+        self.contexts_served += 1
+        return browser
+
+    def recycle_reason(self) -> Optional[str]:
+        """Returns why the browser should be restarted according to the recycling policy,
+        or `None`, if it should not.
+        """
+        if self._browser is None:
+            return None
+        if (
+            self._recycle_after_contexts is not None
+            and self.contexts_served >= self._recycle_after_contexts
+        ):
+            return f"{self.contexts_served} contexts"
+        if self._recycle_max_age is not None:
+            age: float = time.monotonic() - self._launched_at
+            if age >= self._recycle_max_age:
+                return f"{age:.0f} s"
+        if self._recycle_max_rss is not None:
+            from playwbot.src.monitor import (  # pylint: disable=import-outside-toplevel
+                process_tree_rss,
+            )
+
+            rss: float = process_tree_rss(self.process_ids())
+            if rss >= self._recycle_max_rss:
+                return f"{rss:.0f} MB of memory"
+        return None
+
+    def recycle(self) -> float:
+        """Closes the browser and launches it again with the same options, keeping the playwright
+        driver running. Returns seconds the restart took.
+        """
+        started: float = time.perf_counter()
+        self._browser.close()
+        if not self._persistent:
+            self._browser = self._start_browser(self._browser_name, **self._kwargs)
+        else:
+            self._browser = self._start_persistent_browser(
+                self._browser_name, user_data_dir=self._user_data_dir, **self._kwargs
+            )
+        self._launched_at = time.monotonic()
+        self.contexts_served = 0
+        self.restarts += 1
+        return time.perf_counter() - started
+
     def close_browser(self):
-        self.browser.close()
-        self._playwright.stop()
+        if self._browser is None:
+            return
+        self._browser.close()
+        self._browser = None
+        self._stop_driver()
+
+
+class _SharedBrowser:
+    __slots__ = ("browser", "references")
+
+    def __init__(self, browser: PlaywbotBrowser):
+        self.browser: PlaywbotBrowser = browser
+        self.references: int = 0
+
+
+# browsers shared by all suites run by the process, keyed by their launch options
+_SHARED: dict[str, _SharedBrowser] = {}
+
+
+def acquire_shared_browser(
+    browser: str = "chromium", backend: str = "sync", **kwargs
+) -> PlaywbotBrowser:
+    """Returns the browser launched with the same options by another suite, or a new one,
+    and takes a reference to it.
+    """
+    if kwargs.get("persistent"):
+        raise RuntimeError("Persistent browser cannot be shared by suites.")
+
+    key: str = json.dumps(
+        {"browser": browser, "backend": backend, **kwargs}, sort_keys=True, default=str
+    )
+    if key not in _SHARED:
+        _SHARED[key] = _SharedBrowser(
+            PlaywbotBrowser(browser, backend=backend, **kwargs)
+        )
+    shared: _SharedBrowser = _SHARED[key]
+    shared.references += 1
+    return shared.browser
+
+
+def release_shared_browser(browser: PlaywbotBrowser) -> int:
+    """Releases the reference to the shared `browser`. Returns number of the references left.
+
+    Browser without references is kept running for the suites to come and closed
+    at the process exit.
+    """
+    for shared in _SHARED.values():
+        if shared.browser is browser:
+            shared.references = max(shared.references - 1, 0)
+            return shared.references
+    return 0
+
+
+def shared_references(browser: PlaywbotBrowser) -> int:
+    """Returns number of the references to the shared `browser`."""
+    for shared in _SHARED.values():
+        if shared.browser is browser:
+            return shared.references
+    return 0
+
+
+def close_shared_browsers():
+    for shared in _SHARED.values():
+        try:
+            shared.browser.close_browser()
+        except Exception:  # pylint: disable=broad-except
+            # driver may be gone already at the process exit
+            pass
+    _SHARED.clear()
+
+
+# registered once, shared browsers may be acquired again after they were closed
+atexit.register(close_shared_browsers)
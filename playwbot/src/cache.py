@@ -0,0 +1,307 @@
+"""Implements cache of static http responses shared by all browser contexts.
+
+Incognito contexts do not share the http cache of the browser, so each of them
+downloads the same scripts, stylesheets, fonts and images again. The cache serves
+such responses from the route handler instead. Responses are kept in memory
+up to the byte budget and on the disk, so they survive the test run as well.
+Stale responses are revalidated by `ETag` / `Last-Modified` headers and served
+as they are, when the server cannot be reached.
+"""
+
+import email.utils
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from playwright.sync_api import BrowserContext, Route
+from playwright.sync_api import Error as PlaywrightError
+
+_CACHES: dict[Path, "PlaywbotAssetCache"] = {}
+
+_CACHEABLE_RESOURCE_TYPES = frozenset(("script", "stylesheet", "image", "font"))
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+# body is stored decoded, so these headers of the original response do not apply to it
+_BODY_HEADERS = ("content-length", "content-encoding", "transfer-encoding")
+
+
+def get_asset_cache(
+    directory: Optional[Union[str, Path]] = None,
+) -> "PlaywbotAssetCache":
+    """Returns the cache for the given `directory`, which is shared by the whole process.
+
+    Args:
+        directory (Optional[Union[str, Path]], optional): folder to store the responses in.
+        Defaults to `playwbot/asset_cache` folder in the system temp folder.
+
+    Returns:
+        PlaywbotAssetCache: asset cache
+    """
+    path: Path = (
+        Path(directory).resolve()
+        if directory is not None
+        else Path(tempfile.gettempdir()) / "playwbot" / "asset_cache"
+    )
+    if path not in _CACHES:
+        _CACHES[path] = PlaywbotAssetCache(path)
+    return _CACHES[path]
+
+
+class _CachedResponse:
+    __slots__ = ("status", "headers", "body", "vary", "stored_at")
+
+    def __init__(
+        self,
+        status: int,
+        headers: dict[str, str],
+        body: bytes,
+        vary: dict[str, str],
+        stored_at: float,
+    ):
+        self.status: int = status
+        self.headers: dict[str, str] = headers
+        self.body: bytes = body
+        self.vary: dict[str, str] = vary
+        self.stored_at: float = stored_at
+
+    def is_fresh(self) -> bool:
+        cache_control: str = self.headers.get("cache-control", "")
+        if "no-cache" in cache_control:
+            return False
+        max_age = _MAX_AGE.search(cache_control)
+        if max_age is not None:
+            return time.time() - self.stored_at < int(max_age.group(1))
+        if "expires" in self.headers:
+            try:
+                expires = email.utils.parsedate_to_datetime(self.headers["expires"])
+            except (TypeError, ValueError):
+                return False
+            return time.time() < expires.timestamp()
+        return False
+
+    def validators(self) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        if "etag" in self.headers:
+            headers["if-none-match"] = self.headers["etag"]
+        if "last-modified" in self.headers:
+            headers["if-modified-since"] = self.headers["last-modified"]
+        return headers
+
+
+class PlaywbotAssetCache:
+    def __init__(self, directory: Path, max_memory_bytes: int = 64 * 1024 * 1024):
+        """Cache of static responses keyed by the url and the request headers
+        named by `Vary` header of the response.
+
+        Args:
+            directory (Path): folder to store the responses in.
+            max_memory_bytes (int, optional): max size of response bodies kept in memory. Defaults to 64 MiB.
+        """
+        self._directory: Path = directory
+        self._directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        self._max_memory_bytes: int = max_memory_bytes
+        self._memory: "OrderedDict[str, _CachedResponse]" = OrderedDict()
+        self._memory_bytes: int = 0
+        # names of the request headers the responses vary by, by url, read from the disk once
+        self._vary: dict[str, list[str]] = {}
+        # callbacks of the async backend run in several threads
+        self._lock: threading.Lock = threading.Lock()
+        self.stats: dict[str, int] = {
+            "hits": 0,
+            "revalidated": 0,
+            "stale": 0,
+            "misses": 0,
+            "bytes_served": 0,
+            "bytes_downloaded": 0,
+        }
+
+    def install(self, context: BrowserContext):
+        context.route("**/*", self._handle)
+
+    @staticmethod
+    def _hash(*parts: str) -> str:
+        return hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()
+
+    def _vary_file(self, url: str) -> Path:
+        return self._directory / f"{self._hash(url)}.vary.json"
+
+    def _key(self, url: str, request_headers: dict[str, str]) -> str:
+        """Returns key of the response variant matching the request headers."""
+        with self._lock:
+            vary: Optional[list[str]] = self._vary.get(url)
+        if vary is None:
+            try:
+                vary = json.loads(self._vary_file(url).read_text(encoding="utf-8"))
+            except (FileNotFoundError, json.JSONDecodeError):
+                vary = []
+            with self._lock:
+                vary = self._vary.setdefault(url, vary)
+        return self._hash(url, *(request_headers.get(name, "") for name in vary))
+
+    def _handle(self, route: Route):
+        request = route.request
+        if (
+            request.method != "GET"
+            or request.resource_type not in _CACHEABLE_RESOURCE_TYPES
+        ):
+            route.fallback()
+            return
+
+        request_headers: dict[str, str] = request.headers
+        key: str = self._key(request.url, request_headers)
+        cached: Optional[_CachedResponse] = self._get(key)
+
+        if cached is not None and cached.is_fresh():
+            self._fulfill(route, cached, "hits")
+            return
+
+        validators: dict[str, str] = cached.validators() if cached else {}
+        try:
+            response = route.fetch(headers={**request_headers, **validators})
+            body: bytes = response.body()
+        except PlaywrightError:
+            # e.g. DNS failure, or reset connection, the route must be handled anyway
+            if cached is not None:
+                self._fulfill(route, cached, "stale")
+            else:
+                route.fallback()
+            return
+
+        headers: dict[str, str] = {
+            name: value
+            for name, value in response.headers.items()
+            if name not in _BODY_HEADERS
+        }
+
+        if cached is not None and validators and response.status == 304:
+            cached.headers = {**cached.headers, **headers}
+            cached.stored_at = time.time()
+            self._put(key, request.url, cached)
+            self._fulfill(route, cached, "revalidated")
+            return
+
+        with self._lock:
+            self.stats["misses"] += 1
+            self.stats["bytes_downloaded"] += len(body)
+
+        if self._is_cacheable(response.status, headers):
+            vary: dict[str, str] = {
+                name: request_headers.get(name, "")
+                for name in self._vary_names(headers)
+            }
+            self._put(
+                self._hash(request.url, *vary.values()),
+                request.url,
+                _CachedResponse(response.status, headers, body, vary, time.time()),
+            )
+
+        route.fulfill(status=response.status, headers=headers, body=body)
+
+    def _fulfill(self, route: Route, cached: _CachedResponse, counter: str):
+        with self._lock:
+            self.stats[counter] += 1
+            self.stats["bytes_served"] += len(cached.body)
+        route.fulfill(status=cached.status, headers=cached.headers, body=cached.body)
+
+    @staticmethod
+    def _vary_names(headers: dict[str, str]) -> list[str]:
+        return sorted(
+            name.strip().lower()
+            for name in headers.get("vary", "").split(",")
+            if name.strip()
+        )
+
+    @classmethod
+    def _is_cacheable(cls, status: int, headers: dict[str, str]) -> bool:
+        cache_control: str = headers.get("cache-control", "")
+        return (
+            status == 200
+            and "no-store" not in cache_control
+            and "private" not in cache_control
+            and "set-cookie" not in headers
+            and "*" not in cls._vary_names(headers)
+        )
+
+    def _get(self, key: str) -> Optional[_CachedResponse]:
+        with self._lock:
+            cached: Optional[_CachedResponse] = self._memory.get(key)
+            if cached is not None:
+                self._memory.move_to_end(key)
+                return cached
+
+        try:
+            meta: dict[str, Any] = json.loads(
+                (self._directory / f"{key}.json").read_text(encoding="utf-8")
+            )
+            body: bytes = (self._directory / f"{key}.body").read_bytes()
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        cached = _CachedResponse(
+            meta["status"], meta["headers"], body, meta["vary"], meta["stored_at"]
+        )
+        self._remember(key, cached)
+        return cached
+
+    def _put(self, key: str, url: str, cached: _CachedResponse):
+        self._remember(key, cached)
+        vary: list[str] = sorted(cached.vary)
+        with self._lock:
+            changed: bool = self._vary.get(url) != vary
+            self._vary[url] = vary
+        if changed:
+            self._write(self._vary_file(url), json.dumps(vary).encode())
+        self._write(self._directory / f"{key}.body", cached.body)
+        self._write(
+            self._directory / f"{key}.json",
+            json.dumps(
+                {
+                    "url": url,
+                    "status": cached.status,
+                    "headers": cached.headers,
+                    "vary": cached.vary,
+                    "stored_at": cached.stored_at,
+                }
+            ).encode("utf-8"),
+        )
+
+    def _remember(self, key: str, cached: _CachedResponse):
+        """Keeps the response in memory and evicts the least recently used ones
+        to fit into the byte budget.
+        """
+        with self._lock:
+            previous: Optional[_CachedResponse] = self._memory.pop(key, None)
+            if previous is not None:
+                self._memory_bytes -= len(previous.body)
+            if len(cached.body) > self._max_memory_bytes:
+                return
+            self._memory[key] = cached
+            self._memory_bytes += len(cached.body)
+            while self._memory_bytes > self._max_memory_bytes:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= len(evicted.body)
+
+    @staticmethod
+    def _write(path: Path, data: bytes):
+        tmp_file: Path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_file.write_bytes(data)
+        os.replace(tmp_file, path)
+
+    def clear(self):
+        """Removes all responses from memory and from the disk."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+        for path in self._directory.iterdir():
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
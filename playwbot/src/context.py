@@ -1,27 +1,175 @@
 """Implements Playwright's browser's Context.
 """
 
-from typing import Any, Literal, Union
+from functools import partial
+from pathlib import Path
+from typing import Any, Literal, Optional, Union
 
 from playwright.sync_api import Browser, BrowserContext, Page
+from playwbot.src.cache import PlaywbotAssetCache, get_asset_cache
+from playwbot.src.cookies import PlaywbotCookieJar
+from playwbot.src.metrics import instrumented
+from playwbot.src.network import PlaywbotHarReplayer, PlaywbotResourceBlocker
 from playwbot.src.page import PlaywbotPage
+from playwbot.src.pool import PlaywbotContextPool, PlaywbotPagePool
+from playwbot.src.storage import PlaywbotStorageStateCache
+from playwbot.src.tracing import PlaywbotTracer, PlaywbotTracing, TracingPolicy
 from playwbot.src.utils import give_action_args
 
+# options, which make the context unsuitable for being reset and reused by the pool
+_NOT_POOLABLE = ("storage_state", "record_har_path", "record_video_dir")
 
+
+@instrumented
 class PlaywbotContext:
-    def __init__(self, browser_type_instance: Union[Browser, BrowserContext], **kwargs):
+    def __init__(
+        self,
+        browser_type_instance: Union[Browser, BrowserContext],
+        pool: Optional[PlaywbotContextPool] = None,
+        storage_states: Optional[PlaywbotStorageStateCache] = None,
+        tracing: Optional[PlaywbotTracing] = None,
+        **kwargs,
+    ):
         self._browser_type_instance = browser_type_instance
-        self.context = self._start_context(**kwargs)
+        self.pool: Optional[PlaywbotContextPool] = None
+        self.page_pool: Optional[PlaywbotPagePool] = None
+        self.storage_state_restored: bool = False
+        self.resource_blocker: Optional[PlaywbotResourceBlocker] = None
+        self.har_replayer: Optional[PlaywbotHarReplayer] = None
+        self.asset_cache: Optional[PlaywbotAssetCache] = None
+        self.tracer: Optional[PlaywbotTracer] = None
+        self.cookie_jar: Optional[PlaywbotCookieJar] = None
+        self.context = self._start_context(
+            pool=pool, storage_states=storage_states, tracing=tracing, **kwargs
+        )
+
+    def _start_context(
+        self,
+        pool: Optional[PlaywbotContextPool] = None,
+        storage_states: Optional[PlaywbotStorageStateCache] = None,
+        storage_state_name: Optional[str] = None,
+        har_mode: Optional[Literal["record", "replay"]] = None,
+        tracing: Optional[PlaywbotTracing] = None,
+        trace_policy: TracingPolicy = "off",
+        trace_sample: float = 10,
+        trace_dir: Union[str, Path] = "traces",
+        **kwargs,
+    ):
+        if har_mode == "record":
+            kwargs["record_har_path"] = kwargs.pop("har_path")
+            kwargs.pop("har_fallback", None)
+        elif har_mode == "replay" and kwargs.get("har_path") is None:
+            raise ValueError("HAR replay mode requires 'har_path'.")
+        elif har_mode not in (None, "replay"):
+            raise ValueError(f"{har_mode} is not supported HAR mode.")
+
+        if storage_state_name is not None and storage_states is not None:
+            state: Optional[dict[str, Any]] = storage_states.load(storage_state_name)
+            if state is not None:
+                kwargs["storage_state"] = state
+                self.storage_state_restored = True
 
-    def _start_context(self, **kwargs):
         if isinstance(self._browser_type_instance, Browser):
-            return self._browser_type_instance.new_context(**kwargs)
-        if isinstance(self._browser_type_instance, BrowserContext):
-            return self._browser_type_instance
-        raise TypeError(
-            "Broser type instance argument can be of type <Browser> or <BrowserContext> only."
+            if pool is not None and not any(key in kwargs for key in _NOT_POOLABLE):
+                self.pool = pool
+                context, extras = pool.acquire(
+                    partial(self._new_context, self._browser_type_instance), **kwargs
+                )
+            else:
+                context, extras = self._new_context(
+                    self._browser_type_instance, **kwargs
+                )
+        elif isinstance(self._browser_type_instance, BrowserContext):
+            context, extras = self._set_up_context(
+                self._browser_type_instance, **kwargs
+            )
+        else:
+            raise TypeError(
+                "Broser type instance argument can be of type <Browser> or <BrowserContext> only."
+            )
+
+        self.resource_blocker = extras.get("resource_blocker")
+        self.har_replayer = extras.get("har_replayer")
+        self.asset_cache = extras.get("asset_cache")
+        for extra in (self.resource_blocker, self.har_replayer):
+            if extra is not None:
+                extra.reset_stats()
+
+        if tracing is not None:
+            self.tracer = tracing.attach(context, trace_dir, trace_policy, trace_sample)
+        return context
+
+    @classmethod
+    def _new_context(
+        cls,
+        browser: Browser,
+        block_resource_types: Optional[list[str]] = None,
+        block_urls: Optional[list[str]] = None,
+        block_url_regexes: Optional[list[str]] = None,
+        har_path: Optional[Union[str, Path]] = None,
+        har_fallback: Literal["abort", "continue", "fail"] = "abort",
+        asset_cache: bool = False,
+        asset_cache_dir: Optional[Union[str, Path]] = None,
+        **kwargs,
+    ) -> tuple[BrowserContext, dict[str, Any]]:
+        return cls._set_up_context(
+            browser.new_context(**kwargs),
+            block_resource_types=block_resource_types,
+            block_urls=block_urls,
+            block_url_regexes=block_url_regexes,
+            har_path=har_path,
+            har_fallback=har_fallback,
+            asset_cache=asset_cache,
+            asset_cache_dir=asset_cache_dir,
         )
 
+    @staticmethod
+    def _set_up_context(
+        context: BrowserContext,
+        block_resource_types: Optional[list[str]] = None,
+        block_urls: Optional[list[str]] = None,
+        block_url_regexes: Optional[list[str]] = None,
+        har_path: Optional[Union[str, Path]] = None,
+        har_fallback: Literal["abort", "continue", "fail"] = "abort",
+        asset_cache: bool = False,
+        asset_cache_dir: Optional[Union[str, Path]] = None,
+    ) -> tuple[BrowserContext, dict[str, Any]]:
+        """Sets up library features of the newly created `context`.
+
+        Route handlers registered later take precedence, so requests are served
+        from HAR file only if they are not blocked and from the asset cache only
+        if they are not in the HAR file.
+
+        Returns:
+            tuple[BrowserContext, dict[str, Any]]: the context and the objects set up with it
+        """
+        extras: dict[str, Any] = {}
+
+        if asset_cache:
+            cache: PlaywbotAssetCache = get_asset_cache(asset_cache_dir)
+            cache.install(context)
+            extras["asset_cache"] = cache
+
+        if har_path is not None:
+            replayer = PlaywbotHarReplayer(har_path, fallback=har_fallback)
+            replayer.install(context)
+            extras["har_replayer"] = replayer
+
+        if block_resource_types or block_urls or block_url_regexes:
+            blocker = PlaywbotResourceBlocker(
+                block_resource_types, block_urls, block_url_regexes
+            )
+            blocker.install(context)
+            extras["resource_blocker"] = blocker
+
+        return (context, extras)
+
+    def get_cookie_jar(self) -> PlaywbotCookieJar:
+        """Returns cookie jar of the context, which starts watching the context on first use."""
+        if self.cookie_jar is None:
+            self.cookie_jar = PlaywbotCookieJar(self.context)
+        return self.cookie_jar
+
     @staticmethod
     def close_context(context: BrowserContext):
         context.close()
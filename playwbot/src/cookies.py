@@ -0,0 +1,135 @@
+"""Implements cookie jar of the browser context.
+
+Cookies are read from the browser once and kept indexed by domain, path and
+name until something may have changed them - a response, a navigation, or
+cookies added or cleared through the jar. Cookies written by the page scripts
+do not emit any event, the lookups can force the refresh for them.
+"""
+
+import time
+from typing import Any, Callable, Optional
+
+from playwright.sync_api import BrowserContext, Frame, Page
+
+
+def _domain_key(domain: str) -> str:
+    # ".example.com" and "example.com" are looked up the same way
+    return domain.lstrip(".").lower()
+
+
+class PlaywbotCookieJar:
+    def __init__(self, context: BrowserContext):
+        """Watches the `context` for the events, which may change its cookies.
+
+        Args:
+            context (BrowserContext): context of the cookies
+        """
+        self._context: BrowserContext = context
+        self._fresh: bool = False
+        self._by_key: dict[tuple[str, str, str], dict[str, Any]] = {}
+        self._by_name: dict[str, list[dict[str, Any]]] = {}
+        self._by_domain: dict[str, list[dict[str, Any]]] = {}
+        self.stats: dict[str, int] = {"lookups": 0, "reads": 0}
+
+        self._listeners: list[tuple[Any, str, Callable]] = [
+            (context, "response", self.invalidate),
+            (context, "page", self._watch_page),
+        ]
+        for page in context.pages:
+            self._listeners.append((page, "framenavigated", self._on_navigated))
+        for target, event, handler in self._listeners:
+            target.on(event, handler)
+
+    def _watch_page(self, page: Page):
+        self._listeners.append((page, "framenavigated", self._on_navigated))
+        page.on("framenavigated", self._on_navigated)
+
+    def _on_navigated(self, frame: Frame):  # pylint: disable=unused-argument
+        self.invalidate()
+
+    def invalidate(self, *_):
+        self._fresh = False
+
+    def detach(self):
+        """Stops watching the context, e.g. when it is closed or returned to the pool."""
+        for target, event, handler in self._listeners:
+            try:
+                target.remove_listener(event, handler)
+            except Exception:  # pylint: disable=broad-except
+                # page is already closed
+                pass
+        self._listeners = []
+        self._fresh = False
+
+    def _index(self, cookies: list[dict[str, Any]]):
+        self._by_key = {}
+        self._by_name = {}
+        self._by_domain = {}
+        for cookie in cookies:
+            domain: str = _domain_key(cookie["domain"])
+            self._by_key[(domain, cookie["path"], cookie["name"])] = cookie
+            self._by_name.setdefault(cookie["name"], []).append(cookie)
+            self._by_domain.setdefault(domain, []).append(cookie)
+        self._fresh = True
+
+    def _cookies(self, refresh: bool = False) -> list[dict[str, Any]]:
+        self.stats["lookups"] += 1
+        if refresh or not self._fresh:
+            self.stats["reads"] += 1
+            self._index(self._context.cookies())
+        return list(self._by_key.values())
+
+    def find(
+        self,
+        name: Optional[str] = None,
+        domain: Optional[str] = None,
+        path: Optional[str] = None,
+        refresh: bool = False,
+    ) -> list[dict[str, Any]]:
+        """Returns not expired cookies matching all given filters.
+
+        Args:
+            name (Optional[str], optional): name of the cookie. Defaults to None.
+            domain (Optional[str], optional): domain of the cookie, with or without leading dot. Defaults to None.
+            path (Optional[str], optional): path of the cookie. Defaults to None.
+            refresh (bool, optional): whether to read the cookies from the browser, even if there was
+            no event changing them. Defaults to False.
+
+        Returns:
+            list[dict[str, Any]]: matching cookies
+        """
+        cookies: list[dict[str, Any]] = self._cookies(refresh)
+        if name is not None and domain is not None and path is not None:
+            cookie: Optional[dict[str, Any]] = self._by_key.get(
+                (_domain_key(domain), path, name)
+            )
+            cookies = [cookie] if cookie is not None else []
+        elif name is not None:
+            cookies = self._by_name.get(name, [])
+        elif domain is not None:
+            cookies = self._by_domain.get(_domain_key(domain), [])
+
+        now: float = time.time()
+        return [
+            cookie
+            for cookie in cookies
+            if (domain is None or _domain_key(cookie["domain"]) == _domain_key(domain))
+            and (path is None or cookie["path"] == path)
+            and (name is None or cookie["name"] == name)
+            # session cookies have expires -1
+            and not 0 <= cookie.get("expires", -1) < now
+        ]
+
+    def add(self, cookies: list[dict[str, Any]]):
+        self._context.add_cookies(cookies)
+        self.invalidate()
+
+    def clear(self, **kwargs):
+        """Clears cookies of the context. Optional `name`, `domain` and `path` filters
+        clear only the matching cookies.
+        """
+        self._context.clear_cookies(**kwargs)
+        if kwargs:
+            self.invalidate()
+        else:
+            self._index([])
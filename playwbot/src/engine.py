@@ -0,0 +1,283 @@
+"""Implements asyncio backend of the library.
+
+Objects of `playwright.async_api` live in the event loop running in the dedicated
+thread. They are handed to the rest of the library wrapped in proxies, which expose
+the same blocking methods as the objects of `playwright.sync_api` and which also
+pass `isinstance()` checks against `playwright.sync_api` classes. That way
+`PlaywbotBrowser`, `PlaywbotContext`, `PlaywbotPage` and `Handle` work with either backend.
+
+Unlike the sync backend, several operations can be submitted at once by `submit()`
+method of the proxied methods and awaited together by `PlaywbotAsyncEngine.wait()`.
+"""
+
+import asyncio
+import inspect
+import threading
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Optional
+
+import playwright.sync_api
+from playwright._impl._async_base import (  # pylint: disable=import-private-name
+    AsyncBase,
+    AsyncEventContextManager,
+    AsyncEventInfo,
+)
+
+# methods, which register callbacks invoked later by the event loop
+_CALLBACK_METHODS = frozenset(
+    ("on", "once", "add_listener", "remove_listener", "route", "unroute")
+)
+_REMOVING_METHODS = frozenset(("remove_listener", "unroute"))
+_ROUTE_METHODS = frozenset(("route", "unroute"))
+
+# attribute of the callback keeping its handlers by engine, like playwright keeps its wrappers
+_HANDLER_ATTR = "__playwbot_handlers"
+
+
+class PlaywbotAsyncEngine:
+    def __init__(self, callback_workers: int = 64):
+        self._loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+        self._thread: threading.Thread = threading.Thread(
+            target=self._loop.run_forever, name="playwbot-engine", daemon=True
+        )
+        self._thread.start()
+        # threads are started only when all others are busy, so route handlers of the page
+        # loading many requests at once, e.g. of the asset cache, do not wait for each other
+        self._callbacks: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=callback_workers, thread_name_prefix="playwbot-callback"
+        )
+        # event listeners run one by one in the order of the events, like with the sync api
+        self._events: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="playwbot-event"
+        )
+        self._proxies: "weakref.WeakValueDictionary[int, AsyncProxy]" = (
+            weakref.WeakValueDictionary()
+        )
+        # handlers of the callbacks, which cannot keep them in their attributes, by the callback
+        # and whether it handles routes, along with the number of their registrations
+        self._handlers: dict[tuple[Callable, bool], list[Any]] = {}
+
+    def submit(self, function: Callable, *args, **kwargs) -> "Future[Any]":
+        """Calls `function` in the event loop thread and returns future of its result.
+        If the `function` returns awaitable, the future resolves with the awaited result.
+        """
+
+        async def call():
+            result = function(*args, **kwargs)
+            if inspect.isawaitable(result):
+                result = await result
+            return self.wrap(result)
+
+        return asyncio.run_coroutine_threadsafe(call(), self._loop)
+
+    def run(self, function: Callable, *args, **kwargs) -> Any:
+        """Same as `submit()`, but blocks until the result is available."""
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("Blocking call cannot be made from the event loop.")
+        return self.submit(function, *args, **kwargs).result()
+
+    @staticmethod
+    def wait(futures: Iterable["Future[Any]"]) -> list[Any]:
+        """Waits for all submitted operations and returns their results in the same order.
+        Exceptions are returned in place of the results of failed operations.
+        """
+        results: list[Any] = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as error:  # pylint: disable=broad-except
+                results.append(error)
+        return results
+
+    def start_playwright(self) -> "AsyncProxy":
+        # heavy module, imported only once the async backend is really used
+        from playwright.async_api import (  # pylint: disable=import-outside-toplevel
+            async_playwright,
+        )
+
+        return self.run(lambda: async_playwright().start())
+
+    def wrap(self, value: Any) -> Any:
+        """Wraps objects of `playwright.async_api` in proxies."""
+        if isinstance(value, (AsyncBase, AsyncEventContextManager, AsyncEventInfo)):
+            proxy: Optional[AsyncProxy] = self._proxies.get(id(value))
+            if proxy is None:
+                proxy = AsyncProxy(self, value)
+                self._proxies[id(value)] = proxy
+            return proxy
+        if isinstance(value, list):
+            return [self.wrap(item) for item in value]
+        if isinstance(value, tuple):
+            return tuple(self.wrap(item) for item in value)
+        return value
+
+    def unwrap(self, value: Any, callback: bool = False, route: bool = False) -> Any:
+        """Reverse of `wrap()`. Callables are converted, so they get proxies as arguments.
+
+        Callbacks registered for later invocation by the event loop run in the worker
+        thread, so they are free to call blocking methods of the proxies. Event listeners
+        run one by one in the order of the events, `route` handlers concurrently.
+        """
+        if isinstance(value, AsyncProxy):
+            return object.__getattribute__(value, "_target")
+        if isinstance(value, list):
+            return [self.unwrap(item, callback, route) for item in value]
+        if isinstance(value, tuple):
+            return tuple(self.unwrap(item, callback, route) for item in value)
+        if isinstance(value, dict):
+            return {
+                key: self.unwrap(item, callback, route) for key, item in value.items()
+            }
+        if callable(value) and not isinstance(value, type):
+            if callback:
+                return self._callback_handler(value, route)
+            return lambda *args: value(*[self.wrap(arg) for arg in args])
+        return value
+
+    def _callback_handler(self, callback: Callable, route: bool) -> Callable:
+        """Returns the same handler for the same `callback`, so it can be removed again.
+        The handler lives in the attribute of the callback, or of its object, as long as
+        the callback itself.
+        """
+        owner, name = (
+            (callback.__self__, _HANDLER_ATTR + callback.__name__)
+            if inspect.ismethod(callback)
+            else (callback, _HANDLER_ATTR)
+        )
+        handlers: Optional[dict[tuple[PlaywbotAsyncEngine, bool], Callable]] = getattr(
+            owner, name, None
+        )
+        if handlers is None:
+            try:
+                setattr(owner, name, {})
+                handlers = getattr(owner, name)
+            except (AttributeError, TypeError):
+                # e.g. builtin functions, or objects with slots
+                if (callback, route) not in self._handlers:
+                    self._handlers[(callback, route)] = [
+                        self._new_handler(callback, route),
+                        0,
+                    ]
+                return self._handlers[(callback, route)][0]
+        if (self, route) not in handlers:
+            handlers[(self, route)] = self._new_handler(callback, route)
+        return handlers[(self, route)]
+
+    def _new_handler(self, callback: Callable, route: bool) -> Callable:
+        if route:
+
+            async def route_handler(*args):
+                return await self._loop.run_in_executor(
+                    self._callbacks, lambda: callback(*[self.wrap(a) for a in args])
+                )
+
+            return route_handler
+
+        def handler(*args):
+            # queued right when the event is emitted, so the listeners keep its order
+            wrapped: list[Any] = [self.wrap(arg) for arg in args]
+            self._events.submit(callback, *wrapped)
+
+        return handler
+
+    def count_callbacks(self, method: str, values: Iterable[Any]):
+        """Counts registrations of the callbacks kept by the engine, so they are forgotten,
+        once they are removed by `remove_listener()`, or `unroute()`, as often as registered.
+        """
+        for value in values:
+            key: tuple[Any, bool] = (value, method in _ROUTE_METHODS)
+            entry: Optional[list[Any]] = (
+                self._handlers.get(key) if callable(value) else None
+            )
+            if entry is None:
+                continue
+            entry[1] += -1 if method in _REMOVING_METHODS else 1
+            if entry[1] <= 0:
+                del self._handlers[key]
+
+    def stop(self):
+        self._callbacks.shutdown(wait=False)
+        self._events.shutdown(wait=False)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+class AsyncMethod:
+    __slots__ = ("_engine", "_name", "_method")
+
+    def __init__(self, engine: PlaywbotAsyncEngine, name: str, method: Callable):
+        self._engine: PlaywbotAsyncEngine = engine
+        self._name: str = name
+        self._method: Callable = method
+
+    def _unwrap(self, args: tuple, kwargs: dict[str, Any]) -> tuple[tuple, dict]:
+        callback: bool = self._name in _CALLBACK_METHODS
+        route: bool = self._name in _ROUTE_METHODS
+        unwrapped: tuple[tuple, dict] = (
+            self._engine.unwrap(args, callback, route),
+            self._engine.unwrap(kwargs, callback, route),
+        )
+        if callback:
+            self._engine.count_callbacks(self._name, [*args, *kwargs.values()])
+        return unwrapped
+
+    def __call__(self, *args, **kwargs) -> Any:
+        args, kwargs = self._unwrap(args, kwargs)
+        return self._engine.run(self._method, *args, **kwargs)
+
+    def submit(self, *args, **kwargs) -> "Future[Any]":
+        """Starts the operation and returns its future without waiting for the result."""
+        args, kwargs = self._unwrap(args, kwargs)
+        return self._engine.submit(self._method, *args, **kwargs)
+
+
+class AsyncProxy:
+    __slots__ = ("_engine", "_target", "__weakref__")
+
+    def __init__(self, engine: PlaywbotAsyncEngine, target: Any):
+        object.__setattr__(self, "_engine", engine)
+        object.__setattr__(self, "_target", target)
+
+    @property
+    def __class__(self):
+        # lets `isinstance()` checks against `playwright.sync_api` classes pass
+        target: Any = object.__getattribute__(self, "_target")
+        return getattr(playwright.sync_api, type(target).__name__, AsyncProxy)
+
+    def __getattr__(self, name: str) -> Any:
+        engine: PlaywbotAsyncEngine = object.__getattribute__(self, "_engine")
+        value: Any = getattr(object.__getattribute__(self, "_target"), name)
+        if inspect.ismethod(value):
+            return AsyncMethod(engine, name, value)
+        if inspect.isawaitable(value):
+            # async properties, e.g. `value` of the objects returned by `expect_*` methods
+            return engine.run(lambda: value)
+        return engine.wrap(value)
+
+    def __setattr__(self, name: str, value: Any):
+        setattr(object.__getattribute__(self, "_target"), name, value)
+
+    def __enter__(self) -> Any:
+        engine: PlaywbotAsyncEngine = object.__getattribute__(self, "_engine")
+        return engine.run(object.__getattribute__(self, "_target").__aenter__)
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        engine: PlaywbotAsyncEngine = object.__getattribute__(self, "_engine")
+        engine.run(
+            object.__getattribute__(self, "_target").__aexit__,
+            exc_type,
+            exc_val,
+            exc_tb,
+        )
+
+    def __repr__(self) -> str:
+        return repr(object.__getattribute__(self, "_target"))
+
+
+def get_engine(obj: Any) -> Optional[PlaywbotAsyncEngine]:
+    """Returns the engine of the proxied object, or `None` for objects of the sync backend."""
+    if isinstance(obj, AsyncProxy):
+        return object.__getattribute__(obj, "_engine")
+    return None
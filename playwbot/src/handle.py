@@ -1,12 +1,30 @@
 """Implements methods shared by Page, or Frame and ElementHandle classes.
 """
 
+import time
 from pathlib import Path
-from typing import Any, Literal, Union
+from typing import Any, Iterator, Literal, Optional, Union
 
-from playwright.sync_api import ElementHandle, FilePayload, Frame, Page
+from playwright.sync_api import ElementHandle, FilePayload, Frame, JSHandle, Page
+from playwright.sync_api import Error as PlaywrightError
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 
+from playwbot.src.metrics import instrumented
+from playwbot.src.scripts import (
+    ELEMENT_STATES_FUNCTION,
+    FILL_FORM_FUNCTION,
+    SNAPSHOT_FUNCTION,
+)
 
+ElementState = Literal[
+    "attached", "visible", "hidden", "enabled", "disabled", "editable", "checked"
+]
+
+# playwright's default timeout of the waits in milliseconds
+_DEFAULT_TIMEOUT = 30000
+
+
+@instrumented
 class Handle:
     def __init__(self, handle: Union[Page, ElementHandle, Frame]) -> None:
         self.handle: Union[Page, ElementHandle, Frame] = handle
@@ -117,12 +135,226 @@ class Handle:
             and if some kwargs are not provided by mistake."
         )
 
+    def element_states(
+        self,
+        selectors: list[str],
+        states: list[ElementState],
+        wait: bool = False,
+        timeout: Optional[float] = None,
+    ) -> dict[str, dict[str, bool]]:
+        """Checks `states` of the elements matching the `selectors` in the single evaluation
+        in the page, instead of one round trip per selector and state.
+
+        Css and xpath selectors are resolved in the page. Selectors of other playwright selector
+        engines, e.g. `text=`, chained selectors and selectors of elements not found in the page,
+        e.g. those in the shadow DOM, are checked by playwright one by one.
+
+        Args:
+            selectors (list[str]): selectors of the elements
+            states (list[ElementState]): states to check
+            wait (bool, optional): waits until all elements are in all states. Defaults to False.
+            timeout (Optional[float], optional): max time to wait in milliseconds. Defaults to None,
+            i.e. the default timeout of the page, the elements checked one by one wait 30 s at most.
+
+        Returns:
+            dict[str, dict[str, bool]]: states of the elements by selector
+        """
+        if not isinstance(self.handle, (Page, Frame)):
+            raise TypeError(f"{self.handle.__repr__()} is not of supported type.")
+
+        arg: dict[str, list[str]] = {"selectors": selectors, "states": states}
+        deadline: float = (
+            time.monotonic()
+            + (timeout if timeout is not None else _DEFAULT_TIMEOUT) / 1000
+        )
+        if wait:
+            waited: JSHandle = self.handle.wait_for_function(
+                f"""arg => {{
+                    const checked = ({ELEMENT_STATES_FUNCTION})(arg);
+                    return checked.all ? checked : false;
+                }}""",
+                arg=arg,
+                timeout=timeout,
+            )
+            try:
+                checked: dict[str, Any] = waited.json_value()
+            finally:
+                waited.dispose()
+        else:
+            checked = self.handle.evaluate(ELEMENT_STATES_FUNCTION, arg)
+
+        result: dict[str, dict[str, bool]] = checked["result"]
+        for selector in checked["unresolved"]:
+            result[selector] = self._element_states_one_by_one(selector, states)
+            while wait and not all(result[selector].values()):
+                if time.monotonic() > deadline:
+                    raise PlaywrightTimeoutError(
+                        f"Timeout {timeout if timeout is not None else _DEFAULT_TIMEOUT}ms "
+                        f"exceeded waiting for {selector} to be {states}."
+                    )
+                self.handle.wait_for_timeout(100)
+                result[selector] = self._element_states_one_by_one(selector, states)
+
+        return {selector: result[selector] for selector in selectors}
+
+    def _element_states_one_by_one(
+        self, selector: str, states: list[ElementState]
+    ) -> dict[str, bool]:
+        element: Optional[ElementHandle] = self.handle.query_selector(selector)
+        if element is None:
+            return {state: state == "hidden" for state in states}
+        try:
+            return {state: self._element_state(element, state) for state in states}
+        finally:
+            element.dispose()
+
+    @staticmethod
+    def _element_state(element: ElementHandle, state: ElementState) -> bool:
+        if state == "attached":
+            return True
+        try:
+            return getattr(element, f"is_{state}")()
+        except PlaywrightError:
+            # e.g. `checked` of the element, which is not a checkbox, false like in the page
+            return False
+
+    def fill_form(
+        self, fields: dict[str, Any], fast: bool = False, **kwargs
+    ) -> dict[str, str]:
+        """Fills the form fields given as `fields` mapping of selector to value.
+
+        Kind of each field is found out by single evaluation in the page first. Text fields
+        are filled, select fields get the option(s) selected by value or label, checkboxes
+        and radios are checked or unchecked by truthiness of the value and file inputs get
+        the file(s) set.
+
+        In `fast` mode, the same evaluation also writes the values and dispatches `input`
+        and `change` events, so the whole form is filled by one round trip. Otherwise, each
+        field is filled by playwright with its actionability checks.
+
+        Args:
+            fields (dict[str, Any]): values by selector
+            fast (bool, optional): fills the fields in the page directly. Defaults to False.
+            kwargs: options of the playwright calls filling the fields one by one, e.g. `timeout`
+
+        Returns:
+            dict[str, str]: errors by selector of the fields, which could not be filled
+        """
+        if not isinstance(self.handle, (Page, Frame)):
+            raise TypeError(f"{self.handle.__repr__()} is not of supported type.")
+
+        planned: dict[str, dict[str, Any]] = self.handle.evaluate(
+            FILL_FORM_FUNCTION, {"fields": fields, "apply": fast}
+        )
+        errors: dict[str, str] = {}
+        for selector, value in fields.items():
+            plan: dict[str, Any] = planned[selector]
+            if plan.get("done"):
+                if plan["error"] is not None:
+                    errors[selector] = plan["error"]
+                continue
+            if fast and plan["kind"] == "missing":
+                errors[selector] = "element not found"
+                continue
+            try:
+                self._fill_field(selector, plan["kind"], value, **kwargs)
+            except Exception as error:  # pylint: disable=broad-except
+                errors[selector] = str(error).splitlines()[0]
+        return errors
+
+    def _fill_field(self, selector: str, kind: str, value: Any, **kwargs):
+        if kind in ("missing", "unresolved"):
+            # guess by the value, playwright waits for the element
+            if isinstance(value, bool):
+                kind = "checkbox"
+            elif isinstance(value, (list, Path)):
+                kind = "file"
+            else:
+                kind = "text"
+
+        if kind == "checkbox":
+            checked: bool = (
+                value is True
+                if isinstance(value, bool)
+                else str(value).lower() == "true"
+            )
+            if checked:
+                self.handle.check(selector, **kwargs)
+            else:
+                self.handle.uncheck(selector, **kwargs)
+        elif kind == "select":
+            self.handle.select_option(selector, value, **kwargs)
+        elif kind == "file":
+            self.handle.set_input_files(selector, value, **kwargs)
+        elif kind == "text":
+            self.handle.fill(selector, str(value), **kwargs)
+        else:
+            raise TypeError("element cannot be filled")
+
     def query_selector(self, selector: str):
         return self.handle.query_selector(selector)
 
     def query_selector_all(self, selector: str):
         return self.handle.query_selector_all(selector)
 
+    def query_selector_all_data(
+        self,
+        selector: str,
+        attributes: Optional[list[str]] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> tuple[list[dict[str, Any]], int]:
+        """Returns plain data of the elements matching the `selector`, read by single evaluation
+        in the page, instead of element handles.
+
+        Each record has `text`, `attributes` (values of the requested `attributes`),
+        `box` (bounding box) and `visible` keys.
+
+        Args:
+            selector (str): selector of the elements
+            attributes (Optional[list[str]], optional): names of the attributes to read. Defaults to None.
+            limit (Optional[int], optional): max number of records. Defaults to None.
+            offset (int, optional): number of matching elements to skip. Defaults to 0.
+
+        Returns:
+            tuple[list[dict[str, Any]], int]: records and total number of matching elements
+        """
+        snapshot: dict[str, Any] = self.handle.eval_on_selector_all(
+            selector,
+            SNAPSHOT_FUNCTION,
+            {"attributes": attributes or [], "offset": offset, "limit": limit},
+        )
+        return (snapshot["records"], snapshot["total"])
+
+    def iter_query_selector_all_data(
+        self,
+        selector: str,
+        attributes: Optional[list[str]] = None,
+        page_size: int = 500,
+    ) -> Iterator[dict[str, Any]]:
+        """Same as `query_selector_all_data()`, but reads the records lazily by `page_size`
+        records per evaluation, so huge result sets are not transferred at once.
+
+        Raises:
+            ValueError: if `page_size` is less than 1
+        """
+        if page_size < 1:
+            raise ValueError("Page size must be at least 1.")
+        return self._iter_records(selector, attributes, page_size)
+
+    def _iter_records(
+        self, selector: str, attributes: Optional[list[str]], page_size: int
+    ) -> Iterator[dict[str, Any]]:
+        offset: int = 0
+        while True:
+            records, total = self.query_selector_all_data(
+                selector, attributes, limit=page_size, offset=offset
+            )
+            yield from records
+            offset += page_size
+            if offset >= total:
+                return
+
     def set_input_files(
         self,
         selector: Union[str, None],
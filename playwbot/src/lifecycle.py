@@ -0,0 +1,127 @@
+"""Implements tracking of element handles returned by the library.
+
+Every element handle pins its element in the browser until it is disposed.
+Handles returned by keywords are registered by the page they belong to and
+disposed when the test they were created in ends. Handles of the page are
+disposed also when its main frame navigates. Playwright reports same-document
+navigations of single page apps too, so the handles may still pin live elements.
+"""
+
+from typing import Any, Optional
+
+from playwright.sync_api import ElementHandle, Frame, Page
+
+
+class PlaywbotHandleRegistry:
+    """Library listener, which disposes element handles created during the test,
+    when the test ends.
+    """
+
+    ROBOT_LISTENER_API_VERSION = 2
+
+    def __init__(self):
+        # handles by id of their page, `None` for handles of unknown page
+        self._handles: dict[Optional[int], dict[int, ElementHandle]] = {}
+        self._pages: dict[int, Page] = {}
+        self._page_of: dict[int, Optional[int]] = {}
+        self._test_handles: list[ElementHandle] = []
+        self._in_test: bool = False
+
+    def _page_key(self, owner: Any) -> Optional[int]:
+        if isinstance(owner, ElementHandle):
+            return self._page_of.get(id(owner))
+        page: Optional[Page] = owner.page if isinstance(owner, Frame) else owner
+        if not isinstance(page, Page):
+            return None
+
+        key: int = id(page)
+        if key not in self._pages:
+            self._pages[key] = page
+            page.on("framenavigated", self._navigation_handler(page))
+            page.on("close", lambda *_: self.forget(key))
+        return key
+
+    def _navigation_handler(self, page: Page):
+        def handler(frame: Frame):
+            if frame == page.main_frame:
+                self.dispose(list(self._handles.get(id(page), {}).values()))
+
+        return handler
+
+    def register(self, owner: Any, value: Any) -> Any:
+        """Registers element handle(s) in `value` returned by the call on `owner` - page,
+        frame or element handle - and returns the `value`.
+        """
+        handles: list[Any] = value if isinstance(value, list) else [value]
+        if not any(isinstance(handle, ElementHandle) for handle in handles):
+            return value
+
+        key: Optional[int] = self._page_key(owner)
+        registered: dict[int, ElementHandle] = self._handles.setdefault(key, {})
+        for handle in handles:
+            if isinstance(handle, ElementHandle):
+                registered[id(handle)] = handle
+                self._page_of[id(handle)] = key
+                if self._in_test:
+                    self._test_handles.append(handle)
+        return value
+
+    def forget(self, page_key: int):
+        """Forgets handles of the closed page."""
+        for handle_key in self._handles.pop(page_key, {}):
+            self._page_of.pop(handle_key, None)
+        self._pages.pop(page_key, None)
+
+    def live(self) -> dict[str, int]:
+        """Returns number of registered handles by url of their page."""
+        counts: dict[str, int] = {}
+        for key, handles in self._handles.items():
+            if not handles:
+                continue
+            page: Optional[Page] = self._pages.get(key) if key is not None else None
+            url: str = page.url if page is not None else "unknown page"
+            counts[url] = counts.get(url, 0) + len(handles)
+        return counts
+
+    def dispose(self, handles: Optional[list[ElementHandle]] = None) -> int:
+        """Disposes given `handles`, or all registered handles. Returns number of handles,
+        which were still registered.
+        """
+        if handles is None:
+            handles = [
+                handle for group in self._handles.values() for handle in group.values()
+            ]
+
+        disposed: int = 0
+        for handle in handles:
+            key: Optional[int] = self._page_of.pop(id(handle), None)
+            registered: dict[int, ElementHandle] = self._handles.get(key, {})
+            if registered.pop(id(handle), None) is None:
+                continue
+            disposed += 1
+            try:
+                handle.dispose()
+            except Exception:  # pylint: disable=broad-except
+                # page, or the whole context, is already closed
+                pass
+        return disposed
+
+    def start_test(
+        self, name: str, attributes: dict[str, Any]
+    ):  # pylint: disable=unused-argument
+        self._in_test = True
+        self._test_handles = []
+
+    def end_test(
+        self, name: str, attributes: dict[str, Any]
+    ):  # pylint: disable=unused-argument
+        self._in_test = False
+        self.dispose(self._test_handles)
+        self._test_handles = []
+
+    def clear(self):
+        """Forgets everything, e.g. when the browser is closed."""
+        self._handles = {}
+        self._pages = {}
+        self._page_of = {}
+        self._test_handles = []
@@ -0,0 +1,200 @@
+"""Implements latency metrics of the library keywords and of the playwright calls.
+
+Durations are collected into histograms with logarithmic buckets, so memory
+does not grow with the number of samples and percentiles are accurate within
+the bucket width. Collecting is off by default and instrumented methods then
+cost a single attribute lookup.
+"""
+
+import functools
+import inspect
+import json
+import math
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+# relative width of the histogram bucket, i.e. max error of the percentiles
+_BUCKET_GROWTH = 1.05
+_LOG_GROWTH = math.log(_BUCKET_GROWTH)
+
+
+class PlaywbotHistogram:
+    """Histogram of durations in seconds, used by the metrics and by the adaptive timeouts."""
+
+    __slots__ = ("count", "total", "max", "buckets")
+
+    def __init__(self):
+        self.count: int = 0
+        self.total: float = 0.0
+        self.max: float = 0.0
+        self.buckets: dict[int, int] = {}
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        # buckets of microseconds, so sub-millisecond calls are told apart too
+        bucket: int = math.ceil(math.log(max(seconds * 1e6, 1.0)) / _LOG_GROWTH)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def merge(self, other: "PlaywbotHistogram"):
+        """Adds samples of the `other` histogram."""
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        for bucket, count in other.buckets.items():
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+
+    def percentile(self, quantile: float) -> float:
+        rank: float = quantile * self.count
+        seen: int = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(_BUCKET_GROWTH**bucket / 1e6, self.max)
+        return self.max
+
+    def summary(self) -> dict[str, Union[int, float]]:
+        """Returns count, mean, percentiles and max in milliseconds."""
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count * 1000, 3),
+            "p50": round(self.percentile(0.50) * 1000, 3),
+            "p95": round(self.percentile(0.95) * 1000, 3),
+            "p99": round(self.percentile(0.99) * 1000, 3),
+            "max": round(self.max * 1000, 3),
+        }
+
+
+class PlaywbotMetrics:
+    def __init__(self):
+        """Histograms of durations grouped by keyword, by playwright call and by selector."""
+        self.enabled: bool = False
+        self.report_path: Optional[Path] = None
+        # callbacks of the async backend may call instrumented methods from several threads
+        self._lock: threading.Lock = threading.Lock()
+        self._groups: dict[str, dict[str, PlaywbotHistogram]] = {
+            "keywords": {},
+            "calls": {},
+            "selectors": {},
+        }
+
+    def enable(self, report_path: Optional[Union[str, Path]] = None):
+        self.enabled = True
+        if report_path is not None:
+            self.report_path = Path(report_path)
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            for group in self._groups.values():
+                group.clear()
+
+    def record(self, group: str, name: str, seconds: float):
+        with self._lock:
+            histogram: Optional[PlaywbotHistogram] = self._groups[group].get(name)
+            if histogram is None:
+                histogram = self._groups[group][name] = PlaywbotHistogram()
+            histogram.add(seconds)
+
+    def summary(self) -> dict[str, dict[str, dict[str, Union[int, float]]]]:
+        with self._lock:
+            return {
+                group: {name: histograms[name].summary() for name in sorted(histograms)}
+                for group, histograms in self._groups.items()
+            }
+
+    def write_report(self, path: Optional[Union[str, Path]] = None) -> Optional[Path]:
+        """Writes the summary to the json file. Returns its path, or `None`,
+        if there is no path to write to.
+        """
+        report_path: Optional[Path] = Path(path) if path else self.report_path
+        if report_path is None:
+            return None
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        report_path.write_text(json.dumps(self.summary(), indent=2), encoding="utf-8")
+        return report_path
+
+
+# collected by the whole process, so the report covers all suites run by it
+METRICS = PlaywbotMetrics()
+
+
+def _timed(name: str, function: Callable) -> Callable:
+    parameters: list[str] = list(inspect.signature(function).parameters)
+    selector_index: Optional[int] = (
+        parameters.index("selector") if "selector" in parameters else None
+    )
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if not METRICS.enabled:
+            return function(*args, **kwargs)
+
+        start: float = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            elapsed: float = time.perf_counter() - start
+            METRICS.record("calls", name, elapsed)
+            selector: Any = kwargs.get("selector")
+            if (
+                selector is None
+                and selector_index is not None
+                and len(args) > selector_index
+            ):
+                selector = args[selector_index]
+            if isinstance(selector, str):
+                METRICS.record("selectors", selector, elapsed)
+
+    return wrapper
+
+
+def instrumented(cls: type) -> type:
+    """Class decorator, which times all public methods of the class, including
+    static and class methods, while the metrics are enabled.
+    """
+    for name, attribute in list(vars(cls).items()):
+        if name.startswith("_"):
+            continue
+        qualified_name: str = f"{cls.__name__}.{name}"
+        if isinstance(attribute, staticmethod):
+            setattr(cls, name, staticmethod(_timed(qualified_name, attribute.__func__)))
+        elif isinstance(attribute, classmethod):
+            setattr(cls, name, classmethod(_timed(qualified_name, attribute.__func__)))
+        elif inspect.isfunction(attribute):
+            setattr(cls, name, _timed(qualified_name, attribute))
+    return cls
+
+
+class PlaywbotMetricsListener:
+    """Library listener, which times keywords of the library and writes
+    the report at the end of each suite.
+    """
+
+    ROBOT_LISTENER_API_VERSION = 2
+
+    def __init__(self, library_name: str):
+        self._library_name: str = library_name
+
+    def end_keyword(
+        self, name: str, attributes: dict[str, Any]
+    ):  # pylint: disable=unused-argument
+        # library imported as module has its module path in the name
+        if (
+            METRICS.enabled
+            and attributes.get("libname", "").rsplit(".", 1)[-1] == self._library_name
+        ):
+            METRICS.record(
+                "keywords", attributes["kwname"], attributes["elapsedtime"] / 1000
+            )
+
+    def end_suite(
+        self, name: str, attributes: dict[str, Any]
+    ):  # pylint: disable=unused-argument
+        if METRICS.enabled:
+            METRICS.write_report()
@@ -0,0 +1,349 @@
+"""Implements monitoring of the resources used by the browser.
+
+CPU and memory of the process tree of the browser - playwright driver, or browser
+server, and the browsers they launched - are sampled by the background thread.
+Other processes started by the test run, e.g. the application under test, are
+not counted. Chromium pages are sampled by CDP `Performance.getMetrics` as well,
+each page separately. Playwright objects must not be used from other threads, so
+the pages are sampled at the end of the keywords, at most once per interval.
+Summary of the samples is added to the message of each test.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Literal, Optional
+
+from playwright.sync_api import Browser
+from robot.api import logger
+
+MonitorAction = Literal["warn", "fail"]
+
+_MB = 1024 * 1024
+
+# CDP metric and the name of its series
+_PAGE_METRICS = {
+    "JSHeapUsedSize": "js_heap",
+    "Nodes": "dom_nodes",
+    "JSEventListeners": "listeners",
+}
+
+
+def _psutil() -> Any:
+    try:
+        import psutil  # pylint: disable=import-outside-toplevel
+    except ImportError as error:
+        raise RuntimeError(
+            "Browser resource monitor requires psutil package, "
+            "install it by `pip install playwbot[monitor]`."
+        ) from error
+    return psutil
+
+
+def _process_tree(psutil: Any, pids: list[int]) -> list[Any]:
+    """Returns processes of given `pids` with all their descendants."""
+    processes: list[Any] = []
+    for pid in pids:
+        try:
+            root: Any = psutil.Process(pid)
+            processes += [root, *root.children(recursive=True)]
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    return processes
+
+
+def process_tree_rss(pids: list[int]) -> float:
+    """Returns memory in MB used by the processes of given `pids`, e.g. playwright driver,
+    and all their descendants, i.e. the browsers it launched.
+    """
+    psutil: Any = _psutil()
+    rss: float = 0.0
+    for process in _process_tree(psutil, pids):
+        try:
+            rss += process.memory_info().rss
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    return rss / _MB
+
+
+class _Series:
+    __slots__ = ("peak", "total", "count")
+
+    def __init__(self):
+        self.peak: float = 0.0
+        self.total: float = 0.0
+        self.count: int = 0
+
+    def add(self, value: float):
+        self.peak = max(self.peak, value)
+        self.total += value
+        self.count += 1
+
+    def summary(self) -> dict[str, float]:
+        return {
+            "peak": round(self.peak, 1),
+            "mean": round(self.total / self.count, 1) if self.count else 0.0,
+        }
+
+
+class _PageSampler:
+    """Listener sampling the pages at the end of the keywords, which listeners of
+    the version 3 are not notified about.
+    """
+
+    ROBOT_LISTENER_API_VERSION = 2
+
+    def __init__(self, monitor: "PlaywbotResourceMonitor"):
+        self._monitor: PlaywbotResourceMonitor = monitor
+
+    def end_keyword(
+        self, name: str, attributes: dict[str, Any]
+    ):  # pylint: disable=unused-argument
+        self._monitor.sample_pages()
+
+
+class PlaywbotResourceMonitor:
+    """Library listener, which summarizes resources used by the browser during each test
+    and warns, or fails the test, when they exceed the limits. Its `page_sampler`
+    has to be registered as the library listener too.
+    """
+
+    ROBOT_LISTENER_API_VERSION = 3
+
+    def __init__(self):
+        self._browser: Optional[Callable[[], Any]] = None
+        self._processes_of: Callable[[], list[int]] = list
+        self._chromium: bool = False
+        self._interval: float = 1.0
+        self._max_rss: Optional[float] = None
+        self._max_js_heap: Optional[float] = None
+        self._action: MonitorAction = "warn"
+        self._thread: Optional[threading.Thread] = None
+        self._stopped: threading.Event = threading.Event()
+        self._lock: threading.Lock = threading.Lock()
+        self._processes: dict[int, Any] = {}
+        self._sessions: dict[int, Any] = {}
+        self._last_page_sample: float = 0.0
+        self._series: dict[str, _Series] = {}
+        # series of every page sampled during the test, by id of the page, and its last url
+        self._page_series: dict[int, dict[str, _Series]] = {}
+        self._page_urls: dict[int, str] = {}
+        self.page_sampler: _PageSampler = _PageSampler(self)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(
+        self,
+        browser: Callable[[], Any],
+        processes: Callable[[], list[int]],
+        chromium: bool,
+        interval: float = 1.0,
+        max_rss: Optional[float] = None,
+        max_js_heap: Optional[float] = None,
+        action: MonitorAction = "warn",
+    ):
+        """Starts sampling in the background.
+
+        Args:
+            browser (Callable[[], Any]): returns the browser, or persistent context, if it is launched, else `None`
+            processes (Callable[[], list[int]]): returns ids of the driver and browser server processes
+            chromium (bool): whether the pages can be sampled by CDP
+            interval (float, optional): seconds between the samples. Defaults to 1.0.
+            max_rss (Optional[float], optional): limit of the memory of the process tree in MB. Defaults to None.
+            max_js_heap (Optional[float], optional): limit of the JS heap of all pages together in MB.
+            Defaults to None.
+            action (MonitorAction, optional): "warn" or "fail" the test exceeding the limits. Defaults to "warn".
+        """
+        if action not in ("warn", "fail"):
+            raise ValueError(f"{action} is not supported monitor action.")
+        psutil: Any = _psutil()
+        self.stop()
+
+        self._browser = browser
+        self._processes_of = processes
+        self._chromium = chromium
+        self._interval = float(interval)
+        self._max_rss = max_rss
+        self._max_js_heap = max_js_heap
+        self._action = action
+        self._reset_series()
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(psutil,),
+            name="playwbot-monitor",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stopped.set()
+        self._thread.join()
+        self._thread = None
+        self._processes = {}
+        self._sessions = {}
+
+    def _run(self, psutil: Any):
+        while not self._stopped.wait(self._interval):
+            try:
+                self._sample_processes(psutil)
+            except Exception:  # pylint: disable=broad-except
+                # processes come and go while being sampled
+                continue
+
+    def _sample_processes(self, psutil: Any):
+        children: list[Any] = _process_tree(psutil, self._processes_of())
+        if not children:
+            # browser is not launched yet
+            return
+        processes: dict[int, Any] = {}
+        rss: float = 0.0
+        cpu: float = 0.0
+        for child in children:
+            # kept between the samples, cpu percent is measured since the previous call
+            process: Any = self._processes.get(child.pid, child)
+            try:
+                with process.oneshot():
+                    rss += process.memory_info().rss
+                    cpu += process.cpu_percent(None)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+            processes[child.pid] = process
+        self._processes = processes
+        self._record("rss", rss / _MB)
+        self._record("cpu", cpu)
+
+    def _record(self, name: str, value: float):
+        with self._lock:
+            self._series.setdefault(name, _Series()).add(value)
+
+    def _record_page(self, page: Any, values: dict[str, float]):
+        url: str = page.url
+        with self._lock:
+            series: dict[str, _Series] = self._page_series.setdefault(id(page), {})
+            for name, value in values.items():
+                series.setdefault(name, _Series()).add(value)
+            self._page_urls[id(page)] = url
+
+    def _reset_series(self):
+        with self._lock:
+            self._series = {}
+            self._page_series = {}
+            self._page_urls = {}
+
+    def sample_pages(self):
+        """Samples CDP metrics of each page of the browser, at most once per interval."""
+        if not self.running or not self._chromium or self._browser is None:
+            return
+        now: float = time.monotonic()
+        if now - self._last_page_sample < self._interval:
+            return
+        self._last_page_sample = now
+
+        browser: Any = self._browser()
+        if browser is None:
+            return
+        contexts: list[Any] = (
+            browser.contexts if isinstance(browser, Browser) else [browser]
+        )
+        totals: dict[str, float] = dict.fromkeys(_PAGE_METRICS.values(), 0.0)
+        sessions: dict[int, Any] = {}
+        for context in contexts:
+            for page in context.pages:
+                try:
+                    session: Any = self._sessions.get(id(page))
+                    if session is None:
+                        session = context.new_cdp_session(page)
+                        session.send("Performance.enable")
+                    metrics: list[dict[str, Any]] = session.send(
+                        "Performance.getMetrics"
+                    )["metrics"]
+                except Exception:  # pylint: disable=broad-except
+                    # page was closed meanwhile
+                    continue
+                sessions[id(page)] = session
+                values: dict[str, float] = {
+                    _PAGE_METRICS[metric["name"]]: metric["value"]
+                    for metric in metrics
+                    if metric["name"] in _PAGE_METRICS
+                }
+                if "js_heap" in values:
+                    values["js_heap"] /= _MB
+                self._record_page(page, values)
+                for name, value in values.items():
+                    totals[name] += value
+        for key, session in self._sessions.items():
+            if key not in sessions:
+                try:
+                    session.detach()
+                except Exception:  # pylint: disable=broad-except
+                    pass
+        self._sessions = sessions
+        if sessions:
+            for name, value in totals.items():
+                self._record(name, value)
+
+    def summary(self) -> dict[str, Any]:
+        """Returns peak and mean of each series sampled since the test started - `rss` and `js_heap`
+        in MB, `cpu` in percent, `dom_nodes` and `listeners` counts. JS heap, DOM nodes and listeners
+        are the totals of all pages, the same series of each page are under `pages` key, along with
+        the last `url` of the page.
+        """
+        with self._lock:
+            summary: dict[str, Any] = {
+                name: series.summary() for name, series in self._series.items()
+            }
+            if self._page_series:
+                summary["pages"] = [
+                    {
+                        "url": self._page_urls.get(key, ""),
+                        **{name: item.summary() for name, item in series.items()},
+                    }
+                    for key, series in self._page_series.items()
+                ]
+            return summary
+
+    def _exceeded(self, summary: dict[str, Any]) -> list[str]:
+        exceeded: list[str] = []
+        for name, limit in (("rss", self._max_rss), ("js_heap", self._max_js_heap)):
+            if limit is not None and name in summary and summary[name]["peak"] > limit:
+                exceeded.append(f"{name} peak {summary[name]['peak']} MB > {limit} MB")
+        return exceeded
+
+    def start_test(self, data: Any, result: Any):  # pylint: disable=unused-argument
+        self._reset_series()
+
+    def end_test(self, data: Any, result: Any):  # pylint: disable=unused-argument
+        if not self.running:
+            return
+        summary: dict[str, Any] = self.summary()
+        if not summary:
+            return
+
+        text: str = "Browser resources: " + ", ".join(
+            f"{name} peak {values['peak']} mean {values['mean']}"
+            for name, values in summary.items()
+            if name != "pages"
+        )
+        for page in summary.get("pages", []):
+            text += f"\nPage {page['url']}: " + ", ".join(
+                f"{name} peak {values['peak']}"
+                for name, values in page.items()
+                if name != "url"
+            )
+        exceeded: list[str] = self._exceeded(summary)
+        if exceeded and self._action == "fail" and result.passed:
+            result.status = "FAIL"
+            result.message = "Browser resource limits exceeded: " + ", ".join(exceeded)
+        elif exceeded:
+            logger.warn(
+                f"Test '{result.name}' exceeded browser resource limits: "
+                + ", ".join(exceeded)
+            )
+        result.message = f"{result.message}\n{text}" if result.message else text
+
+    def close(self):
+        self.stop()
@@ -0,0 +1,252 @@
+"""Implements interception of the network traffic of the browser context.
+"""
+
+import base64
+import hashlib
+import json
+import re
+import zipfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Iterable, Literal, Optional, Pattern, Union
+
+from playwright.sync_api import BrowserContext, Route
+
+
+def glob_to_regex(glob: str) -> str:
+    """Translates playwright's url glob pattern to the regular expression.
+
+    `**` matches any characters, `*` matches any characters except `/` and
+    `{a,b}` matches any of the comma separated options.
+    """
+    regex: list[str] = ["^"]
+    in_group: bool = False
+    index: int = 0
+
+    while index < len(glob):
+        char: str = glob[index]
+        if char == "*":
+            if glob[index : index + 2] == "**":
+                regex.append(".*")
+                index += 1
+            else:
+                regex.append("[^/]*")
+        elif char == "{":
+            in_group = True
+            regex.append("(?:")
+        elif char == "}" and in_group:
+            in_group = False
+            regex.append(")")
+        elif char == "," and in_group:
+            regex.append("|")
+        else:
+            regex.append(re.escape(char))
+        index += 1
+
+    regex.append("$")
+    return "".join(regex)
+
+
+def compile_url_matcher(
+    globs: Optional[list[str]] = None, regexes: Optional[list[str]] = None
+) -> Optional[Pattern]:
+    """Compiles url globs and regular expressions into the single regular expression.
+
+    Returns `None`, if there is nothing to match.
+    """
+    alternatives: list[str] = [glob_to_regex(glob) for glob in globs or []]
+    alternatives += list(regexes or [])
+    if not alternatives:
+        return None
+    return re.compile("|".join(f"(?:{alternative})" for alternative in alternatives))
+
+
+class PlaywbotResourceBlocker:
+    def __init__(
+        self,
+        resource_types: Optional[list[str]] = None,
+        urls: Optional[list[str]] = None,
+        url_regexes: Optional[list[str]] = None,
+    ):
+        """Aborts requests of given resource types, or requests to given urls.
+
+        Args:
+            resource_types (Optional[list[str]], optional): resource types to block, e.g. "image", "font", "media".
+            urls (Optional[list[str]], optional): url glob patterns to block.
+            url_regexes (Optional[list[str]], optional): url regular expressions to block.
+        """
+        self._resource_types: frozenset[str] = frozenset(resource_types or ())
+        self._matcher: Optional[Pattern] = compile_url_matcher(urls, url_regexes)
+        self.stats: dict[str, int] = {}
+
+    def install(self, context: BrowserContext):
+        """Installs the blocking as the single route handler of the `context`.
+
+        If only urls are blocked, the route matches only them, so other requests
+        are not intercepted at all.
+        """
+        if self._resource_types:
+            context.route("**/*", self._handle)
+        elif self._matcher is not None:
+            context.route(self._matcher, self._abort)
+
+    def _handle(self, route: Route):
+        if route.request.resource_type in self._resource_types or (
+            self._matcher is not None and self._matcher.search(route.request.url)
+        ):
+            self._abort(route)
+        else:
+            route.fallback()
+
+    def _abort(self, route: Route):
+        resource_type: str = route.request.resource_type
+        self.stats[resource_type] = self.stats.get(resource_type, 0) + 1
+        route.abort("blockedbyclient")
+
+    def reset_stats(self):
+        self.stats = {}
+
+
+def _body_hash(body: Optional[bytes]) -> str:
+    return hashlib.sha1(body or b"").hexdigest()
+
+
+def _merge_headers(headers: Iterable[dict[str, str]]) -> dict[str, str]:
+    """Merges repeated headers of the HAR entry into single header. Values of `Set-Cookie`
+    are separated by new line, which `route.fulfill()` splits to separate headers again,
+    other values by comma.
+    """
+    merged: dict[str, str] = {}
+    names: dict[str, str] = {}
+    for header in headers:
+        lower: str = header["name"].lower()
+        name: str = names.setdefault(lower, header["name"])
+        if name not in merged:
+            merged[name] = header["value"]
+            continue
+        separator: str = "\n" if lower == "set-cookie" else ", "
+        merged[name] = f"{merged[name]}{separator}{header['value']}"
+    return merged
+
+
+@lru_cache(maxsize=8)
+def _load_har(
+    path: str, mtime: float  # pylint: disable=unused-argument
+) -> dict[tuple[str, str, str], list[dict[str, Any]]]:
+    """Parses the HAR file and indexes its entries by method, url and request body hash.
+    Parsed file is cached until it is modified.
+    """
+    har_path: Path = Path(path)
+    archive: Optional[zipfile.ZipFile] = None
+
+    if zipfile.is_zipfile(har_path):
+        archive = zipfile.ZipFile(har_path)  # pylint: disable=consider-using-with
+        har_name: str = next(
+            name for name in archive.namelist() if name.endswith(".har")
+        )
+        har: dict[str, Any] = json.loads(archive.read(har_name))
+    else:
+        har = json.loads(har_path.read_text(encoding="utf-8"))
+
+    index: dict[tuple[str, str, str], list[dict[str, Any]]] = {}
+    for entry in har["log"]["entries"]:
+        request: dict[str, Any] = entry["request"]
+        response: dict[str, Any] = entry["response"]
+        content: dict[str, Any] = response.get("content", {})
+        if response["status"] < 100:
+            # request was not completed, when the HAR was recorded
+            continue
+
+        if "_file" in content:
+            body: bytes = (
+                archive.read(content["_file"])
+                if archive is not None
+                else (har_path.parent / content["_file"]).read_bytes()
+            )
+        elif content.get("encoding") == "base64":
+            body = base64.b64decode(content.get("text", ""))
+        else:
+            body = content.get("text", "").encode("utf-8")
+
+        post_data: Optional[str] = request.get("postData", {}).get("text")
+        key = (
+            request["method"],
+            request["url"],
+            _body_hash(post_data.encode("utf-8") if post_data else None),
+        )
+        index.setdefault(key, []).append(
+            {
+                "status": response["status"],
+                "headers": _merge_headers(
+                    header
+                    for header in response.get("headers", [])
+                    if not header["name"].startswith(":")
+                    and header["name"].lower()
+                    not in ("content-length", "content-encoding")
+                ),
+                "body": body,
+            }
+        )
+
+    if archive is not None:
+        archive.close()
+    return index
+
+
+class PlaywbotHarReplayer:
+    def __init__(
+        self,
+        har_path: Union[str, Path],
+        fallback: Literal["abort", "continue", "fail"] = "abort",
+    ):
+        """Serves the requests from the HAR file.
+
+        Args:
+            har_path (Union[str, Path]): path of the HAR file, or of the zip archive with it.
+            fallback (Literal["abort", "continue", "fail"], optional): what to do with the request,
+            which is not in the HAR file. Request is either aborted, sent to the network, or aborted
+            and recorded as failure. Defaults to "abort".
+        """
+        if fallback not in ("abort", "continue", "fail"):
+            raise ValueError(f"{fallback} is not supported HAR fallback.")
+
+        path: Path = Path(har_path).resolve()
+        self._index = _load_har(str(path), path.stat().st_mtime)
+        self._served: dict[tuple[str, str, str], int] = {}
+        self.fallback: str = fallback
+        self.stats: dict[str, int] = {"hits": 0, "misses": 0}
+        self.misses: list[str] = []
+
+    def install(self, context: BrowserContext):
+        context.route("**/*", self._handle)
+
+    def _handle(self, route: Route):
+        request = route.request
+        key = (request.method, request.url, _body_hash(request.post_data_buffer))
+        responses: Optional[list[dict[str, Any]]] = self._index.get(key)
+
+        if responses:
+            # repeated requests get recorded responses in the recorded order
+            served: int = self._served.get(key, 0)
+            self._served[key] = served + 1
+            response: dict[str, Any] = responses[min(served, len(responses) - 1)]
+            self.stats["hits"] += 1
+            route.fulfill(
+                status=response["status"],
+                headers=response["headers"],
+                body=response["body"],
+            )
+            return
+
+        self.stats["misses"] += 1
+        if self.fallback == "continue":
+            route.fallback()
+            return
+        if self.fallback == "fail":
+            self.misses.append(f"{request.method} {request.url}")
+        route.abort()
+
+    def reset_stats(self):
+        self._served = {}
+        self.stats = {"hits": 0, "misses": 0}
+        self.misses = []
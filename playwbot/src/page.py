@@ -1,22 +1,58 @@
 """Implements Playwright's Page.
 """
 
+import time
 from typing import Any, Callable, Literal, Optional, Pattern, Union
 
+from playwbot.src.engine import get_engine
 from playwbot.src.handle import Handle
+from playwbot.src.metrics import instrumented
+from playwbot.src.network import compile_url_matcher
+from playwbot.src.pool import PlaywbotPagePool
+from playwbot.src.scripts import DOM_IDLE_FUNCTION
 from playwbot.src.utils import give_action_args
-from playwright.sync_api import BrowserContext, Page
+from playwright.sync_api import BrowserContext, Page, Request
 
 
+@instrumented
 class PlaywbotPage(Handle):
-    def __init__(self, browser_context: BrowserContext, **kwargs):
+    def __init__(
+        self,
+        browser_context: BrowserContext,
+        page_pool: Optional[PlaywbotPagePool] = None,
+        **kwargs,
+    ):
         self._browser_context: BrowserContext = browser_context
+        self.page_pool: Optional[PlaywbotPagePool] = page_pool
+        self.listeners: list[tuple[str, Callable]] = []
+        self.routes: list[tuple[Any, Optional[Callable]]] = []
         self.page = self._start_page(**kwargs)
         super().__init__(self.page)
 
     def _start_page(self, **kwargs):
+        if self.page_pool is not None:
+            return self.page_pool.acquire()
         return self._browser_context.new_page(**kwargs)
 
+    def on(self, event: str, handler: Callable):
+        """Registers event listener, which is removed, when the page is returned to the page pool."""
+        self.page.on(event, handler)
+        self.listeners.append((event, handler))
+
+    def route(self, url: Union[str, Pattern, Callable], handler: Callable):
+        """Registers route, which is removed, when the page is returned to the page pool."""
+        self.page.route(url, handler)
+        self.routes.append((url, handler))
+
+    def release_page(self, run_before_unload: Union[bool, None] = None):
+        """Returns the page to the page pool, if it was taken from it, else closes the page."""
+        if self.page_pool is not None and self.page_pool.owns(self.page):
+            self.page_pool.release(self.page, self.listeners, self.routes)
+            self.listeners = []
+            self.routes = []
+            return None
+        return self.close_page(self.page, run_before_unload=run_before_unload)
+
     @staticmethod
     def bring_to_front(page: Page):
         return page.bring_to_front()
@@ -113,6 +149,62 @@ class PlaywbotPage(Handle):
     def go_to(page: Page, url: str, **kwargs):
         return page.goto(url, **kwargs)
 
+    @staticmethod
+    def go_to_all(
+        entries: list[tuple[Page, str, dict[str, Any]]],
+    ) -> list[dict[str, Any]]:
+        """Navigates all pages and waits until each of them reaches requested load state.
+
+        With the async backend, all `goto` calls are submitted to the event loop together,
+        so the whole call takes about as long as the slowest page. The sync backend cannot
+        have more `goto` calls in flight, so it navigates the pages one after another.
+
+        Args:
+            entries (list[tuple[Page, str, dict[str, Any]]]): page, url and `goto` options
+            (`wait_until`, `timeout`, `referer`) for every navigation
+
+        Returns:
+            list[dict[str, Any]]: `response`, `status`, `error` and `elapsed` seconds of each navigation,
+            in the same order as `entries`
+        """
+        started: list[float] = [time.perf_counter()] * len(entries)
+        finished: list[Optional[float]] = [None] * len(entries)
+        results: list[Any] = [None] * len(entries)
+
+        def mark_finished(index: int):
+            def handler(*_):
+                if finished[index] is None:
+                    finished[index] = time.perf_counter()
+
+            return handler
+
+        engine = get_engine(entries[0][0]) if entries else None
+        if engine is not None:
+            futures = []
+            for index, (page, url, options) in enumerate(entries):
+                future = page.goto.submit(url, **options)
+                future.add_done_callback(mark_finished(index))
+                futures.append(future)
+            results = engine.wait(futures)
+        else:
+            for index, (page, url, options) in enumerate(entries):
+                started[index] = time.perf_counter()
+                try:
+                    results[index] = page.goto(url, **options)
+                except Exception as error:  # pylint: disable=broad-except
+                    results[index] = error
+                mark_finished(index)()
+
+        return [
+            {
+                "response": None if isinstance(result, Exception) else result,
+                "status": getattr(result, "status", None),
+                "error": str(result) if isinstance(result, Exception) else None,
+                "elapsed": finished[index] - started[index],
+            }
+            for index, result in enumerate(results)
+        ]
+
     @staticmethod
     def reload(page: Page, **kwargs):
         return page.reload(**kwargs)
@@ -125,6 +217,85 @@ class PlaywbotPage(Handle):
     ):
         return page.wait_for_load_state(state=state, timeout=timeout)
 
+    @staticmethod
+    def wait_for_quiet(
+        page: Page,
+        quiet: float = 300,
+        timeout: float = 30000,
+        ignore_urls: Optional[list[str]] = None,
+    ) -> float:
+        """Waits until there was no request in flight and no DOM mutation for `quiet` milliseconds.
+
+        Requests are tracked by the events of the whole browser context, DOM mutations by
+        the observer installed into the page. Events are dispatched only while the sync api
+        waits for the browser, so the state is polled by short waits of the page.
+
+        Args:
+            page (Page): page to wait for
+            quiet (float, optional): quiet window in milliseconds. Defaults to 300.
+            timeout (float, optional): max wait in milliseconds. Defaults to 30000.
+            ignore_urls (Optional[list[str]], optional): url globs of requests, which do not count,
+            e.g. long polling or analytics. Defaults to None.
+
+        Raises:
+            RuntimeError: if the page does not get quiet within `timeout`
+
+        Returns:
+            float: milliseconds it took until the page got quiet
+        """
+        ignored: Optional[Pattern] = compile_url_matcher(ignore_urls)
+        # counted, not kept by identity, the async backend wraps each event argument anew
+        state: dict[str, Any] = {"in_flight": 0, "last_activity": time.perf_counter()}
+
+        def counted(request: Request) -> bool:
+            return ignored is None or not ignored.match(request.url)
+
+        def on_request(request: Request):
+            if counted(request):
+                state["in_flight"] += 1
+                state["last_activity"] = time.perf_counter()
+
+        def on_request_done(request: Request):
+            if counted(request):
+                # requests started before the wait finish without being counted
+                state["in_flight"] = max(state["in_flight"] - 1, 0)
+                state["last_activity"] = time.perf_counter()
+
+        context: BrowserContext = page.context
+        events: list[tuple[str, Callable]] = [
+            ("request", on_request),
+            ("requestfinished", on_request_done),
+            ("requestfailed", on_request_done),
+        ]
+        for event, handler in events:
+            context.on(event, handler)
+
+        started: float = time.perf_counter()
+        interval: float = max(min(quiet / 5, 50), 10)
+        try:
+            while True:
+                try:
+                    dom_idle: float = page.evaluate(DOM_IDLE_FUNCTION)
+                except Exception:  # pylint: disable=broad-except
+                    # document is being replaced by the navigation
+                    dom_idle = 0
+                now: float = time.perf_counter()
+                network_idle: float = (now - state["last_activity"]) * 1000
+                elapsed: float = (now - started) * 1000
+                if not state["in_flight"] and min(dom_idle, network_idle) >= quiet:
+                    return elapsed
+                if elapsed >= timeout:
+                    raise RuntimeError(
+                        f"Page did not get quiet for {quiet} ms within {timeout} ms: "
+                        f"{state['in_flight']} request(s) in flight, "
+                        f"last network activity {network_idle:.0f} ms ago, "
+                        f"last DOM mutation {dom_idle:.0f} ms ago."
+                    )
+                page.wait_for_timeout(interval)
+        finally:
+            for event, handler in events:
+                context.remove_listener(event, handler)
+
     @staticmethod
     def wait_for_timeout(page: Page, timeout: float):
         page.wait_for_timeout(timeout)
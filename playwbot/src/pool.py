@@ -0,0 +1,369 @@
+"""Implements pools of reusable browser contexts and pages.
+"""
+
+import json
+import time
+from collections import deque
+from typing import Any, Callable, Optional, Union
+from urllib.parse import urlsplit
+
+from playwright.sync_api import Browser, BrowserContext, Frame, Page, Route
+
+_CLEAR_STORAGE_SCRIPT = """() => {
+    try {
+        window.localStorage.clear();
+        window.sessionStorage.clear();
+    } catch (e) {}
+}"""
+
+# clears all storage of the origin, returns false, if some of it could not be cleared
+_CLEAR_ORIGIN_SCRIPT = """async () => {
+    try {
+        window.localStorage.clear();
+        window.sessionStorage.clear();
+        if (window.indexedDB) {
+            if (!indexedDB.databases) {
+                // databases cannot be listed, e.g. by older firefox
+                return false;
+            }
+            for (const database of await indexedDB.databases()) {
+                await new Promise((resolve, reject) => {
+                    const request = indexedDB.deleteDatabase(database.name);
+                    request.onsuccess = resolve;
+                    request.onerror = reject;
+                    request.onblocked = reject;
+                });
+            }
+        }
+        if (navigator.serviceWorker) {
+            for (const registration of await navigator.serviceWorker.getRegistrations()) {
+                if (!(await registration.unregister())) {
+                    return false;
+                }
+            }
+        }
+        if (window.caches) {
+            for (const name of await caches.keys()) {
+                await caches.delete(name);
+            }
+        }
+        return true;
+    } catch (e) {
+        return false;
+    }
+}"""
+
+
+def _origin(url: str) -> Optional[str]:
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https"):
+        return None
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _fulfill_blank(route: Route):
+    route.fulfill(status=200, content_type="text/html", body="<html></html>")
+
+
+# creates the context with given options, returns it with objects set up along with it
+ContextFactory = Callable[..., tuple[BrowserContext, dict[str, Any]]]
+
+
+class _PooledContext:
+    __slots__ = (
+        "context",
+        "extras",
+        "key",
+        "factory",
+        "kwargs",
+        "uses",
+        "released_at",
+        "origins",
+    )
+
+    def __init__(
+        self,
+        key: str,
+        factory: ContextFactory,
+        kwargs: dict[str, Any],
+    ):
+        self.context, self.extras = factory(**kwargs)
+        self.key: str = key
+        self.factory: ContextFactory = factory
+        self.kwargs: dict[str, Any] = kwargs
+        self.uses: int = 0
+        self.released_at: float = time.monotonic()
+        # origins the pages of the context have visited since the last reset
+        self.origins: set[str] = set()
+        origins: set[str] = self.origins
+
+        # closures, playwright stores its wrappers of bound methods in attributes of their objects
+        def on_navigated(frame: Frame):
+            origin: Optional[str] = _origin(frame.url)
+            if origin is not None:
+                origins.add(origin)
+
+        self.context.on("page", lambda page: page.on("framenavigated", on_navigated))
+
+
+class PlaywbotContextPool:
+    def __init__(
+        self,
+        browser: Browser,
+        max_size: int = 8,
+        max_uses: int = 50,
+        idle_timeout: float = 60.0,
+        prewarm: int = 1,
+    ):
+        """Pool of browser contexts keyed by the options the contexts were created with.
+
+        Contexts are reset on release - pages are closed, cookies and permissions are cleared
+        and so is the storage of every visited origin, i.e. local storage, IndexedDB, service
+        workers and cache storage - and handed out again by the next `acquire()` with the same
+        options. Context, whose state cannot be cleared completely, is closed instead.
+
+        Args:
+            browser (Browser): browser to create the contexts in.
+            max_size (int, optional): max number of idle contexts kept in the pool. Defaults to 8.
+            max_uses (int, optional): context is closed after being used this many times. Defaults to 50.
+            idle_timeout (float, optional): idle context older than this many seconds is closed. Defaults to 60.0.
+            prewarm (int, optional): number of spare contexts prepared for each used set of options. Defaults to 1.
+        """
+        self._browser: Browser = browser
+        self._max_size: int = max_size
+        self._max_uses: int = max_uses
+        self._idle_timeout: float = idle_timeout
+        self._prewarm: int = prewarm
+        self._idle: dict[str, deque[_PooledContext]] = {}
+        self._leased: dict[int, _PooledContext] = {}
+        self.stats: dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "recycled": 0,
+            "prewarmed": 0,
+            "discarded": 0,
+        }
+
+    @staticmethod
+    def _key(**kwargs) -> str:
+        return json.dumps(kwargs, sort_keys=True, default=str)
+
+    def idle_count(self) -> int:
+        return sum(len(idle) for idle in self._idle.values())
+
+    def acquire(
+        self, factory: Optional[ContextFactory] = None, **kwargs
+    ) -> tuple[BrowserContext, dict[str, Any]]:
+        """Returns idle context created with the same `kwargs`, or creates new one by the `factory`.
+
+        Args:
+            factory (Optional[ContextFactory], optional): creates the context and returns it along with
+            the objects set up with it. Defaults to plain `Browser.new_context()`.
+
+        Returns:
+            tuple[BrowserContext, dict[str, Any]]: context and the objects returned by the `factory`
+        """
+        self.evict_idle()
+        key: str = self._key(**kwargs)
+        idle = self._idle.get(key)
+
+        if idle:
+            pooled: _PooledContext = idle.popleft()
+            self.stats["hits"] += 1
+        else:
+            pooled = _PooledContext(key, factory or self._new_context, kwargs)
+            self.stats["misses"] += 1
+
+        pooled.uses += 1
+        self._leased[id(pooled.context)] = pooled
+        return (pooled.context, pooled.extras)
+
+    def _new_context(self, **kwargs) -> tuple[BrowserContext, dict[str, Any]]:
+        return (self._browser.new_context(**kwargs), {})
+
+    def owns(self, context: BrowserContext) -> bool:
+        return id(context) in self._leased
+
+    def release(self, context: BrowserContext):
+        """Resets the context and returns it to the pool, or closes it, if it
+        cannot be reused anymore. Then tops up the spare contexts created with
+        the same options, so the next `acquire()` does not have to wait for them.
+        """
+        pooled: _PooledContext = self._leased.pop(id(context))
+
+        if (
+            pooled.uses >= self._max_uses
+            or self.idle_count() >= self._max_size
+            or not self._reset(pooled)
+        ):
+            self._discard(pooled)
+        else:
+            self._put(pooled)
+            self.stats["recycled"] += 1
+
+        self.evict_idle()
+        while (
+            len(self._idle.get(pooled.key, ())) < self._prewarm
+            and self.idle_count() < self._max_size
+        ):
+            self._put(_PooledContext(pooled.key, pooled.factory, pooled.kwargs))
+            self.stats["prewarmed"] += 1
+
+    def _put(self, pooled: _PooledContext):
+        pooled.released_at = time.monotonic()
+        self._idle.setdefault(pooled.key, deque()).append(pooled)
+
+    def _discard(self, pooled: _PooledContext):
+        self.stats["discarded"] += 1
+        try:
+            pooled.context.close()
+        except Exception:  # pylint: disable=broad-except
+            pass
+
+    @staticmethod
+    def _reset(pooled: _PooledContext) -> bool:
+        """Clears the state of the context. Returns `False`, if the context could not
+        be cleaned completely and should not be reused.
+
+        Storage is cleared once the pages of the test are closed, so they do not hold
+        IndexedDB connections open. Each visited origin is loaded into the blank page
+        served by the route, so the page scripts of the origin do not run meanwhile.
+        """
+        context: BrowserContext = pooled.context
+        cleared: bool = True
+        try:
+            for page in context.pages:
+                page.close()
+            if pooled.origins:
+                page = context.new_page()
+                page.route("**/*", _fulfill_blank)
+                for origin in sorted(pooled.origins):
+                    page.goto(f"{origin}/")
+                    cleared = page.evaluate(_CLEAR_ORIGIN_SCRIPT) and cleared
+                page.close()
+                pooled.origins.clear()
+            context.clear_cookies()
+            context.clear_permissions()
+            state: dict[str, Any] = context.storage_state()
+        except Exception:  # pylint: disable=broad-except
+            return False
+
+        return cleared and not any(
+            origin.get("localStorage") for origin in state.get("origins", [])
+        )
+
+    def evict_idle(self):
+        """Closes contexts, which were idle longer than `idle_timeout`."""
+        deadline: float = time.monotonic() - self._idle_timeout
+        for key, idle in list(self._idle.items()):
+            while idle and idle[0].released_at < deadline:
+                self._discard(idle.popleft())
+            if not idle:
+                del self._idle[key]
+
+    def _discard_idle(self):
+        for idle in self._idle.values():
+            while idle:
+                self._discard(idle.popleft())
+        self._idle.clear()
+
+    def close(self):
+        """Closes all idle contexts. Leased contexts are closed, when released."""
+        self._discard_idle()
+        self._max_size = 0
+
+    def rebind(self, browser: Browser):
+        """Closes all idle contexts and creates the next ones in the restarted `browser`."""
+        self._discard_idle()
+        self._browser = browser
+
+
+class PlaywbotPagePool:
+    def __init__(self, context: BrowserContext, max_size: int = 4):
+        """Pool of pages of one browser context.
+
+        Released pages are navigated to `about:blank`, their routes and listeners are removed
+        and they are handed out by the next `acquire()`.
+
+        Args:
+            context (BrowserContext): context to create the pages in.
+            max_size (int, optional): max number of idle pages kept in the pool. Defaults to 4.
+        """
+        self._context: BrowserContext = context
+        self._max_size: int = max_size
+        self._idle: deque[Page] = deque()
+        self._leased: dict[int, Page] = {}
+        self.stats: dict[str, int] = {"hits": 0, "misses": 0, "discarded": 0}
+
+    def acquire(self) -> Page:
+        """Returns idle page, or opens new one, if there is no idle page."""
+        while self._idle:
+            page: Page = self._idle.popleft()
+            if not page.is_closed():
+                self.stats["hits"] += 1
+                break
+        else:
+            page = self._context.new_page()
+            self.stats["misses"] += 1
+
+        self._leased[id(page)] = page
+        return page
+
+    def owns(self, page: Page) -> bool:
+        return id(page) in self._leased
+
+    def release(
+        self,
+        page: Page,
+        listeners: list[tuple[str, Callable]],
+        routes: list[tuple[Any, Union[Callable, None]]],
+    ):
+        """Resets the page and returns it to the pool, or closes it, if the pool is full
+        or the page could not be reset.
+
+        Args:
+            page (Page): page to be released
+            listeners (list[tuple[str, Callable]]): event listeners registered on the page
+            routes (list[tuple[Any, Union[Callable, None]]]): routes registered on the page
+        """
+        del self._leased[id(page)]
+
+        if page.is_closed():
+            return
+
+        if len(self._idle) >= self._max_size or not self._reset(
+            page, listeners, routes
+        ):
+            self.stats["discarded"] += 1
+            try:
+                page.close()
+            except Exception:  # pylint: disable=broad-except
+                pass
+            return
+
+        self._idle.append(page)
+
+    @staticmethod
+    def _reset(
+        page: Page,
+        listeners: list[tuple[str, Callable]],
+        routes: list[tuple[Any, Union[Callable, None]]],
+    ) -> bool:
+        try:
+            for event, handler in listeners:
+                page.remove_listener(event, handler)
+            for url, handler in routes:
+                page.unroute(url, handler)
+            page.evaluate(_CLEAR_STORAGE_SCRIPT)
+            page.goto("about:blank")
+        except Exception:  # pylint: disable=broad-except
+            return False
+        return True
+
+    def close(self):
+        """Closes all idle pages."""
+        while self._idle:
+            page: Page = self._idle.popleft()
+            if not page.is_closed():
+                page.close()
+        self._max_size = 0
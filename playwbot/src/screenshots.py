@@ -0,0 +1,214 @@
+"""Implements screenshots written to the disk in the background.
+
+Only the capture itself has to wait for the browser. Encoding, hashing and
+writing of the captured frames is done by the pool of worker threads, so the
+test continues right after the capture. Frame identical to the previous frame
+of the same page, or element, is not encoded and written again, its file is
+hard linked, or copied, from the previous one. Number of frames waiting
+for the workers is bounded, the capture waits for a free slot, when the queue
+is full.
+"""
+
+import hashlib
+import io
+import os
+import re
+import shutil
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Literal, Optional, Union
+
+ImageType = Literal["png", "jpeg"]
+
+
+def _pillow_image() -> Any:
+    """Returns Pillow's Image module, or `None`, if Pillow is not installed."""
+    try:
+        from PIL import Image  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return None
+    return Image
+
+
+class PlaywbotScreenshotWriter:
+    """Library listener, which writes captured screenshots in the background
+    and waits for all of them at the end of each test.
+    """
+
+    ROBOT_LISTENER_API_VERSION = 2
+
+    def __init__(self):
+        self.enabled: bool = False
+        self._directory: Path = Path(".")
+        self._image_type: ImageType = "png"
+        self._quality: Optional[int] = None
+        self._workers: int = 2
+        self._slots: threading.BoundedSemaphore = threading.BoundedSemaphore(16)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: list[Future] = []
+        # last frame of every page, or element, chained so frames are compared in capture order
+        self._last_frame: dict[int, Future] = {}
+        self._lock: threading.Lock = threading.Lock()
+        self._counter: int = 0
+        self.test: Optional[str] = None
+        self.stats: dict[str, int] = {"captured": 0, "written": 0, "deduplicated": 0}
+        # failed writes, reported by the keyword flushing the screenshots
+        self.errors: list[str] = []
+
+    def enable(
+        self,
+        directory: Union[str, Path],
+        image_type: ImageType = "png",
+        quality: Optional[int] = None,
+        workers: int = 2,
+        queue_size: int = 16,
+    ):
+        """Starts writing screenshots in the background.
+
+        Args:
+            directory (Union[str, Path]): folder for screenshots captured without the path
+            image_type (ImageType, optional): "png" or "jpeg". Defaults to "png".
+            quality (Optional[int], optional): jpeg quality 0-100. Defaults to None.
+            workers (int, optional): number of worker threads. Defaults to 2.
+            queue_size (int, optional): max number of frames held in memory. Defaults to 16.
+        """
+        if image_type not in ("png", "jpeg"):
+            raise ValueError(f"{image_type} is not supported image type.")
+        if int(workers) < 1 or int(queue_size) < 1:
+            raise ValueError("Number of workers and queue size must be at least 1.")
+
+        self.disable()
+        self._directory = Path(directory)
+        self._image_type = image_type
+        self._quality = quality
+        self._workers = int(workers)
+        self._slots = threading.BoundedSemaphore(int(queue_size))
+        self.enabled = True
+
+    def disable(self):
+        """Writes all pending frames and stops the workers."""
+        self.flush()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._last_frame = {}
+        self.enabled = False
+
+    def capture(
+        self, handle: Any, path: Union[str, Path, None] = None, **kwargs
+    ) -> Path:
+        """Captures screenshot of the `handle` and hands it over to the workers.
+
+        Args:
+            handle (Any): page, or element handle, providing `screenshot()` method
+            path (Union[str, Path, None], optional): file to write, generated in the folder, if not given.
+            Defaults to None.
+            **kwargs: options of the playwright's `screenshot()`, except of `path`, `type` and `quality`
+
+        Returns:
+            Path: file the screenshot is written to
+        """
+        # the image type is given by the writer
+        kwargs.pop("type", None)
+        kwargs.pop("quality", None)
+        image_module: Any = _pillow_image() if self._image_type == "jpeg" else None
+        if self._image_type == "jpeg" and image_module is None:
+            # without Pillow the browser encodes the jpeg itself
+            frame: bytes = handle.screenshot(
+                type="jpeg", quality=self._quality, **kwargs
+            )
+        else:
+            frame = handle.screenshot(type="png", **kwargs)
+
+        target: Path = Path(path) if path is not None else self._next_path()
+        self._slots.acquire()
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._workers, thread_name_prefix="playwbot-screenshot"
+                )
+            previous: Optional[Future] = self._last_frame.get(id(handle))
+            future: Future = self._executor.submit(
+                self._process, frame, target, previous, image_module
+            )
+            self._last_frame[id(handle)] = future
+            self._pending.append(future)
+            self.stats["captured"] += 1
+        future.add_done_callback(lambda _: self._slots.release())
+        return target
+
+    def _next_path(self) -> Path:
+        self._counter += 1
+        name: str = re.sub(r"[^\w.-]", "_", self.test or "screenshot")
+        extension: str = "jpg" if self._image_type == "jpeg" else "png"
+        return self._directory / f"{name}-{self._counter}.{extension}"
+
+    def _process(
+        self,
+        frame: bytes,
+        target: Path,
+        previous: Optional[Future],
+        image_module: Any,
+    ) -> tuple[str, Path]:
+        digest: str = hashlib.sha1(frame).hexdigest()
+        # previous frame was submitted earlier, so it is already taken by some worker
+        if (
+            previous is not None
+            and previous.exception() is None
+            and previous.result()[0] == digest
+        ):
+            self._link(previous.result()[1], target)
+            with self._lock:
+                self.stats["deduplicated"] += 1
+            return digest, target
+
+        if image_module is not None:
+            image = image_module.open(io.BytesIO(frame)).convert("RGB")
+            buffer = io.BytesIO()
+            image.save(buffer, format="JPEG", quality=self._quality or 75)
+            frame = buffer.getvalue()
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(frame)
+        with self._lock:
+            self.stats["written"] += 1
+        return digest, target
+
+    @staticmethod
+    def _link(source: Path, target: Path):
+        """Makes the identical frame available at `target` without writing it again."""
+        if target.resolve() == source.resolve():
+            return
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.unlink(missing_ok=True)
+        try:
+            os.link(source, target)
+        except OSError:
+            # file system without hard links, or another device
+            shutil.copyfile(source, target)
+
+    def flush(self):
+        """Waits until all captured frames are written. Failed writes are kept in `errors`."""
+        with self._lock:
+            pending: list[Future] = self._pending
+            self._pending = []
+
+        for future in pending:
+            error: Optional[BaseException] = future.exception()
+            if error is not None:
+                self.errors.append(str(error))
+
+    def start_test(
+        self, name: str, attributes: dict[str, Any]
+    ):  # pylint: disable=unused-argument
+        self.test = attributes.get("longname", name)
+
+    def end_test(
+        self, name: str, attributes: dict[str, Any]
+    ):  # pylint: disable=unused-argument
+        self.flush()
+        self.test = None
+
+    def close(self):
+        self.disable()
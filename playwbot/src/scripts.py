@@ -0,0 +1,224 @@
+"""JavaScript functions evaluated in the page by the library.
+
+Functions working with many elements at once resolve css and xpath selectors
+by the DOM API. Selectors of other playwright selector engines, e.g. `text=`,
+cannot be resolved that way, so they are reported back as unresolved and the
+library handles them by playwright one by one. Unlike playwright's css engine,
+the DOM API does not pierce shadow roots, so element not found by it may still
+be found by playwright.
+"""
+
+# throws for the selectors, which cannot be resolved by the DOM API
+_RESOLVE_SELECTOR = r"""(selector) => {
+        if (/^(xpath=|\/\/|\.\.|\(\/\/)/.test(selector)) {
+            const expression = selector.replace(/^xpath=/, "");
+            return document.evaluate(
+                expression, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+            ).singleNodeValue;
+        }
+        if (/^[\w-]+=/.test(selector) && !selector.startsWith("css=")) {
+            throw new Error("unsupported selector engine");
+        }
+        if (selector.includes(">>")) {
+            throw new Error("chained selector");
+        }
+        return document.querySelector(selector.replace(/^css=/, ""));
+    }"""
+
+_IS_DISABLED = r"""(element) =>
+        ["BUTTON", "INPUT", "SELECT", "TEXTAREA", "OPTION", "OPTGROUP"].includes(element.nodeName)
+        && element.matches(":disabled")"""
+
+ELEMENT_STATES_FUNCTION = (
+    r"""({ selectors, states }) => {
+    const resolve = """
+    + _RESOLVE_SELECTOR
+    + r""";
+    const isDisabled = """
+    + _IS_DISABLED
+    + r""";
+    const isVisible = (element) => {
+        const rect = element.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0
+            && window.getComputedStyle(element).visibility !== "hidden";
+    };
+    const isEditable = (element) => !isDisabled(element) && !element.readOnly
+        && (["INPUT", "TEXTAREA", "SELECT"].includes(element.nodeName) || element.isContentEditable);
+    const check = (element, state) => {
+        if (state === "hidden") {
+            return !element || !isVisible(element);
+        }
+        if (!element) {
+            return false;
+        }
+        switch (state) {
+            case "attached": return true;
+            case "visible": return isVisible(element);
+            case "enabled": return !isDisabled(element);
+            case "disabled": return isDisabled(element);
+            case "editable": return isEditable(element);
+            case "checked": return element.checked === true
+                || element.getAttribute("aria-checked") === "true";
+        }
+        throw new Error(`unsupported state ${state}`);
+    };
+
+    const result = {};
+    const unresolved = [];
+    let all = true;
+    for (const selector of selectors) {
+        let element;
+        try {
+            element = resolve(selector);
+        } catch (e) {
+            unresolved.push(selector);
+            continue;
+        }
+        if (!element) {
+            // may be in the shadow DOM, or missing, playwright tells
+            unresolved.push(selector);
+            continue;
+        }
+        result[selector] = {};
+        for (const state of states) {
+            result[selector][state] = check(element, state);
+            all = all && result[selector][state];
+        }
+    }
+    return { result, unresolved, all };
+}"""
+)
+
+# Classifies the form fields and, if `apply` is true, writes the values directly,
+# the way frameworks listening to `input` and `change` events notice them.
+# File inputs cannot be set from the page, so they are always left to playwright.
+FILL_FORM_FUNCTION = (
+    r"""({ fields, apply }) => {
+    const resolve = """
+    + _RESOLVE_SELECTOR
+    + r""";
+    const isDisabled = """
+    + _IS_DISABLED
+    + r""";
+    const kindOf = (element) => {
+        if (element.nodeName === "SELECT") {
+            return "select";
+        }
+        if (element.nodeName === "TEXTAREA") {
+            return "text";
+        }
+        if (element.nodeName === "INPUT") {
+            const type = (element.getAttribute("type") || "text").toLowerCase();
+            if (["checkbox", "radio", "file"].includes(type)) {
+                return type === "radio" ? "checkbox" : type;
+            }
+            if (["button", "submit", "reset", "image", "hidden"].includes(type)) {
+                return "other";
+            }
+            return "text";
+        }
+        return element.isContentEditable ? "text" : "other";
+    };
+    const dispatch = (element) => {
+        element.dispatchEvent(new Event("input", { bubbles: true }));
+        element.dispatchEvent(new Event("change", { bubbles: true }));
+    };
+    const setValue = (element, value) => {
+        if (element.isContentEditable) {
+            element.textContent = value;
+        } else {
+            // native setter, so frameworks tracking the value property see the change
+            const prototype = Object.getPrototypeOf(element);
+            Object.getOwnPropertyDescriptor(prototype, "value").set.call(element, value);
+        }
+        dispatch(element);
+    };
+    const write = (element, kind, value) => {
+        if (isDisabled(element)) {
+            return "element is disabled";
+        }
+        if (kind === "text") {
+            if (element.readOnly) {
+                return "element is read-only";
+            }
+            setValue(element, String(value));
+            return null;
+        }
+        if (kind === "select") {
+            const wanted = (Array.isArray(value) ? value : [value]).map(String);
+            const options = Array.from(element.options);
+            const missing = wanted.filter((item) =>
+                !options.some((option) => option.value === item || option.label === item));
+            if (missing.length) {
+                return `options not found: ${missing.join(", ")}`;
+            }
+            for (const option of options) {
+                option.selected = wanted.includes(option.value) || wanted.includes(option.label);
+            }
+            dispatch(element);
+            return null;
+        }
+        if (kind === "checkbox") {
+            const checked = value === true || String(value).toLowerCase() === "true";
+            if (element.checked !== checked) {
+                element.click();
+            }
+            return element.checked === checked ? null : "checked state did not change";
+        }
+        return "element cannot be filled";
+    };
+
+    const result = {};
+    for (const [selector, value] of Object.entries(fields)) {
+        let element;
+        try {
+            element = resolve(selector);
+        } catch (e) {
+            result[selector] = { kind: "unresolved", error: null };
+            continue;
+        }
+        if (!element) {
+            result[selector] = { kind: "missing", error: null };
+            continue;
+        }
+        const kind = kindOf(element);
+        result[selector] = {
+            kind,
+            error: apply && kind !== "file" ? write(element, kind, value) : null,
+            done: apply && kind !== "file",
+        };
+    }
+    return result;
+}"""
+)
+
+# plain data of the elements matched by playwright, so no element handles are created
+SNAPSHOT_FUNCTION = r"""(elements, { attributes, offset, limit }) => {
+    const end = limit === null ? elements.length : offset + limit;
+    const records = elements.slice(offset, end).map((element) => {
+        const rect = element.getBoundingClientRect();
+        return {
+            text: element.innerText ?? element.textContent,
+            attributes: Object.fromEntries(
+                attributes.map((name) => [name, element.getAttribute(name)])
+            ),
+            box: { x: rect.x, y: rect.y, width: rect.width, height: rect.height },
+            visible: rect.width > 0 && rect.height > 0
+                && window.getComputedStyle(element).visibility !== "hidden",
+        };
+    });
+    return { total: elements.length, records };
+}"""
+
+# Installs the observer of the document once per document and returns milliseconds
+# since its last mutation. Fresh document counts as just mutated.
+DOM_IDLE_FUNCTION = r"""() => {
+    if (!window.__playwbotMutations) {
+        const state = { last: performance.now() };
+        new MutationObserver(() => { state.last = performance.now(); }).observe(document, {
+            subtree: true, childList: true, attributes: true, characterData: true,
+        });
+        window.__playwbotMutations = state;
+    }
+    return performance.now() - window.__playwbotMutations.last;
+}"""
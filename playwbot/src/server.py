@@ -0,0 +1,191 @@
+"""Implements shared browser server, which can be reused by several processes,
+e.g. by pabot workers.
+
+Python version of Playwright does not expose `BrowserType.launch_server()`,
+so the server is started by the node driver bundled with playwright package.
+Running servers are tracked in the small json registry file guarded by the lock
+file. First process starts the server, others only attach to it and the last one
+to leave shuts the server down.
+"""
+
+import hashlib
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Optional, Union
+from urllib.parse import urlparse
+
+import playwright
+
+from playwbot.src.utils import file_lock
+
+_SERVER_SCRIPT = """
+const [packageDir, browserName, launchOptions] = process.argv.slice(1);
+const playwright = require(packageDir);
+(async () => {
+    const server = await playwright[browserName].launchServer(JSON.parse(launchOptions));
+    process.stdout.write(server.wsEndpoint() + "\\n");
+    const shutdown = async () => {
+        await server.close();
+        process.exit(0);
+    };
+    process.on("SIGTERM", shutdown);
+    process.on("SIGINT", shutdown);
+})().catch((error) => {
+    process.stderr.write(String(error));
+    process.exit(1);
+});
+"""
+
+
+def _to_camel_case(name: str) -> str:
+    first, *rest = name.split("_")
+    return first + "".join(part.capitalize() for part in rest)
+
+
+class PlaywbotBrowserServer:
+    def __init__(
+        self,
+        browser: str = "chromium",
+        registry_dir: Optional[Union[str, Path]] = None,
+        **kwargs,
+    ):
+        if browser not in ("chromium", "firefox", "webkit"):
+            raise RuntimeError(
+                "You have to select either 'chromium', 'firefox', or 'webkit' as browser."
+            )
+        self._browser: str = browser
+        self._launch_options: dict[str, Any] = {
+            _to_camel_case(key): value for key, value in kwargs.items()
+        }
+        self._registry_dir: Path = (
+            Path(registry_dir)
+            if registry_dir is not None
+            else Path(tempfile.gettempdir()) / "playwbot"
+        )
+        self._registry_dir.mkdir(parents=True, exist_ok=True)
+
+        key: str = hashlib.sha1(
+            json.dumps(
+                [browser, self._launch_options], sort_keys=True, default=str
+            ).encode()
+        ).hexdigest()[:16]
+        self._registry_file: Path = self._registry_dir / f"{browser}-{key}.json"
+        self._lock_file: Path = self._registry_dir / f"{browser}-{key}.lock"
+        self._log_file: Path = self._registry_dir / f"{browser}-{key}.log"
+        self._attached: bool = False
+        # process of the server, whose descendants are the browsers it launched
+        self.pid: Optional[int] = None
+
+    def acquire(self) -> str:
+        """Attaches to the running server or starts new one, if there is no such server.
+
+        Returns:
+            str: websocket endpoint of the server to be used with `BrowserType.connect()`.
+        """
+        with file_lock(self._lock_file):
+            registry: Optional[dict[str, Any]] = self._read_registry()
+
+            if registry is None or not self._is_listening(registry["ws_endpoint"]):
+                registry = {**self._start_server(), "clients": 0}
+
+            registry["clients"] += 1
+            self._write_registry(registry)
+            self._attached = True
+            self.pid = registry["pid"]
+            return registry["ws_endpoint"]
+
+    def release(self):
+        """Detaches from the server. Server is shut down, when the last client leaves."""
+        if not self._attached:
+            return
+
+        with file_lock(self._lock_file):
+            self._attached = False
+            self.pid = None
+            registry: Optional[dict[str, Any]] = self._read_registry()
+            if registry is None:
+                return
+
+            registry["clients"] -= 1
+            if registry["clients"] > 0:
+                self._write_registry(registry)
+                return
+
+            self._stop_server(registry["pid"])
+            self._registry_file.unlink()
+
+    def _read_registry(self) -> Optional[dict[str, Any]]:
+        try:
+            return json.loads(self._registry_file.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _write_registry(self, registry: dict[str, Any]):
+        tmp_file: Path = self._registry_file.with_suffix(".tmp")
+        tmp_file.write_text(json.dumps(registry), encoding="utf-8")
+        os.replace(tmp_file, self._registry_file)
+
+    @staticmethod
+    def _is_listening(ws_endpoint: str) -> bool:
+        parsed = urlparse(ws_endpoint)
+        try:
+            with socket.create_connection((parsed.hostname, parsed.port), timeout=1):
+                return True
+        except OSError:
+            return False
+
+    @staticmethod
+    def _driver_paths() -> tuple[str, str]:
+        driver_dir: Path = Path(playwright.__file__).parent / "driver"
+        node: str = os.getenv(
+            "PLAYWRIGHT_NODEJS_PATH",
+            str(driver_dir / ("node.exe" if sys.platform == "win32" else "node")),
+        )
+        return (node, str(driver_dir / "package"))
+
+    def _start_server(self) -> dict[str, Any]:
+        node, package_dir = self._driver_paths()
+        detach: dict[str, Any] = (
+            {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+            if sys.platform == "win32"
+            else {"start_new_session": True}
+        )
+        with open(self._log_file, "w", encoding="utf-8") as log:
+            process = subprocess.Popen(  # pylint: disable=consider-using-with
+                [
+                    node,
+                    "-e",
+                    _SERVER_SCRIPT,
+                    package_dir,
+                    self._browser,
+                    json.dumps(self._launch_options, default=str),
+                ],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=log,
+                text=True,
+                **detach,
+            )
+        ws_endpoint: str = process.stdout.readline().strip()
+        process.stdout.close()
+
+        if not ws_endpoint:
+            process.wait()
+            raise RuntimeError(
+                f"Browser server failed to start: {self._log_file.read_text(encoding='utf-8')}"
+            )
+
+        return {"ws_endpoint": ws_endpoint, "pid": process.pid}
+
+    @staticmethod
+    def _stop_server(pid: int):
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except OSError:
+            pass
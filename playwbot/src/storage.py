@@ -0,0 +1,91 @@
+"""Implements cache of browser contexts' storage states.
+
+Storage state - cookies and local storage - is kept in memory and on the disk,
+so it can be reused by other suites and test runs until it expires.
+"""
+
+import json
+import os
+import re
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Optional, Union
+
+_CACHES: dict[Path, "PlaywbotStorageStateCache"] = {}
+
+
+def get_storage_state_cache(
+    directory: Optional[Union[str, Path]] = None,
+) -> "PlaywbotStorageStateCache":
+    """Returns the cache for the given `directory`, which is shared by the whole process.
+
+    Args:
+        directory (Optional[Union[str, Path]], optional): folder to store the states in.
+        Defaults to `playwbot/storage_state` folder in the system temp folder.
+
+    Returns:
+        PlaywbotStorageStateCache: storage state cache
+    """
+    path: Path = (
+        Path(directory).resolve()
+        if directory is not None
+        else Path(tempfile.gettempdir()) / "playwbot" / "storage_state"
+    )
+    if path not in _CACHES:
+        _CACHES[path] = PlaywbotStorageStateCache(path)
+    return _CACHES[path]
+
+
+class PlaywbotStorageStateCache:
+    def __init__(self, directory: Path):
+        self._directory: Path = directory
+        self._directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        self._memory: dict[str, tuple[float, dict[str, Any]]] = {}
+
+    def _file(self, name: str) -> Path:
+        filename: str = re.sub(r"[^\w.-]", "_", name)
+        return self._directory / f"{filename}.json"
+
+    def save(self, name: str, state: dict[str, Any], ttl: float):
+        """Stores the `state` under the `name` for `ttl` seconds."""
+        expires_at: float = time.time() + ttl
+        self._memory[name] = (expires_at, state)
+
+        tmp_file: Path = self._file(name).with_suffix(f".{os.getpid()}.tmp")
+        tmp_file.write_text(
+            json.dumps({"expires_at": expires_at, "state": state}), encoding="utf-8"
+        )
+        os.replace(tmp_file, self._file(name))
+
+    def load(self, name: str) -> Optional[dict[str, Any]]:
+        """Returns the state stored under the `name`, or `None`, if there is no such
+        state, or if the state expired.
+
+        State invalidated by another process is not returned from the memory either.
+        """
+        if name in self._memory and not self._file(name).exists():
+            del self._memory[name]
+
+        if name not in self._memory:
+            try:
+                stored: dict[str, Any] = json.loads(
+                    self._file(name).read_text(encoding="utf-8")
+                )
+            except (FileNotFoundError, json.JSONDecodeError):
+                return None
+            self._memory[name] = (stored["expires_at"], stored["state"])
+
+        expires_at, state = self._memory[name]
+        if expires_at <= time.time():
+            self.invalidate(name)
+            return None
+        return state
+
+    def invalidate(self, name: str):
+        """Removes the state stored under the `name`."""
+        self._memory.pop(name, None)
+        try:
+            self._file(name).unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,232 @@
+"""Implements timeouts derived from the latency observed in the previous runs.
+
+Latency of every operation - keyword, selector and url pattern of the page -
+is collected into the histogram with logarithmic buckets and stored in the
+json file, so the histograms grow with the runs, not with the samples. Timeout
+of the operation is its high percentile multiplied by the margin and kept
+between the floor and the ceiling. Operations without enough samples keep
+their usual timeout.
+"""
+
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+from urllib.parse import urlsplit
+
+from playwbot.src.metrics import PlaywbotHistogram
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+# path segments, which are ids, e.g. /orders/1234 or /users/3f2a...
+_ID_SEGMENT = re.compile(r"/(?:\d+|[0-9a-fA-F-]{16,})(?=/|$)")
+
+
+def url_pattern(url: Optional[str]) -> str:
+    """Returns host and path of the `url` with ids replaced by `*`."""
+    if not url:
+        return ""
+    parts = urlsplit(url)
+    return parts.netloc + _ID_SEGMENT.sub("/*", parts.path)
+
+
+def _dump(histogram: PlaywbotHistogram) -> dict[str, Any]:
+    return {
+        "count": histogram.count,
+        "total": round(histogram.total, 6),
+        "max": round(histogram.max, 6),
+        "buckets": {str(bucket): count for bucket, count in histogram.buckets.items()},
+    }
+
+
+def _load(data: dict[str, Any]) -> PlaywbotHistogram:
+    histogram = PlaywbotHistogram()
+    histogram.count = data["count"]
+    histogram.total = data["total"]
+    histogram.max = data["max"]
+    histogram.buckets = {
+        int(bucket): count for bucket, count in data["buckets"].items()
+    }
+    return histogram
+
+
+class PlaywbotTimeoutStore:
+    def __init__(self, path: Path):
+        """Histograms of latency by operation, loaded from and saved to the json file at `path`."""
+        self._path: Path = path
+        self._histograms: dict[str, PlaywbotHistogram] = {}
+        # samples recorded since the last save, merged into the file on save
+        self._recorded: dict[str, PlaywbotHistogram] = {}
+        self._load()
+
+    def _load(self):
+        try:
+            stored: dict[str, Any] = json.loads(self._path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            self._histograms = {}
+            return
+        self._histograms = {
+            key: _load(data) for key, data in stored.get("operations", {}).items()
+        }
+
+    def record(self, key: str, seconds: float):
+        for histograms in (self._histograms, self._recorded):
+            if key not in histograms:
+                histograms[key] = PlaywbotHistogram()
+            histograms[key].add(seconds)
+
+    def count(self, key: str) -> int:
+        histogram: Optional[PlaywbotHistogram] = self._histograms.get(key)
+        return histogram.count if histogram is not None else 0
+
+    def timeout(
+        self,
+        key: str,
+        percentile: float,
+        margin: float,
+        floor: float,
+        ceiling: float,
+        min_samples: int,
+    ) -> Optional[float]:
+        """Returns timeout of the operation in milliseconds, or `None`, if there are not enough samples."""
+        histogram: Optional[PlaywbotHistogram] = self._histograms.get(key)
+        if histogram is None or histogram.count < min_samples:
+            return None
+        derived: float = histogram.percentile(percentile / 100) * 1000 * margin
+        return round(min(max(derived, floor), ceiling))
+
+    def save(self):
+        """Merges the samples recorded since the last save with the file, which may have been
+        updated by other processes meanwhile, and writes it.
+        """
+        if not self._recorded:
+            return
+        self._load()
+        for key, recorded in self._recorded.items():
+            self._histograms.setdefault(key, PlaywbotHistogram()).merge(recorded)
+        self._recorded = {}
+
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file: Path = self._path.with_suffix(f".{os.getpid()}.tmp")
+        operations = {key: _dump(value) for key, value in self._histograms.items()}
+        tmp_file.write_text(
+            json.dumps({"operations": operations}, separators=(",", ":")),
+            encoding="utf-8",
+        )
+        os.replace(tmp_file, self._path)
+
+
+_STORES: dict[Path, PlaywbotTimeoutStore] = {}
+
+
+def get_timeout_store(path: Union[str, Path]) -> PlaywbotTimeoutStore:
+    """Returns the store of the file at `path`, which is shared by the whole process."""
+    resolved: Path = Path(path).resolve()
+    if resolved not in _STORES:
+        _STORES[resolved] = PlaywbotTimeoutStore(resolved)
+    return _STORES[resolved]
+
+
+class PlaywbotAdaptiveTimeouts:
+    """Library listener, which applies timeouts of the store to the operations
+    and saves their latency at the end of each suite.
+    """
+
+    ROBOT_LISTENER_API_VERSION = 2
+
+    def __init__(self):
+        self.store: Optional[PlaywbotTimeoutStore] = None
+        self.percentile: float = 99
+        self.margin: float = 1.5
+        self.floor: float = 1000
+        self.ceiling: float = 30000
+        self.min_samples: int = 20
+
+    def enable(
+        self,
+        path: Union[str, Path],
+        percentile: float = 99,
+        margin: float = 1.5,
+        floor: float = 1000,
+        ceiling: float = 30000,
+        min_samples: int = 20,
+    ):
+        """Starts applying and recording timeouts of the store at `path`.
+
+        Args:
+            path (Union[str, Path]): json file of the store
+            percentile (float, optional): percentile of the latency the timeout is derived from. Defaults to 99.
+            margin (float, optional): multiplier of the percentile. Defaults to 1.5.
+            floor (float, optional): min timeout in milliseconds. Defaults to 1000.
+            ceiling (float, optional): max timeout in milliseconds. Defaults to 30000.
+            min_samples (int, optional): samples needed before the timeout is derived. Defaults to 20.
+        """
+        if not 0 < float(percentile) <= 100:
+            raise ValueError("Percentile must be greater than 0 and at most 100.")
+        if float(floor) > float(ceiling):
+            raise ValueError(
+                "Floor of the timeout must not be greater than its ceiling."
+            )
+        self.disable()
+        self.store = get_timeout_store(path)
+        self.percentile = float(percentile)
+        self.margin = float(margin)
+        self.floor = float(floor)
+        self.ceiling = float(ceiling)
+        self.min_samples = int(min_samples)
+
+    def disable(self):
+        if self.store is not None:
+            self.store.save()
+            self.store = None
+
+    def run(
+        self,
+        keyword: str,
+        selector: Any,
+        url: Optional[str],
+        options: dict[str, Any],
+        call: Callable[..., Any],
+    ) -> Any:
+        """Calls `call` with the `options` and the derived timeout, unless the timeout is given
+        explicitly, and records its latency, if it succeeds.
+        """
+        if self.store is None or options.get("timeout") is not None:
+            return call(**options)
+
+        key: str = (
+            f"{keyword}|{selector if selector is not None else ''}|{url_pattern(url)}"
+        )
+        timeout: Optional[float] = self.store.timeout(
+            key,
+            self.percentile,
+            self.margin,
+            self.floor,
+            self.ceiling,
+            self.min_samples,
+        )
+        if timeout is not None:
+            options = {**options, "timeout": timeout}
+
+        start: float = time.perf_counter()
+        try:
+            result: Any = call(**options)
+        except PlaywrightTimeoutError as error:
+            if timeout is None:
+                raise
+            raise RuntimeError(
+                f"{keyword} exceeded adaptive timeout {timeout} ms derived from the latency of "
+                f"{self.store.count(key)} previous calls of {key}."
+            ) from error
+        self.store.record(key, time.perf_counter() - start)
+        return result
+
+    def end_suite(
+        self, name: str, attributes: dict[str, Any]
+    ):  # pylint: disable=unused-argument
+        if self.store is not None:
+            self.store.save()
+
+    def close(self):
+        self.disable()
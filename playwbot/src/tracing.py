@@ -0,0 +1,197 @@
+"""Implements playwright tracing of browser contexts governed by the tracing policy.
+
+Tracing of the context is started once and recorded in chunks, one chunk per test.
+Chunk of the passed test is discarded by the browser without being exported, unless
+the policy says to keep all chunks. Exported archives are moved to the trace folder,
+or deleted, by the background thread, so test teardown does not wait for the disk.
+"""
+
+import os
+import random
+import re
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Literal, Optional, Union
+
+from playwright.sync_api import BrowserContext
+
+TracingPolicy = Literal["off", "always", "sample", "retain-on-failure"]
+
+
+class PlaywbotTracer:
+    def __init__(
+        self,
+        manager: "PlaywbotTracing",
+        context: BrowserContext,
+        policy: TracingPolicy,
+        sample: float,
+        directory: Path,
+    ):
+        self._manager: PlaywbotTracing = manager
+        self._context: BrowserContext = context
+        self.policy: TracingPolicy = policy
+        self._sample: float = sample
+        self._directory: Path = directory
+        self._chunk_open: bool = False
+        self.traces: list[Path] = []
+
+    def start(self, title: Optional[str]):
+        """Starts tracing of the context and its first chunk, if the context is created
+        inside the test.
+        """
+        self._context.tracing.start(
+            title=title, screenshots=True, snapshots=True, sources=True
+        )
+        self._chunk_open = True
+        if title is None or not self._is_sampled():
+            self._context.tracing.stop_chunk()
+            self._chunk_open = False
+
+    def _is_sampled(self) -> bool:
+        if self.policy == "sample":
+            return random.random() * 100 < self._sample
+        return True
+
+    def start_chunk(self, title: str):
+        if not self._chunk_open and self._is_sampled():
+            self._context.tracing.start_chunk(title=title)
+            self._chunk_open = True
+
+    def stop_chunk(self, title: str, failed: Optional[bool]):
+        """Stops the current chunk. It is exported only if it is to be kept, or if the
+        result of the test is not known yet.
+
+        Args:
+            title (str): name of the test recorded by the chunk
+            failed (Optional[bool]): whether the test failed, `None` if not known yet
+        """
+        if not self._chunk_open:
+            return
+        self._chunk_open = False
+
+        if self.policy == "retain-on-failure" and failed is False:
+            self._context.tracing.stop_chunk()
+            return
+
+        exported: Path = self._manager.pending_path()
+        self._context.tracing.stop_chunk(path=exported)
+        name: str = re.sub(r"[^\w.-]", "_", title)
+        trace: Path = self._directory / f"{name}-{exported.stem}.zip"
+        if self.policy == "retain-on-failure" and failed is None:
+            self._manager.postpone(exported, trace)
+        else:
+            self._manager.write(exported, trace)
+            self.traces.append(trace)
+
+    def stop(self, failed: Optional[bool]):
+        """Stops the current chunk and the tracing, e.g. before the context is closed.
+
+        Args:
+            failed (Optional[bool]): whether the current test failed, `None` if not known yet
+        """
+        self.stop_chunk(self._manager.test or "context", failed)
+        self._context.tracing.stop()
+        self._manager.detach(self)
+
+
+class PlaywbotTracing:
+    """Library listener, which records tracing chunk per test in all traced contexts
+    of the suite and keeps the traces according to their policy.
+    """
+
+    ROBOT_LISTENER_API_VERSION = 2
+
+    def __init__(self):
+        self._pending_dir: Path = Path(tempfile.gettempdir()) / "playwbot" / "traces"
+        self._tracers: list[PlaywbotTracer] = []
+        # exported chunks of the current test waiting for its result
+        self._pending: list[tuple[Path, Path]] = []
+        self.test: Optional[str] = None
+        self._counter: int = 0
+        self._writer: Optional[ThreadPoolExecutor] = None
+
+    def attach(
+        self,
+        context: BrowserContext,
+        directory: Union[str, Path],
+        policy: TracingPolicy = "off",
+        sample: float = 10,
+    ) -> Optional[PlaywbotTracer]:
+        """Starts tracing of the `context` according to the `policy`.
+
+        Args:
+            context (BrowserContext): context to be traced
+            directory (Union[str, Path]): folder to write the traces to
+            policy (TracingPolicy, optional): _off_ - no tracing, _always_ - keep every chunk,
+            _sample_ - record `sample` percent of the chunks, _retain-on-failure_ - keep chunks of failed
+            tests only. Defaults to "off".
+            sample (float, optional): percent of the chunks recorded by _sample_ policy. Defaults to 10.
+
+        Returns:
+            Optional[PlaywbotTracer]: tracer of the context, `None` for _off_ policy
+        """
+        if policy == "off":
+            return None
+        if policy not in ("always", "sample", "retain-on-failure"):
+            raise ValueError(f"{policy} is not supported tracing policy.")
+
+        tracer = PlaywbotTracer(self, context, policy, float(sample), Path(directory))
+        tracer.start(self.test)
+        self._tracers.append(tracer)
+        return tracer
+
+    def detach(self, tracer: PlaywbotTracer):
+        if tracer in self._tracers:
+            self._tracers.remove(tracer)
+
+    def detach_all(self):
+        """Forgets all tracers, e.g. when their contexts were closed along with the browser."""
+        self._tracers = []
+
+    def pending_path(self) -> Path:
+        self._pending_dir.mkdir(parents=True, exist_ok=True)
+        self._counter += 1
+        return self._pending_dir / f"{os.getpid()}-{id(self)}-{self._counter}.zip"
+
+    def postpone(self, exported: Path, trace: Path):
+        """Keeps the `exported` archive as the `trace` only if the current test fails."""
+        self._pending.append((exported, trace))
+
+    def write(self, exported: Path, trace: Optional[Path]):
+        """Moves the `exported` archive to the `trace` path, or deletes it, if `trace`
+        is `None`, in the background.
+        """
+        if self._writer is None:
+            self._writer = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="playwbot-trace"
+            )
+        self._writer.submit(self._write, exported, trace)
+
+    @staticmethod
+    def _write(exported: Path, trace: Optional[Path]):
+        if trace is None:
+            exported.unlink(missing_ok=True)
+            return
+        trace.parent.mkdir(parents=True, exist_ok=True)
+        shutil.move(str(exported), str(trace))
+
+    def start_test(self, name: str, attributes: dict[str, Any]):
+        self.test = attributes.get("longname", name)
+        for tracer in self._tracers:
+            tracer.start_chunk(self.test)
+
+    def end_test(self, name: str, attributes: dict[str, Any]):
+        failed: bool = attributes["status"] == "FAIL"
+        for tracer in self._tracers:
+            tracer.stop_chunk(self.test or name, failed)
+        for exported, trace in self._pending:
+            self.write(exported, trace if failed else None)
+        self._pending = []
+        self.test = None
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.shutdown(wait=True)
+            self._writer = None
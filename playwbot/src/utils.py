@@ -1,6 +1,11 @@
 """Utility functions for the library.
 """
-from typing import Any, Optional, Union
+
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator, Optional, Union
 
 # type aliases
 ActionArgs = Optional[list[Union[list[Any], dict[str, Any]]]]
@@ -31,3 +36,45 @@ def give_action_args(action_args: ActionArgs) -> tuple[list[Any], dict[str, Any]
                 kwargs_ = arg
 
     return (args_, kwargs_)
+
+
+@contextmanager
+def file_lock(
+    path: Union[str, Path], timeout: float = 30.0, stale_after: float = 60.0
+) -> Iterator[None]:
+    """Cross-process lock based on exclusive creation of the lock file.
+
+    Works the same way on Windows and POSIX systems. Lock file older than
+    `stale_after` seconds is considered to be left behind by crashed process
+    and is removed.
+
+    Args:
+        path (Union[str, Path]): path of the lock file
+        timeout (float, optional): max seconds to wait for the lock. Defaults to 30.0.
+        stale_after (float, optional): age in seconds of stale lock file. Defaults to 60.0.
+
+    Raises:
+        TimeoutError: if the lock was not acquired within `timeout`
+    """
+    deadline: float = time.monotonic() + timeout
+
+    while True:
+        try:
+            fd: int = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(path) > stale_after:
+                    os.remove(path)
+                    continue
+            except FileNotFoundError:
+                continue
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Could not acquire lock file {path}.") from None
+            time.sleep(0.05)
+
+    try:
+        yield
+    finally:
+        os.close(fd)
+        os.remove(path)
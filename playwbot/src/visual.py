@@ -0,0 +1,184 @@
+"""Implements comparison of screenshots with the stored baselines.
+
+Comparison is vectorized by NumPy, images are decoded and encoded by Pillow.
+Neither of them is a dependency of the library, so they are imported only
+when the comparison is used. Decoded baselines are cached as 8-bit pixels,
+so comparisons with the same baseline do not decode it again. Pixels are
+converted to floats for the comparison only, which needs four times the memory.
+"""
+
+import io
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Optional, Union
+
+# max YIQ distance of two colors, see https://github.com/mapbox/pixelmatch
+_MAX_DELTA = 35215.0
+
+# colors of the diff image
+_MISMATCH_COLOR = (255, 0, 0)
+_ANTI_ALIASED_COLOR = (255, 255, 0)
+
+
+def _require() -> tuple[Any, Any]:
+    """Returns numpy and Pillow's Image modules."""
+    try:
+        # pylint: disable=import-outside-toplevel
+        import numpy
+        from PIL import Image
+    except ImportError as error:
+        raise RuntimeError(
+            "Screenshot comparison requires numpy and Pillow packages, "
+            "install them by `pip install playwbot[visual]`."
+        ) from error
+    return numpy, Image
+
+
+def _decode(data: Union[bytes, Path]) -> Any:
+    numpy, image_module = _require()
+    source: Any = io.BytesIO(data) if isinstance(data, bytes) else data
+    with image_module.open(source) as image:
+        pixels = numpy.asarray(image.convert("RGB"), dtype=numpy.uint8)
+    pixels.flags.writeable = False
+    return pixels
+
+
+@lru_cache(maxsize=16)
+def _load_baseline(path: str, mtime: float) -> Any:  # pylint: disable=unused-argument
+    """Decodes the baseline. Modified baseline has different `mtime`, so it is decoded again."""
+    return _decode(Path(path))
+
+
+def _delta(first: Any, second: Any) -> Any:
+    """Returns squared YIQ distance of the colors, which follows the perceived difference."""
+    difference = first - second
+    red, green, blue = difference[..., 0], difference[..., 1], difference[..., 2]
+    y = red * 0.29889531 + green * 0.58662247 + blue * 0.11448223
+    i = red * 0.59597799 - green * 0.27417610 - blue * 0.32180189
+    q = red * 0.21147017 - green * 0.52261711 + blue * 0.31114694
+    return 0.5053 * y * y + 0.299 * i * i + 0.1957 * q * q
+
+
+def _anti_aliased(
+    numpy: Any, actual: Any, baseline: Any, rows: Any, columns: Any, limit: float
+) -> Any:
+    """Marks mismatched pixels, which are only shifted by one pixel, as anti-aliasing.
+
+    Pixel is anti-aliased, if its color in each image is found, within the tolerance,
+    among the 3x3 neighbourhood of the same position in the other image.
+    """
+    padded_actual = numpy.pad(actual, ((1, 1), (1, 1), (0, 0)), mode="edge")
+    padded_baseline = numpy.pad(baseline, ((1, 1), (1, 1), (0, 0)), mode="edge")
+    in_baseline = numpy.zeros(rows.shape, dtype=bool)
+    in_actual = numpy.zeros(rows.shape, dtype=bool)
+    for row_shift in (0, 1, 2):
+        for column_shift in (0, 1, 2):
+            neighbour_rows = rows + row_shift
+            neighbour_columns = columns + column_shift
+            in_baseline |= (
+                _delta(
+                    actual[rows, columns],
+                    padded_baseline[neighbour_rows, neighbour_columns],
+                )
+                <= limit
+            )
+            in_actual |= (
+                _delta(
+                    baseline[rows, columns],
+                    padded_actual[neighbour_rows, neighbour_columns],
+                )
+                <= limit
+            )
+    return in_baseline & in_actual
+
+
+def compare_screenshot(
+    actual: bytes,
+    baseline: Union[str, Path],
+    diff_path: Union[str, Path],
+    threshold: float = 0.1,
+    ignore_regions: Optional[list[dict[str, float]]] = None,
+    anti_aliasing: bool = True,
+) -> dict[str, Any]:
+    """Compares the `actual` png screenshot with the `baseline` image. Missing baseline is created
+    from the `actual` screenshot.
+
+    Args:
+        actual (bytes): png screenshot
+        baseline (Union[str, Path]): path of the baseline image
+        diff_path (Union[str, Path]): where to write the diff image, if the images differ
+        threshold (float, optional): per-pixel color tolerance, 0 - exact match, 1 - anything matches.
+        Defaults to 0.1.
+        ignore_regions (Optional[list[dict[str, float]]], optional): regions with `x`, `y`, `width`
+        and `height` in pixels, which are not compared. Defaults to None.
+        anti_aliasing (bool, optional): whether to ignore pixels shifted by one pixel, typical for
+        anti-aliased edges and text. Defaults to True.
+
+    Returns:
+        dict[str, Any]: `mismatch_ratio`, number of `mismatched`, `anti_aliased` and `compared` pixels
+        and `diff_path`, `None` if no diff was written
+    """
+    numpy, image_module = _require()
+    baseline_path: Path = Path(baseline).resolve()
+    if not baseline_path.exists():
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_bytes(actual)
+        return {
+            "mismatch_ratio": 0.0,
+            "mismatched": 0,
+            "anti_aliased": 0,
+            "compared": 0,
+            "diff_path": None,
+            "baseline_created": True,
+        }
+
+    actual_pixels = _decode(actual)
+    baseline_pixels = _load_baseline(str(baseline_path), baseline_path.stat().st_mtime)
+    height, width = actual_pixels.shape[:2]
+    if baseline_pixels.shape != actual_pixels.shape:
+        raise RuntimeError(
+            f"Screenshot size {width}x{height} does not match the size "
+            f"{baseline_pixels.shape[1]}x{baseline_pixels.shape[0]} of the baseline {baseline_path}."
+        )
+    actual_pixels = actual_pixels.astype(numpy.float32)
+    baseline_pixels = baseline_pixels.astype(numpy.float32)
+
+    compared = numpy.ones((height, width), dtype=bool)
+    for region in ignore_regions or []:
+        left, top = max(int(region["x"]), 0), max(int(region["y"]), 0)
+        compared[
+            top : top + int(region["height"]), left : left + int(region["width"])
+        ] = False
+
+    limit: float = _MAX_DELTA * float(threshold) ** 2
+    mismatched = (_delta(actual_pixels, baseline_pixels) > limit) & compared
+    anti_aliased = numpy.zeros_like(mismatched)
+    if anti_aliasing and mismatched.any():
+        rows, columns = numpy.nonzero(mismatched)
+        shifted = _anti_aliased(
+            numpy, actual_pixels, baseline_pixels, rows, columns, limit
+        )
+        anti_aliased[rows[shifted], columns[shifted]] = True
+        mismatched[rows[shifted], columns[shifted]] = False
+
+    mismatched_count: int = int(mismatched.sum())
+    compared_count: int = int(compared.sum())
+    written: Optional[Path] = None
+    if mismatched_count:
+        # faded grayscale baseline with highlighted differences
+        gray = baseline_pixels.mean(axis=2, keepdims=True)
+        diff = numpy.repeat(255 - (255 - gray) * 0.1, 3, axis=2).astype(numpy.uint8)
+        diff[anti_aliased] = _ANTI_ALIASED_COLOR
+        diff[mismatched] = _MISMATCH_COLOR
+        written = Path(diff_path)
+        written.parent.mkdir(parents=True, exist_ok=True)
+        image_module.fromarray(diff).save(written, format="PNG")
+
+    return {
+        "mismatch_ratio": mismatched_count / compared_count if compared_count else 0.0,
+        "mismatched": mismatched_count,
+        "anti_aliased": int(anti_aliased.sum()),
+        "compared": compared_count,
+        "diff_path": written,
+        "baseline_created": False,
+    }
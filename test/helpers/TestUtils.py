@@ -1,12 +1,19 @@
 """Utility keywords for RF tests.
 """
 
+import json
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
 from typing import Any, Literal
 
+from playwbot.src.browser import PlaywbotBrowser, shared_references
 from playwbot.src.context import PlaywbotContext
 from playwbot.src.page import PlaywbotPage
-from playwright.sync_api import Request
+from playwright.sync_api import Browser, Request
 from robot.api.deco import keyword, library
+from robot.libraries.BuiltIn import BuiltIn
 
 
 @library(scope="GLOBAL")
@@ -73,3 +80,110 @@ class TestUtils:
             return isinstance(obj, PlaywbotContext)
 
         raise Exception("Invalid type")
+
+    @keyword
+    def measure_import_time(self, module: str, preloaded: list[str] = None):
+        """Imports `module` in the fresh interpreter and measures, how long it took.
+
+        Args:
+            module (str): module to import
+            preloaded (list[str], optional): modules imported before the measurement starts,
+            e.g. the ones already imported by robot itself. Defaults to None.
+
+        Returns:
+            dict: `seconds` the import took and `modules` loaded by the interpreter
+        """
+        script: str = "\n".join(
+            [
+                "import json, sys, time",
+                *[f"import {name}" for name in preloaded or []],
+                "start = time.perf_counter()",
+                f"import {module}",
+                "elapsed = time.perf_counter() - start",
+                "print(json.dumps({'seconds': elapsed, 'modules': sorted(sys.modules)}))",
+            ]
+        )
+        output: str = subprocess.run(
+            [sys.executable, "-c", script],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        return json.loads(output)
+
+    @keyword
+    def measure_locator_reuse(
+        self, page: PlaywbotPage, selector: str, calls: int = 200
+    ):
+        """Measures per-call duration of `is_visible()` of the locator created for each call
+        and of one locator reused by all calls, as the locator cache would do.
+
+        Args:
+            page (PlaywbotPage): page with the element
+            selector (str): selector of the element
+            calls (int, optional): number of calls of each kind. Defaults to 200.
+
+        Returns:
+            dict: milliseconds per call of the `new` and of the `reused` locator
+        """
+        reused = page.page.locator(selector)
+        started: float = time.perf_counter()
+        for _ in range(int(calls)):
+            page.page.locator(selector).is_visible()
+        new: float = time.perf_counter() - started
+        started = time.perf_counter()
+        for _ in range(int(calls)):
+            reused.is_visible()
+        return {
+            "new": new / int(calls) * 1000,
+            "reused": (time.perf_counter() - started) / int(calls) * 1000,
+        }
+
+    @keyword
+    def browser_state(self, library: str = "Playwbot"):
+        """Returns state of the browser of the Playwbot `library` instance without launching it.
+
+        Args:
+            library (str, optional): name of the library instance. Defaults to "Playwbot".
+
+        Returns:
+            dict: whether the browser is `started`, `restarts` done by the recycling, `references`
+            of the suites sharing the browser and playwright `contexts` open in the browser
+        """
+        # pylint: disable=protected-access
+        browser: Any = BuiltIn().get_library_instance(library)._playbot_browser
+        launched: Any = browser.browser if browser.is_started else None
+        return {
+            "started": browser.is_started,
+            "restarts": browser.restarts,
+            "references": shared_references(browser),
+            "contexts": launched.contexts if isinstance(launched, Browser) else [],
+        }
+
+    @keyword
+    def recycle_reasons(self, recycle_after_contexts: int, contexts: int):
+        """Serves `contexts` contexts by the browser with the fake launch, recycling it like
+        New Context keyword does, and returns the recycle reason seen before each context.
+
+        Args:
+            recycle_after_contexts (int): recycling limit of the browser
+            contexts (int): number of the contexts to serve
+
+        Returns:
+            list: recycle reason, or `None`, before each context
+        """
+
+        def fake_browser(*args, **kwargs):  # pylint: disable=unused-argument
+            return SimpleNamespace(close=lambda: None)
+
+        browser = PlaywbotBrowser(recycle_after_contexts=int(recycle_after_contexts))
+        # pylint: disable=protected-access
+        browser._launch = fake_browser
+        browser._start_browser = fake_browser
+        reasons: list[Any] = []
+        for _ in range(int(contexts)):
+            reasons.append(browser.recycle_reason())
+            if reasons[-1] is not None:
+                browser.recycle()
+            browser.serve_context()
+        return reasons